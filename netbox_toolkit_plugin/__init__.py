@@ -23,10 +23,20 @@ class ToolkitPluginConfig(PluginConfig):
         "rate_limiting_enabled": True,
         "device_command_limit": 10,
         "time_window_minutes": 5,
+        "rate_limit_backend": "cache",
+        "user_command_limit": None,
+        "global_command_limit": None,
+        "rate_limit_reservation_timeout": 600,
         "bypass_users": [],
         "bypass_groups": [],
         "debug_logging": False,  # Enable debug logging for this plugin
     }
 
+    def ready(self):
+        super().ready()
+
+        # Register signal handlers
+        from . import signals  # noqa: F401
+
 
 config = ToolkitPluginConfig
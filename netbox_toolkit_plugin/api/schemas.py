@@ -71,6 +71,9 @@ COMMAND_EXECUTE_SCHEMA = extend_schema(
         403: OpenApiResponse(description="Forbidden - insufficient permissions"),
         404: OpenApiResponse(description="Not found - command or device not found"),
         429: OpenApiResponse(description="Too many requests - rate limit exceeded"),
+        503: OpenApiResponse(
+            description="Credential verification busy - retry after the Retry-After header"
+        ),
     },
 )
 
@@ -129,7 +132,10 @@ COMMAND_BULK_EXECUTE_SCHEMA = extend_schema(
                     "summary": {"total": 2, "successful": 1, "failed": 1},
                 }
             ],
-        )
+        ),
+        503: OpenApiResponse(
+            description="Credential verification busy - retry after the Retry-After header"
+        ),
     },
 )
 
@@ -198,7 +204,11 @@ COMMAND_LOG_STATISTICS_SCHEMA = extend_schema(
 
 COMMAND_LOG_EXPORT_SCHEMA = extend_schema(
     summary="Export command logs",
-    description="Export command logs in various formats (CSV, JSON).",
+    description=(
+        "Stream command logs as CSV, NDJSON or JSON. Exports are not capped and "
+        "are written as they are read, so large date ranges start downloading "
+        "immediately. Accepts the same filters as the command log list."
+    ),
     tags=["Command Logs"],
     parameters=[
         OpenApiParameter(
@@ -206,9 +216,16 @@ COMMAND_LOG_EXPORT_SCHEMA = extend_schema(
             description="Export format",
             required=False,
             type=str,
-            enum=["csv", "json"],
+            enum=["csv", "ndjson", "json"],
             default="json",
         ),
+        OpenApiParameter(
+            name="compress",
+            description="Compress the export",
+            required=False,
+            type=str,
+            enum=["gzip"],
+        ),
         OpenApiParameter(
             name="start_date",
             description="Start date for export (YYYY-MM-DD)",
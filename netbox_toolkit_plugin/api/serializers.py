@@ -6,6 +6,31 @@ from rest_framework import serializers
 from ..models import Command, CommandLog, CommandVariable, DeviceCredentialSet
 
 
+def _get_credential_set_for_token(context, value):
+    """Find the requesting user's credential set for a credential token.
+
+    Looks the set up by token fingerprint and verifies the stored hash, so the
+    raw token is never compared against the hash column directly. A
+    CredentialVerificationBusyError is not a validation error, so it reaches
+    the view to be reported as a temporary failure.
+    """
+    # Get the current user from context
+    request = context.get("request")
+    if not request or not request.user:
+        raise serializers.ValidationError("Authentication required")
+
+    from netbox_toolkit_plugin.services.credential_service import CredentialService
+
+    is_valid, credential_set, _error = CredentialService().validate_token_for_user(
+        value, request.user
+    )
+    if not is_valid:
+        raise serializers.ValidationError(
+            "Invalid credential token or token does not belong to current user"
+        )
+    return credential_set
+
+
 class CommandVariableSerializer(NetBoxModelSerializer):
     """Serializer for CommandVariable model following NetBox patterns"""
 
@@ -65,33 +90,16 @@ class CommandExecutionSerializer(serializers.Serializer):
 
     def validate_credential_token(self, value):
         """Validate that the credential token exists and belongs to the requesting user"""
-        try:
-            # Get the current user from context
-            request = self.context.get("request")
-            if not request or not request.user:
-                raise serializers.ValidationError("Authentication required")
-
-            from netbox_toolkit_plugin.models import DeviceCredentialSet
-
-            DeviceCredentialSet.objects.get(access_token=value, owner=request.user)
-            return value
-        except DeviceCredentialSet.DoesNotExist as e:
-            raise serializers.ValidationError(
-                "Invalid credential token or token does not belong to current user"
-            ) from e
+        self._credential_set = _get_credential_set_for_token(self.context, value)
+        return value
 
     def validate(self, data):
         """Cross-field validation and object retrieval"""
         from dcim.models import Device
 
-        from netbox_toolkit_plugin.models import DeviceCredentialSet
-
         # Get the actual objects for use in views
         device = Device.objects.get(id=data["device_id"])
-        request = self.context.get("request")
-        credential_set = DeviceCredentialSet.objects.get(
-            access_token=data["credential_token"], owner=request.user
-        )
+        credential_set = self._credential_set
 
         # Verify credential set supports device platform (if platform restrictions exist)
         if (
@@ -136,6 +144,8 @@ class CommandSerializer(NetBoxModelSerializer):
             "description",
             "platforms",
             "command_type",
+            "parsers",
+            "ttp_template",
             "variables",
             "tags",
             "custom_fields",
@@ -151,6 +161,7 @@ class CommandLogSerializer(NetBoxModelSerializer):
     )
     command = NestedCommandSerializer()
     device = DeviceSerializer(nested=True)
+    parsed_data = serializers.JSONField(read_only=True, allow_null=True)
 
     class Meta:
         model = CommandLog
@@ -166,9 +177,12 @@ class CommandLogSerializer(NetBoxModelSerializer):
             "success",
             "error_message",
             "execution_duration",
+            "parsed_data",
+            "parsing_method",
             "created",
             "last_updated",
         )
+        read_only_fields = ("parsing_method",)
         brief_fields = (
             "id",
             "url",
@@ -248,17 +262,5 @@ class BulkCommandExecutionSerializer(serializers.Serializer):
 
     def validate_credential_token(self, value):
         """Validate that the credential token exists and belongs to the requesting user"""
-        try:
-            # Get the current user from context
-            request = self.context.get("request")
-            if not request or not request.user:
-                raise serializers.ValidationError("Authentication required")
-
-            from netbox_toolkit_plugin.models import DeviceCredentialSet
-
-            DeviceCredentialSet.objects.get(access_token=value, owner=request.user)
-            return value
-        except DeviceCredentialSet.DoesNotExist as e:
-            raise serializers.ValidationError(
-                "Invalid credential token or token does not belong to current user"
-            ) from e
+        self._credential_set = _get_credential_set_for_token(self.context, value)
+        return value
@@ -2,10 +2,9 @@
 API ViewSet for CommandLog resources
 """
 
-from datetime import timedelta
+from datetime import datetime, timedelta
 
-from django.db.models import Count, Q
-from django.http import HttpResponse
+from django.http import StreamingHttpResponse
 from django.utils import timezone
 
 from netbox.api.viewsets import NetBoxModelViewSet
@@ -16,6 +15,8 @@ from rest_framework.decorators import action
 from rest_framework.response import Response
 
 from ... import filtersets, models
+from ...services.log_export_service import CommandLogExportService
+from ...services.statistics_service import CommandStatisticsService
 from ..mixins import APIResponseMixin
 from ..schemas import (
     COMMAND_LOG_CREATE_SCHEMA,
@@ -52,126 +53,68 @@ class CommandLogViewSet(NetBoxModelViewSet, APIResponseMixin):
     @action(detail=False, methods=["get"], url_path="statistics")
     def statistics(self, request):
         """Get command execution statistics"""
-        queryset = self.get_queryset()
-
-        # Basic stats
-        total_logs = queryset.count()
-        successful_logs = queryset.filter(success=True).count()
-        success_rate = (successful_logs / total_logs * 100) if total_logs > 0 else 0
-
-        # Last 24 hours stats
-        last_24h = timezone.now() - timedelta(hours=24)
-        recent_logs = queryset.filter(created__gte=last_24h)
-        recent_total = recent_logs.count()
-        recent_successful = recent_logs.filter(success=True).count()
-        recent_failed = recent_total - recent_successful
-
-        # Top commands
-        top_commands = (
-            queryset.values("command__name")
-            .annotate(count=Count("command"))
-            .order_by("-count")[:10]
+        # Rollups are used unless permission constraints narrow the queryset
+        statistics = CommandStatisticsService().get_statistics(self.get_queryset())
+        return Response(statistics)
+
+    def perform_content_negotiation(self, request, force=False):
+        """Let export's format parameter name a file format rather than a renderer"""
+        return super().perform_content_negotiation(
+            request, force=force or self.action == "export"
         )
 
-        # Common errors (non-empty error messages)
-        common_errors = (
-            queryset.filter(~Q(error_message=""), ~Q(error_message__isnull=True))
-            .values("error_message")
-            .annotate(count=Count("error_message"))
-            .order_by("-count")[:10]
-        )
-
-        return Response({
-            "total_logs": total_logs,
-            "success_rate": round(success_rate, 2),
-            "last_24h": {
-                "total": recent_total,
-                "successful": recent_successful,
-                "failed": recent_failed,
-            },
-            "top_commands": [
-                {"command_name": item["command__name"], "count": item["count"]}
-                for item in top_commands
-            ],
-            "common_errors": [
-                {"error": item["error_message"][:100], "count": item["count"]}
-                for item in common_errors
-            ],
-        })
-
     @COMMAND_LOG_EXPORT_SCHEMA
     @action(detail=False, methods=["get"], url_path="export")
     def export(self, request):
-        """Export command logs"""
-        import csv
-        from datetime import datetime
-
+        """Stream command logs as CSV, NDJSON or JSON, optionally gzip-compressed"""
+        export_service = CommandLogExportService()
         export_format = request.query_params.get("format", "json")
-        start_date = request.query_params.get("start_date")
-        end_date = request.query_params.get("end_date")
+        compress = request.query_params.get("compress", "")
+
+        if export_format not in export_service.FORMATS:
+            return Response(
+                {"error": "Invalid format. Use csv, ndjson or json."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        if compress not in ("", "gzip"):
+            return Response(
+                {"error": "Invalid compress value. Use gzip."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
 
-        queryset = self.get_queryset()
+        queryset = self.filter_queryset(self.get_queryset())
 
-        # Apply date filters if provided
-        if start_date:
+        # Apply date filters as ranges so the created index can be used
+        for param, lookup, offset in (
+            ("start_date", "created__gte", timedelta()),
+            ("end_date", "created__lt", timedelta(days=1)),
+        ):
+            value = request.query_params.get(param)
+            if not value:
+                continue
             try:
-                start_date = datetime.strptime(start_date, "%Y-%m-%d").date()
-                queryset = queryset.filter(created__date__gte=start_date)
+                day = datetime.strptime(value, "%Y-%m-%d")
             except ValueError:
                 return Response(
-                    {"error": "Invalid start_date format. Use YYYY-MM-DD."},
+                    {"error": f"Invalid {param} format. Use YYYY-MM-DD."},
                     status=status.HTTP_400_BAD_REQUEST,
                 )
+            queryset = queryset.filter(**{lookup: timezone.make_aware(day + offset)})
 
-        if end_date:
-            try:
-                end_date = datetime.strptime(end_date, "%Y-%m-%d").date()
-                queryset = queryset.filter(created__date__lte=end_date)
-            except ValueError:
-                return Response(
-                    {"error": "Invalid end_date format. Use YYYY-MM-DD."},
-                    status=status.HTTP_400_BAD_REQUEST,
-                )
+        context = self.get_serializer_context()
 
-        # Limit export size for performance
-        if queryset.count() > 10000:
-            return Response(
-                {"error": "Export too large. Please use date filters to reduce size."},
-                status=status.HTTP_400_BAD_REQUEST,
-            )
+        def serialize(logs):
+            return CommandLogSerializer(logs, many=True, context=context).data
 
-        if export_format == "csv":
-            # CSV export
-            response = HttpResponse(content_type="text/csv")
-            response["Content-Disposition"] = 'attachment; filename="command_logs.csv"'
-
-            writer = csv.writer(response)
-            writer.writerow([
-                "ID",
-                "Command",
-                "Device",
-                "User",
-                "Success",
-                "Created",
-                "Execution Time",
-                "Error Message",
-            ])
-
-            for log in queryset.select_related("command", "device", "user"):
-                writer.writerow([
-                    log.id,
-                    log.command.name,
-                    log.device.name,
-                    log.user.username if log.user else "Unknown",
-                    log.success,
-                    log.created.isoformat(),
-                    log.execution_time,
-                    log.error_message or "",
-                ])
-
-            return response
-
-        else:
-            # JSON export
-            serializer = self.get_serializer(queryset, many=True)
-            return Response({"count": queryset.count(), "results": serializer.data})
+        response = StreamingHttpResponse(
+            export_service.stream(
+                queryset.order_by("pk"),
+                export_format,
+                serialize=serialize,
+                compress=bool(compress),
+            ),
+            content_type=export_service.get_content_type(export_format, bool(compress)),
+        )
+        filename = export_service.get_filename(export_format, bool(compress))
+        response["Content-Disposition"] = f'attachment; filename="{filename}"'
+        return response
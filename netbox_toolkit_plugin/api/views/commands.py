@@ -2,8 +2,6 @@
 API ViewSet for Command resources
 """
 
-from django.db import transaction
-
 from dcim.models import Device
 from netbox.api.viewsets import NetBoxModelViewSet
 
@@ -13,6 +11,12 @@ from rest_framework.decorators import action
 from rest_framework.response import Response
 
 from ... import filtersets, models
+from ...connectors.base import CommandResult
+from ...exceptions import CredentialVerificationBusyError
+from ...services.bulk_execution_service import (
+    BulkExecutionJob,
+    BulkExecutionService,
+)
 from ...services.command_service import CommandExecutionService
 from ...services.rate_limiting_service import RateLimitingService
 from ..mixins import APIResponseMixin, PermissionCheckMixin
@@ -94,7 +98,10 @@ class CommandViewSet(NetBoxModelViewSet, APIResponseMixin, PermissionCheckMixin)
         execution_serializer = CommandExecutionSerializer(
             data=request.data, context={"request": request}
         )
-        execution_serializer.is_valid(raise_exception=True)
+        try:
+            execution_serializer.is_valid(raise_exception=True)
+        except CredentialVerificationBusyError as e:
+            return self._credential_busy_response(e)
 
         validated_data = execution_serializer.validated_data
         device = validated_data["device"]
@@ -165,6 +172,8 @@ class CommandViewSet(NetBoxModelViewSet, APIResponseMixin, PermissionCheckMixin)
                 command=processed_command_text,
                 command_type=command.command_type,
                 description=command.description,
+                parsers=command.parsers,
+                ttp_template=command.ttp_template,
             )
             temp_command.platforms.set(command.platforms.all())
             command = temp_command
@@ -188,9 +197,10 @@ class CommandViewSet(NetBoxModelViewSet, APIResponseMixin, PermissionCheckMixin)
                 status=status.HTTP_403_FORBIDDEN,
             )
 
-        # Check custom rate limiting (device-specific with bypass rules)
+        # Reserve rate limit capacity (device, user and global, with bypass rules)
+        # before connecting, so concurrent requests can't overrun the device
         rate_limiting_service = RateLimitingService()
-        rate_limit_check = rate_limiting_service.check_rate_limit(device, request.user)
+        rate_limit_check = rate_limiting_service.reserve(device, request.user)
 
         if not rate_limit_check["allowed"]:
             return Response(
@@ -208,12 +218,19 @@ class CommandViewSet(NetBoxModelViewSet, APIResponseMixin, PermissionCheckMixin)
 
         # Execute command using the service with credential token
         command_service = CommandExecutionService()
-        result = command_service.execute_command_with_token(
-            command, device, credential_token, request.user, max_retries=1
-        )
-
-        # Determine overall success - failed if either execution failed or syntax error detected
-        overall_success = result.success and not result.has_syntax_error
+        overall_success = False
+        try:
+            result = command_service.execute_command_with_token(
+                command, device, credential_token, request.user, max_retries=1
+            )
+            # Determine overall success - failed if either execution failed or syntax error detected
+            overall_success = result.success and not result.has_syntax_error
+        except CredentialVerificationBusyError as e:
+            return self._credential_busy_response(e)
+        finally:
+            # Refund the reservation unless the command counts as executed
+            if rate_limit_check["reservation"] is not None:
+                rate_limit_check["reservation"].release(successful=int(overall_success))
 
         # Prepare response data
         response_data = {
@@ -247,6 +264,14 @@ class CommandViewSet(NetBoxModelViewSet, APIResponseMixin, PermissionCheckMixin)
                 "method": result.parsing_method,
                 "data": result.parsed_output,
             }
+        elif result.parsing_pending:
+            # Large output is still being parsed; it is stored on the log entry
+            response_data["parsed_output"] = {
+                "success": False,
+                "pending": True,
+                "method": result.parsing_method,
+                "command_log_id": result.command_log_id,
+            }
         else:
             response_data["parsed_output"] = {
                 "success": False,
@@ -376,115 +401,64 @@ class CommandViewSet(NetBoxModelViewSet, APIResponseMixin, PermissionCheckMixin)
         if not executions:
             raise serializers.ValidationError({"executions": "No executions provided"})
 
-        results = []
+        results = {}
+        jobs = []
 
-        with transaction.atomic():
-            for i, execution_data in enumerate(executions):
-                try:
-                    # Validate each execution using serializer
-                    execution_serializer = BulkCommandExecutionSerializer(
-                        data=execution_data, context={"request": request}
-                    )
-                    if not execution_serializer.is_valid():
-                        results.append({
-                            "execution_id": i + 1,
-                            "success": False,
-                            "error": "Validation failed",
-                            "details": execution_serializer.errors,
-                        })
-                        continue
-
-                    validated_data = execution_serializer.validated_data
-                    command_id = validated_data["command_id"]
-                    device_id = validated_data["device_id"]
-                    credential_token = validated_data["credential_token"]
-                    variables = validated_data.get("variables", {})
-
-                    # Get command and device objects
-                    try:
-                        command = models.Command.objects.get(id=command_id)
-                        device = Device.objects.get(id=device_id)
-                    except (models.Command.DoesNotExist, Device.DoesNotExist) as e:
-                        results.append({
-                            "execution_id": i + 1,
-                            "success": False,
-                            "error": f"Object not found: {str(e)}",
-                        })
-                        continue
-
-                    # Process variables if present
-                    if command.variables.exists() and variables:
-                        from ...models import Command as CommandModel
-                        from ...utils.variable_parser import CommandVariableParser
-
-                        processed_command_text, is_valid, errors = (
-                            CommandVariableParser.prepare_command_for_execution(
-                                command, variables
-                            )
-                        )
-
-                        if not is_valid:
-                            results.append({
-                                "execution_id": i + 1,
-                                "success": False,
-                                "error": "Variable validation failed",
-                                "details": {"variables": errors},
-                            })
-                            continue
-
-                        # Create temporary command object with processed text
-                        temp_command = CommandModel(
-                            id=command.id,
-                            name=command.name,
-                            command=processed_command_text,
-                            command_type=command.command_type,
-                            description=command.description,
-                        )
-                        temp_command.platforms.set(command.platforms.all())
-                        command = temp_command
-
-                    # Check permissions
-                    action = (
-                        "execute_config"
-                        if command.command_type == "config"
-                        else "execute_show"
-                    )
-                    if not self._user_has_action_permission(
-                        request.user, command, action
-                    ):
-                        results.append({
-                            "execution_id": i + 1,
-                            "success": False,
-                            "error": "Insufficient permissions",
-                        })
-                        continue
-
-                    # Execute command using credential token
-                    command_service = CommandExecutionService()
-                    result = command_service.execute_command_with_token(
-                        command, device, credential_token, request.user, max_retries=1
+        # Validate every execution up front; only valid ones reach a device
+        for i, execution_data in enumerate(executions):
+            execution_id = i + 1
+            try:
+                job_or_error = self._prepare_bulk_execution(
+                    execution_id, execution_data, request
+                )
+            except CredentialVerificationBusyError as e:
+                # Nothing has run yet, so the whole request can be retried
+                return self._credential_busy_response(e)
+            except Exception as e:
+                job_or_error = self._bulk_error_response(execution_id, e)
+
+            if isinstance(job_or_error, BulkExecutionJob):
+                jobs.append(job_or_error)
+            else:
+                results[execution_id] = job_or_error
+
+        # Reserve rate limit capacity for each device's whole batch up front;
+        # devices over their limit don't get any of their executions run
+        jobs, reservations = self._reserve_bulk_capacity(jobs, request.user, results)
+
+        # Run the device work concurrently; each result is logged in its own
+        # short transaction by the command service
+        bulk_results = {}
+        try:
+            bulk_results = BulkExecutionService().execute(
+                jobs, request.user, max_retries=1
+            )
+        finally:
+            # Refund the capacity of executions that didn't succeed
+            for reservation, execution_ids in reservations:
+                reservation.release(
+                    successful=sum(
+                        1
+                        for execution_id in execution_ids
+                        if isinstance(bulk_results.get(execution_id), CommandResult)
+                        and bulk_results[execution_id].success
+                        and not bulk_results[execution_id].has_syntax_error
                     )
+                )
 
-                    # Note: Command log entry is automatically created by the service
-
-                    results.append({
-                        "execution_id": i + 1,
-                        "success": result.success and not result.has_syntax_error,
-                        "command_log_id": result.command_log_id,
-                        "execution_time": result.execution_time,
-                    })
-
-                except Exception as e:
-                    from ...utils.error_sanitizer import ErrorSanitizer
+        for execution_id, result in bulk_results.items():
+            if isinstance(result, Exception):
+                results[execution_id] = self._bulk_error_response(execution_id, result)
+            else:
+                # Note: Command log entry is automatically created by the service
+                results[execution_id] = {
+                    "execution_id": execution_id,
+                    "success": result.success and not result.has_syntax_error,
+                    "command_log_id": result.command_log_id,
+                    "execution_time": result.execution_time,
+                }
 
-                    sanitized_error = ErrorSanitizer.sanitize_api_error(
-                        e, "execute command"
-                    )
-                    results.append({
-                        "execution_id": i + 1,
-                        "success": False,
-                        "error": sanitized_error,
-                    })
+        results = [results[execution_id] for execution_id in sorted(results)]
 
         # Generate summary
         total = len(results)
@@ -498,3 +472,161 @@ class CommandViewSet(NetBoxModelViewSet, APIResponseMixin, PermissionCheckMixin)
             },
             status=status.HTTP_200_OK,
         )
+
+    def _prepare_bulk_execution(self, execution_id, execution_data, request):
+        """Validate one bulk execution item.
+
+        Returns:
+            A BulkExecutionJob ready to run, or an error result dictionary
+        """
+        # Validate each execution using serializer
+        execution_serializer = BulkCommandExecutionSerializer(
+            data=execution_data, context={"request": request}
+        )
+        if not execution_serializer.is_valid():
+            return {
+                "execution_id": execution_id,
+                "success": False,
+                "error": "Validation failed",
+                "details": execution_serializer.errors,
+            }
+
+        validated_data = execution_serializer.validated_data
+        command_id = validated_data["command_id"]
+        device_id = validated_data["device_id"]
+        credential_token = validated_data["credential_token"]
+        variables = validated_data.get("variables", {})
+
+        # Get command and device objects
+        try:
+            command = models.Command.objects.get(id=command_id)
+            device = Device.objects.get(id=device_id)
+        except (models.Command.DoesNotExist, Device.DoesNotExist) as e:
+            return {
+                "execution_id": execution_id,
+                "success": False,
+                "error": f"Object not found: {str(e)}",
+            }
+
+        # Process variables if present
+        if command.variables.exists() and variables:
+            from ...models import Command as CommandModel
+            from ...utils.variable_parser import CommandVariableParser
+
+            processed_command_text, is_valid, errors = (
+                CommandVariableParser.prepare_command_for_execution(command, variables)
+            )
+
+            if not is_valid:
+                return {
+                    "execution_id": execution_id,
+                    "success": False,
+                    "error": "Variable validation failed",
+                    "details": {"variables": errors},
+                }
+
+            # Create temporary command object with processed text
+            temp_command = CommandModel(
+                id=command.id,
+                name=command.name,
+                command=processed_command_text,
+                command_type=command.command_type,
+                description=command.description,
+                parsers=command.parsers,
+                ttp_template=command.ttp_template,
+            )
+            temp_command.platforms.set(command.platforms.all())
+            command = temp_command
+
+        # Check permissions
+        action = (
+            "execute_config" if command.command_type == "config" else "execute_show"
+        )
+        if not self._user_has_action_permission(request.user, command, action):
+            return {
+                "execution_id": execution_id,
+                "success": False,
+                "error": "Insufficient permissions",
+            }
+
+        return BulkExecutionJob(
+            execution_id=execution_id,
+            command=command,
+            device=device,
+            credential_token=credential_token,
+        )
+
+    def _reserve_bulk_capacity(self, jobs, user, results):
+        """Reserve rate limit capacity for bulk jobs, one batch per device.
+
+        Jobs for devices whose batch doesn't fit get a rate limit error in
+        results instead of running.
+
+        Returns:
+            Tuple of (jobs allowed to run, reservations to release afterwards
+            paired with the execution IDs they cover)
+        """
+        jobs_by_device = {}
+        for job in jobs:
+            jobs_by_device.setdefault(job.device.pk, []).append(job)
+
+        rate_limiting_service = RateLimitingService()
+        allowed_jobs = []
+        reservations = []
+        for device_jobs in jobs_by_device.values():
+            rate_limit_check = rate_limiting_service.reserve(
+                device_jobs[0].device, user, count=len(device_jobs)
+            )
+            if not rate_limit_check["allowed"]:
+                for job in device_jobs:
+                    results[job.execution_id] = {
+                        "execution_id": job.execution_id,
+                        "success": False,
+                        "error": "Rate limit exceeded",
+                        "details": {
+                            "reason": rate_limit_check["reason"],
+                            "current_count": rate_limit_check["current_count"],
+                            "limit": rate_limit_check["limit"],
+                            "time_window_minutes": rate_limit_check[
+                                "time_window_minutes"
+                            ],
+                        },
+                    }
+                continue
+
+            allowed_jobs.extend(device_jobs)
+            if rate_limit_check["reservation"] is not None:
+                reservations.append((
+                    rate_limit_check["reservation"],
+                    [job.execution_id for job in device_jobs],
+                ))
+
+        return allowed_jobs, reservations
+
+    def _credential_busy_response(self, error):
+        """Build a 503 response for a token that couldn't be verified yet."""
+        return Response(
+            {"error": str(error), "retry_after": error.retry_after},
+            status=status.HTTP_503_SERVICE_UNAVAILABLE,
+            headers={"Retry-After": str(error.retry_after)},
+        )
+
+    def _bulk_error_response(self, execution_id, error):
+        """Build a sanitized error result for a bulk execution item."""
+        if isinstance(error, CredentialVerificationBusyError):
+            # Not a failure of the command; the item can be retried later
+            return {
+                "execution_id": execution_id,
+                "success": False,
+                "error": str(error),
+                "retry_after": error.retry_after,
+            }
+
+        from ...utils.error_sanitizer import ErrorSanitizer
+
+        sanitized_error = ErrorSanitizer.sanitize_api_error(error, "execute command")
+        return {
+            "execution_id": execution_id,
+            "success": False,
+            "error": sanitized_error,
+        }
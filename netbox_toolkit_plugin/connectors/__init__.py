@@ -1,8 +1,11 @@
 """Connectors package for device connection logic."""
 
+from .affinity import ConnectorAffinity, get_connector_affinity
+from .async_scrapli_connector import AsyncScrapliConnector
 from .base import BaseDeviceConnector, CommandResult, ConnectionConfig
 from .factory import ConnectorFactory
 from .netmiko_connector import NetmikoConnector
+from .pool import ConnectionPool, get_connection_pool
 from .scrapli_connector import ScrapliConnector
 
 __all__ = [
@@ -10,6 +13,11 @@ __all__ = [
     "ConnectionConfig",
     "CommandResult",
     "ScrapliConnector",
+    "AsyncScrapliConnector",
     "NetmikoConnector",
     "ConnectorFactory",
+    "ConnectionPool",
+    "get_connection_pool",
+    "ConnectorAffinity",
+    "get_connector_affinity",
 ]
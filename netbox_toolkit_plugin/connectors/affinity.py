@@ -0,0 +1,104 @@
+"""Per-device memory of which connector library last worked."""
+
+import time
+
+from django.core.cache import cache
+
+from ..settings import ToolkitSettings
+from ..utils.logging import get_toolkit_logger
+from .base import BaseDeviceConnector
+from .netmiko_connector import NetmikoConnector
+
+logger = get_toolkit_logger(__name__)
+
+
+class ConnectorAffinity:
+    """Remember which connector succeeded for each device and platform.
+
+    Devices that always fast-fail Scrapli and fall back to Netmiko would
+    otherwise repeat the doomed Scrapli attempt on every execution. Once
+    Netmiko has succeeded, it is used first until the entry expires. Every
+    ``reprobe_interval`` seconds one execution tries the primary connector
+    again, so a device that gains Scrapli support moves back to it.
+
+    Entries are kept in the Django cache so all workers share them. The
+    platform is part of the key, so changing a device's platform starts over.
+    """
+
+    CACHE_PREFIX = "netbox_toolkit:connector_affinity"
+
+    def __init__(self, ttl: int = 86400, reprobe_interval: int = 3600):
+        self.ttl = ttl
+        self.reprobe_interval = reprobe_interval
+
+    def _key(self, device_id: int, platform: str | None) -> str:
+        return f"{self.CACHE_PREFIX}:{device_id}:{platform or 'generic'}"
+
+    def get_preferred(self, device_id: int, platform: str | None) -> str | None:
+        """
+        Get the connector type to try first for a device.
+
+        Args:
+            device_id: Device primary key
+            platform: Normalized device platform
+
+        Returns:
+            "scrapli" or "netmiko", or None to use the default strategy
+        """
+        key = self._key(device_id, platform)
+        entry = cache.get(key)
+        if not entry:
+            return None
+
+        now = time.time()
+        if entry["connector"] == "netmiko" and now >= entry["next_probe"]:
+            # Let this execution re-probe the primary connector, and push the
+            # next probe out so concurrent executions don't all re-probe
+            entry["next_probe"] = now + self.reprobe_interval
+            cache.set(key, entry, self.ttl)
+            logger.debug("Re-probing primary connector for device %s", device_id)
+            return None
+
+        return entry["connector"]
+
+    def record_success(
+        self, device_id: int, platform: str | None, connector: BaseDeviceConnector
+    ) -> None:
+        """Record the connector that just completed an execution on a device."""
+        connector_type = (
+            "netmiko" if isinstance(connector, NetmikoConnector) else "scrapli"
+        )
+        key = self._key(device_id, platform)
+        entry = cache.get(key)
+        if entry and entry["connector"] == connector_type:
+            return
+
+        logger.debug(
+            "Recording %s as preferred connector for device %s",
+            connector_type,
+            device_id,
+        )
+        cache.set(
+            key,
+            {
+                "connector": connector_type,
+                "next_probe": time.time() + self.reprobe_interval,
+            },
+            self.ttl,
+        )
+
+    def clear(self, device_id: int, platform: str | None) -> None:
+        """Forget the preferred connector for a device."""
+        cache.delete(self._key(device_id, platform))
+
+
+def get_connector_affinity() -> ConnectorAffinity | None:
+    """Get the connector affinity store, or None if it is disabled."""
+    affinity_config = ToolkitSettings.get_connector_affinity_config()
+    if not affinity_config.get("enabled", True):
+        return None
+
+    return ConnectorAffinity(
+        ttl=affinity_config["ttl"],
+        reprobe_interval=affinity_config["reprobe_interval"],
+    )
@@ -0,0 +1,253 @@
+"""Asyncio-based Scrapli connector for high-concurrency execution."""
+
+import asyncio
+import dataclasses
+import time
+
+from scrapli.driver.core import AsyncIOSXEDriver, AsyncIOSXRDriver, AsyncNXOSDriver
+from scrapli.driver.generic import AsyncGenericDriver
+
+from ..exceptions import DeviceConnectionError
+from ..settings import ToolkitSettings
+from ..utils.logging import get_toolkit_logger
+from ..utils.network import (
+    invalidate_reachability,
+    record_connection_success,
+    validate_device_connectivity,
+)
+from .base import CommandResult, ConnectionConfig
+from .scrapli_connector import ScrapliConnector
+
+try:
+    import asyncssh  # noqa: F401
+
+    HAS_ASYNCSSH = True
+except ImportError:
+    HAS_ASYNCSSH = False
+
+logger = get_toolkit_logger(__name__)
+
+
+class AsyncScrapliConnector(ScrapliConnector):
+    """Scrapli connector built on the async drivers and the asyncssh transport.
+
+    A single event loop can drive many of these connectors at once, so bulk and
+    scheduled runs don't need a thread per device. Result building, error
+    detection and parsing are shared with ScrapliConnector; only connection
+    handling and I/O are async. Use it with ``async with``.
+    """
+
+    DRIVER_MAP = {
+        "cisco_ios": AsyncIOSXEDriver,
+        "cisco_nxos": AsyncNXOSDriver,
+        "cisco_iosxr": AsyncIOSXRDriver,
+        "cisco_xe": AsyncIOSXEDriver,
+        "ios": AsyncIOSXEDriver,
+        "nxos": AsyncNXOSDriver,
+        "iosxr": AsyncIOSXRDriver,
+        "ios-xe": AsyncIOSXEDriver,
+        "ios-xr": AsyncIOSXRDriver,
+    }
+
+    def __init__(self, config: ConnectionConfig):
+        # The system transport is sync-only; asyncssh is the async equivalent
+        if config.transport == "system":
+            config = dataclasses.replace(config, transport="asyncssh")
+        super().__init__(config)
+
+    def _get_driver_class(self) -> type:
+        """Get the appropriate async Scrapli driver class for the platform."""
+        if not self.config.platform:
+            return AsyncGenericDriver
+
+        normalized_platform = self.normalize_platform_name(self.config.platform)
+        return self.DRIVER_MAP.get(normalized_platform, AsyncGenericDriver)
+
+    async def connect(self) -> None:
+        """Establish connection to the device with retry logic and fast-fail detection."""
+        if not HAS_ASYNCSSH:
+            raise DeviceConnectionError(
+                "asyncssh is required for async Scrapli connections. "
+                "Install with: pip install asyncssh"
+            )
+
+        if self._connection:
+            await self.disconnect()
+
+        # The reachability probe uses blocking sockets - keep it off the loop
+        try:
+            self.last_probe = await asyncio.to_thread(
+                validate_device_connectivity, self.config.hostname, self.config.port
+            )
+        except Exception as e:
+            raise DeviceConnectionError(
+                f"Pre-connection validation failed: {str(e)}"
+            ) from e
+
+        self._fast_fail_mode = True
+        conn_params = self._build_connection_params()
+
+        last_error = None
+        retry_delay = self._retry_config["retry_delay"]
+        max_retries = self._retry_config["max_retries"]
+
+        for attempt in range(max_retries + 1):
+            try:
+                if attempt > 0:
+                    await asyncio.sleep(retry_delay)
+                    retry_delay *= self._retry_config["backoff_multiplier"]
+                    if attempt == 1:
+                        self._fast_fail_mode = False
+                        conn_params = self._build_connection_params()
+                    self._grow_retry_timeouts(conn_params, last_error)
+
+                self._connection = self._driver_class(**conn_params)
+                open_start = time.perf_counter()
+                await self._connection.open()
+                self._record_connect_timings(time.perf_counter() - open_start)
+
+                logger.info(
+                    f"Successfully connected to {self.config.hostname} using "
+                    f"{self._driver_class.__name__}"
+                )
+                record_connection_success(self.config.hostname, self.config.port)
+                return
+
+            except Exception as e:
+                last_error = e
+                error_msg = str(e)
+                logger.debug(
+                    f"Async connection attempt {attempt + 1} failed for "
+                    f"{self.config.hostname}: {error_msg}"
+                )
+
+                # Close the failed attempt before retrying or raising; the
+                # caller never gets a connector to clean up when connect raises
+                if self._connection:
+                    await self._close_quietly()
+
+                if self._is_authentication_error(error_msg):
+                    raise DeviceConnectionError(self._format_connection_error(e)) from e
+
+                if attempt == 0 and ToolkitSettings.should_fast_fail_to_netmiko(
+                    error_msg
+                ):
+                    raise DeviceConnectionError(
+                        f"Fast-fail to Netmiko: {error_msg}"
+                    ) from None
+
+                if attempt >= max_retries:
+                    invalidate_reachability(self.config.hostname, self.config.port)
+                    raise DeviceConnectionError(self._format_connection_error(e)) from e
+
+    async def disconnect(self) -> None:
+        """Close connection to the device."""
+        if self._connection:
+            logger.debug(f"Disconnecting from {self.config.hostname}")
+            await self._close_quietly()
+
+    async def _close_quietly(self) -> None:
+        try:
+            await self._connection.close()
+        except Exception as e:
+            logger.debug(f"Error during async connection cleanup: {str(e)}")
+        finally:
+            self._connection = None
+
+    async def execute_command(
+        self, command: str, command_type: str = "show"
+    ) -> CommandResult:
+        """Execute a command on the device.
+
+        Args:
+            command: The command string to execute
+            command_type: Type of command ('show' or 'config')
+
+        Returns:
+            CommandResult with execution details
+        """
+        logger.info(
+            f"DEVICE_COMMAND: Sending {command_type} command to {self.config.hostname}: {command!r}"
+        )
+
+        if not self.is_connected():
+            raise DeviceConnectionError("Connection is not available or has been lost")
+
+        start_time = time.time()
+
+        try:
+            if command_type == "config":
+                response = await self._connection.send_config(command)
+            else:
+                response = await self._connection.send_command(command)
+        except Exception as e:
+            return self._build_failed_result(command, e, time.time() - start_time)
+
+        return self._build_command_result(command, response, time.time() - start_time)
+
+    async def execute_commands(
+        self, commands: list[str], command_type: str = "show"
+    ) -> list[CommandResult]:
+        """Execute several commands in one session using scrapli's batch methods.
+
+        Args:
+            commands: The command strings to execute, in order
+            command_type: Type of commands ('show' or 'config')
+
+        Returns:
+            One CommandResult per command, in the same order
+        """
+        if not commands:
+            return []
+
+        if not self.is_connected():
+            raise DeviceConnectionError("Connection is not available or has been lost")
+
+        start_time = time.time()
+
+        try:
+            if command_type == "config":
+                config_lines, spans = self._split_config_commands(commands)
+                responses = self._join_config_responses(
+                    commands, spans, await self._connection.send_configs(config_lines)
+                )
+            else:
+                responses = await self._connection.send_commands(commands)
+        except Exception as e:
+            execution_time = time.time() - start_time
+            return [
+                self._build_failed_result(command, e, execution_time)
+                for command in commands
+            ]
+
+        return [
+            self._build_command_result(command, response, response.elapsed_time)
+            for command, response in zip(commands, responses, strict=False)
+        ]
+
+    def is_connected(self) -> bool:
+        """Check if connection is active."""
+        if not self._connection:
+            return False
+
+        try:
+            return self._connection.isalive()
+        except Exception:
+            self._connection = None
+            return False
+
+    def is_healthy(self) -> bool:
+        """Check if the connection can be reused without reconnecting."""
+        return self.is_connected()
+
+    def __enter__(self):
+        raise TypeError("AsyncScrapliConnector must be used with 'async with'")
+
+    async def __aenter__(self):
+        """Async context manager entry."""
+        await self.connect()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        """Async context manager exit."""
+        await self.disconnect()
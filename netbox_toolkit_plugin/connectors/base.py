@@ -1,7 +1,8 @@
 """Base connector interface for device connections."""
 
 from abc import ABC, abstractmethod
-from dataclasses import dataclass
+from concurrent.futures import Future
+from dataclasses import dataclass, field
 from typing import Any
 
 
@@ -20,6 +21,9 @@ class ConnectionConfig:
     transport: str = "system"  # Default to system transport for Scrapli
     platform: str | None = None
     extra_options: dict[str, Any] | None = None
+    device_id: int | None = None  # NetBox device the config was built for
+    # Timeouts were derived from observed latencies rather than static defaults
+    adaptive_timeouts: bool = False
 
 
 @dataclass
@@ -41,9 +45,18 @@ class CommandResult:
     parsing_success: bool = False
     parsing_method: str | None = None  # 'textfsm', 'genie', 'ttp'
     parsing_error: str | None = None
+    # Netmiko style platform the output is parsed for, e.g. cisco_ios
+    parsing_platform: str | None = None
+    # Future resolving to parsed_output when a large output is parsed off-thread
+    parsing_future: Future | None = field(default=None, repr=False, compare=False)
     # Command log ID for referencing the logged command
     command_log_id: int | None = None
 
+    @property
+    def parsing_pending(self) -> bool:
+        """Whether parsed output is still being produced off-thread."""
+        return self.parsing_future is not None and not self.parsing_future.done()
+
 
 class BaseDeviceConnector(ABC):
     """Abstract base class for device connectors."""
@@ -51,11 +64,28 @@ class BaseDeviceConnector(ABC):
     def __init__(self, config: ConnectionConfig):
         self.config = config
         self._connection = None
+        # Latest pre-connection probe result (None if the probe was skipped)
+        self.last_probe = None
+        # Latencies measured by the last successful connect, in seconds
+        self.connect_timings: dict[str, float] = {}
+        # Cleared when a command fails with an exception; the channel may
+        # still hold that command's output, so the session must not be reused
+        self.reusable = True
 
     @abstractmethod
     def connect(self) -> None:
         """Establish connection to the device."""
 
+    def _record_connect_timings(self, login_time: float) -> None:
+        """Store the latencies of a successful connect for timeout tuning.
+
+        Args:
+            login_time: Seconds spent opening the SSH session and logging in
+        """
+        self.connect_timings = {"auth": login_time}
+        if self.last_probe is not None and self.last_probe.connect_time is not None:
+            self.connect_timings["connect"] = self.last_probe.connect_time
+
     @abstractmethod
     def disconnect(self) -> None:
         """Close connection to the device."""
@@ -74,10 +104,36 @@ class BaseDeviceConnector(ABC):
             CommandResult with execution details
         """
 
+    def execute_commands(
+        self, commands: list[str], command_type: str = "show"
+    ) -> list[CommandResult]:
+        """Execute several commands over the already open connection.
+
+        The default implementation runs the commands one after another on the
+        same session. Connectors should override this when the underlying
+        library has a native batch method.
+
+        Args:
+            commands: The command strings to execute, in order
+            command_type: Type of commands ('show' or 'config')
+
+        Returns:
+            One CommandResult per command, in the same order
+        """
+        return [self.execute_command(command, command_type) for command in commands]
+
     @abstractmethod
     def is_connected(self) -> bool:
         """Check if connection is active."""
 
+    def is_healthy(self) -> bool:
+        """Check if the connection can safely be reused for another command.
+
+        Connectors should override this with a cheaper or more thorough check
+        where the underlying library allows it.
+        """
+        return self.is_connected()
+
     def __enter__(self):
         """Context manager entry."""
         self.connect()
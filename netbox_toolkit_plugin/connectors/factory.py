@@ -5,6 +5,7 @@ from dcim.models import Device
 from ..exceptions import DeviceConnectionError, UnsupportedPlatformError
 from ..settings import ToolkitSettings
 from ..utils.logging import get_toolkit_logger
+from .affinity import get_connector_affinity
 from .base import BaseDeviceConnector, ConnectionConfig
 from .netmiko_connector import NetmikoConnector
 from .scrapli_connector import ScrapliConnector
@@ -83,10 +84,15 @@ class ConnectorFactory:
             )
             return connector_class(config)
 
-        # Try platform-specific connector first
+        # Try platform-specific connector first, unless another connector is
+        # known to work better for this device
         primary_connector_class = cls._get_primary_connector_by_platform(
             config.platform
         )
+        if use_fallback:
+            primary_connector_class = cls.get_preferred_connector_class(
+                device, config.platform, primary_connector_class
+            )
 
         try:
             logger.debug(
@@ -134,6 +140,49 @@ class ConnectorFactory:
                     f"Connector creation failed: {error_msg}"
                 ) from e
 
+    @classmethod
+    def get_preferred_connector_class(
+        cls,
+        device: Device,
+        platform: str | None,
+        default: type[BaseDeviceConnector],
+    ) -> type[BaseDeviceConnector]:
+        """Get the connector class that last succeeded for a device.
+
+        Only applies when the default is the primary connector, since devices
+        mapped straight to Netmiko have nothing to fall back from.
+        """
+        if default is not cls.PRIMARY_CONNECTOR:
+            return default
+
+        affinity = get_connector_affinity()
+        if affinity is None:
+            return default
+
+        preferred = affinity.get_preferred(device.pk, platform)
+        if preferred == "netmiko":
+            logger.debug(
+                "Using Netmiko first for device %s (previous Scrapli fallback)",
+                device.name,
+            )
+            return cls.FALLBACK_CONNECTOR
+        return default
+
+    @classmethod
+    def record_connector_success(
+        cls, device: Device, connector: BaseDeviceConnector
+    ) -> None:
+        """Remember the connector that just completed an execution on a device."""
+        affinity = get_connector_affinity()
+        if affinity is None:
+            return
+
+        try:
+            affinity.record_success(device.pk, connector.config.platform, connector)
+        except Exception as e:
+            # Affinity is an optimization - never fail an execution over it
+            logger.debug("Could not record connector affinity: %s", str(e))
+
     @classmethod
     def _create_fallback_connector(
         cls, config: ConnectionConfig, device_name: str, primary_error: str
@@ -176,6 +225,8 @@ class ConnectorFactory:
             transport=base_config.transport,
             platform=base_config.platform,
             extra_options=None,  # Start with clean extra_options
+            device_id=base_config.device_id,
+            adaptive_timeouts=base_config.adaptive_timeouts,
         )
 
         # Add connector-specific configurations
@@ -220,6 +271,14 @@ class ConnectorFactory:
         device_model = str(device.device_type.model) if device.device_type else None
         timeouts = ToolkitSettings.get_timeouts_for_device(device_model)
 
+        # Prefer timeouts derived from the device's observed latencies
+        adaptive_timeouts = cls._get_adaptive_timeouts(device, timeouts)
+        if adaptive_timeouts:
+            logger.debug(
+                "Using adaptive timeouts for %s: %s", device.name, adaptive_timeouts
+            )
+            timeouts = adaptive_timeouts
+
         # Build configuration
         config = ConnectionConfig(
             hostname=hostname,
@@ -229,6 +288,8 @@ class ConnectorFactory:
             timeout_socket=timeouts["socket"],
             timeout_transport=timeouts["transport"],
             timeout_ops=timeouts["ops"],
+            device_id=device.pk,
+            adaptive_timeouts=bool(adaptive_timeouts),
         )
 
         # Add device-specific customizations if needed
@@ -236,6 +297,15 @@ class ConnectorFactory:
 
         return config
 
+    @classmethod
+    def _get_adaptive_timeouts(
+        cls, device: Device, base_timeouts: dict[str, int]
+    ) -> dict[str, int] | None:
+        """Get timeouts derived from observed latencies, if enough are known."""
+        from ..services.adaptive_timeout_service import AdaptiveTimeoutService
+
+        return AdaptiveTimeoutService().get_timeouts(device, base_timeouts)
+
     @classmethod
     def _customize_config_for_device(
         cls, config: ConnectionConfig, device: Device
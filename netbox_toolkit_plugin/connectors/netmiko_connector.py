@@ -3,6 +3,8 @@
 import time
 from typing import Any
 
+from django.core.cache import cache
+
 from netmiko import ConnectHandler, SSHDetect
 from netmiko.exceptions import (
     NetmikoAuthenticationException,
@@ -15,13 +17,20 @@ from ..exceptions import (
     DeviceConnectionError,
 )
 from ..settings import ToolkitSettings
+from ..utils.connection import validate_connection_health
 from ..utils.error_parser import VendorErrorParser
 from ..utils.logging import get_toolkit_logger
-from ..utils.network import validate_device_connectivity
+from ..utils.network import (
+    invalidate_reachability,
+    record_connection_success,
+    validate_device_connectivity,
+)
 from .base import BaseDeviceConnector, CommandResult, ConnectionConfig
 
 logger = get_toolkit_logger(__name__)
 
+DEVICE_TYPE_CACHE_PREFIX = "netbox_toolkit:netmiko_device_type"
+
 
 class NetmikoConnector(BaseDeviceConnector):
     """Netmiko-based implementation of device connector for legacy/fallback support."""
@@ -53,6 +62,7 @@ class NetmikoConnector(BaseDeviceConnector):
         super().__init__(config)
         self._error_parser = VendorErrorParser()
         self._retry_config = ToolkitSettings.get_retry_config()
+        self._detected_device_type = None
 
         # Use config from extra_options if available, otherwise get from ToolkitSettings
         if config.extra_options:
@@ -145,8 +155,55 @@ class NetmikoConnector(BaseDeviceConnector):
         )
         return device_type
 
+    def _get_device_type_cache_key(self) -> str:
+        """Build the cache key for this device's auto-detected device type.
+
+        The platform is part of the key, so changing a device's platform in
+        NetBox makes the old detection result unreachable.
+        """
+        device_ref = self.config.device_id or self.config.hostname
+        platform = self.config.platform or "none"
+        return f"{DEVICE_TYPE_CACHE_PREFIX}:{device_ref}:{platform}"
+
     def _auto_detect_device_type(self) -> str:
-        """Use Netmiko's auto-detection for unknown platforms."""
+        """Use Netmiko's auto-detection for unknown platforms.
+
+        Detection needs a full SSH login, so the result is cached per device
+        and platform. The detection runs once, not on every execution.
+        """
+        if self._detected_device_type:
+            return self._detected_device_type
+
+        cache_config = ToolkitSettings.get_device_type_cache_config()
+        use_cache = cache_config.get("enabled", True)
+        cache_key = self._get_device_type_cache_key()
+
+        if use_cache:
+            cached_type = cache.get(cache_key)
+            if cached_type:
+                logger.debug(
+                    f"Using cached device type '{cached_type}' for {self.config.hostname}"
+                )
+                self._detected_device_type = cached_type
+                return cached_type
+
+        best_match = self._run_auto_detection()
+        if best_match:
+            self._detected_device_type = best_match
+            if use_cache:
+                cache.set(cache_key, best_match, cache_config["ttl"])
+            return best_match
+
+        # Detection failures may be transient - don't cache the generic fallback
+        return "generic_termserver"
+
+    def forget_detected_device_type(self) -> None:
+        """Drop the cached auto-detection result for this device."""
+        self._detected_device_type = None
+        cache.delete(self._get_device_type_cache_key())
+
+    def _run_auto_detection(self) -> str | None:
+        """Run Netmiko's SSHDetect against the device."""
         try:
             logger.debug(f"Attempting auto-detection for {self.config.hostname}")
 
@@ -171,11 +228,11 @@ class NetmikoConnector(BaseDeviceConnector):
                 logger.warning(
                     f"Auto-detection failed for {self.config.hostname}, using generic"
                 )
-                return "generic_termserver"
+                return None
 
         except Exception as e:
             logger.warning(f"Auto-detection error for {self.config.hostname}: {str(e)}")
-            return "generic_termserver"
+            return None
 
     def _build_connection_params(self) -> dict[str, Any]:
         """Build connection parameters for Netmiko."""
@@ -238,7 +295,9 @@ class NetmikoConnector(BaseDeviceConnector):
             return
 
         # Validate connectivity first
-        validate_device_connectivity(self.config.hostname, self.config.port)
+        self.last_probe = validate_device_connectivity(
+            self.config.hostname, self.config.port
+        )
 
         max_retries = self._retry_config["max_retries"]
         retry_delay = self._retry_config["retry_delay"]
@@ -263,11 +322,14 @@ class NetmikoConnector(BaseDeviceConnector):
                 logger.debug(
                     f"Creating Netmiko ConnectHandler for {self.config.hostname}"
                 )
+                connect_start = time.perf_counter()
                 self._connection = ConnectHandler(**conn_params)
+                self._record_connect_timings(time.perf_counter() - connect_start)
 
                 logger.info(
                     f"Successfully connected to {self.config.hostname} using Netmiko"
                 )
+                record_connection_success(self.config.hostname, self.config.port)
                 return
 
             except NetmikoAuthenticationException as e:
@@ -280,6 +342,7 @@ class NetmikoConnector(BaseDeviceConnector):
                 )
 
                 if attempt >= max_retries:
+                    invalidate_reachability(self.config.hostname, self.config.port)
                     raise DeviceConnectionError(
                         f"Connection timeout after {max_retries + 1} attempts: {str(e)}"
                     ) from e
@@ -288,6 +351,11 @@ class NetmikoConnector(BaseDeviceConnector):
                 logger.warning(f"Netmiko connection error for {self.config.hostname}")
 
                 if attempt >= max_retries:
+                    invalidate_reachability(self.config.hostname, self.config.port)
+                    # A stale detected device type can break the login prompt
+                    # handling - detect again next time
+                    if self._detected_device_type:
+                        self.forget_detected_device_type()
                     raise DeviceConnectionError(
                         f"Netmiko connection failed: {str(e)}"
                     ) from e
@@ -296,6 +364,7 @@ class NetmikoConnector(BaseDeviceConnector):
                 logger.warning(f"Connection error for {self.config.hostname}")
 
                 if attempt >= max_retries:
+                    invalidate_reachability(self.config.hostname, self.config.port)
                     raise DeviceConnectionError(f"Connection failed: {str(e)}") from e
 
     def disconnect(self) -> None:
@@ -340,9 +409,8 @@ class NetmikoConnector(BaseDeviceConnector):
             # Use command_type parameter to determine execution method
             if command_type == "config":
                 output = self._execute_config_command(command)
-                parsed_data = None  # Config commands don't get parsed
             else:
-                output, parsed_data = self._execute_show_command(command)
+                output = self._execute_show_command(command)
 
             execution_time = time.time() - start_time
 
@@ -354,11 +422,8 @@ class NetmikoConnector(BaseDeviceConnector):
                 execution_time=execution_time,
             )
 
-            # Add parsed data if available
-            if parsed_data:
-                result.parsed_output = parsed_data
-                result.parsing_success = True
-                result.parsing_method = "textfsm"
+            # Show output is parsed by the command's parsers for this platform
+            result.parsing_platform = self._connection.device_type
 
             # Check for syntax errors in the output even if command executed successfully
             parsed_error = self._error_parser.parse_command_output(
@@ -400,18 +465,15 @@ class NetmikoConnector(BaseDeviceConnector):
                         result.output = f"No output returned for command: {command}\n\nThis typically means:\n• The access list name is incorrect or doesn't exist\n• The access list exists but is empty\n• Check the access list name spelling\n• Verify the access list exists on this device"
 
             # Log final result summary
-            if parsed_data:
-                logger.debug(
-                    f"Command completed in {execution_time:.2f}s with {len(parsed_data)} parsed records"
-                )
-            else:
-                logger.debug(f"Command completed in {execution_time:.2f}s")
+            logger.debug(f"Command completed in {execution_time:.2f}s")
             return result
 
         except NetmikoBaseException as e:
             execution_time = time.time() - start_time
             error_msg = str(e)
             logger.error(f"Command execution failed: {error_msg}")
+            # Timeouts and prompt mismatches can leave unread output on the channel
+            self.reusable = False
 
             return CommandResult(
                 command=command,
@@ -425,6 +487,7 @@ class NetmikoConnector(BaseDeviceConnector):
             execution_time = time.time() - start_time
             error_msg = f"Unexpected error: {str(e)}"
             logger.error(f"Command execution failed: {error_msg}")
+            self.reusable = False
 
             return CommandResult(
                 command=command,
@@ -434,53 +497,17 @@ class NetmikoConnector(BaseDeviceConnector):
                 execution_time=execution_time,
             )
 
-    def _execute_show_command(self, command: str) -> tuple[str, list | None]:
-        """Execute a show/display command and return both raw output and parsed data.
+    def _execute_show_command(self, command: str) -> str:
+        """Execute a show/display command and return its raw output.
 
         Args:
             command: The command to execute
 
         Returns:
-            tuple: (raw_output, parsed_data) where parsed_data is None if parsing failed
+            Raw command output
         """
         try:
-            # Execute command once and get raw output
-            raw_output = self._connection.send_command(command)
-
-            # Now attempt TextFSM parsing using the textfsm library directly
-            # This avoids re-executing the command on the device
-            parsed_data = None
-            try:
-                # Import textfsm here to avoid dependency issues if not installed
-                from ntc_templates.parse import parse_output
-
-                # Try to parse using ntc-templates (which is what Netmiko uses)
-                try:
-                    parsed_result = parse_output(
-                        platform=self._connection.device_type,
-                        command=command,
-                        data=raw_output,
-                    )
-
-                    if (
-                        isinstance(parsed_result, list)
-                        and len(parsed_result) > 0
-                        and isinstance(parsed_result[0], dict)
-                    ):
-                        parsed_data = parsed_result
-                        logger.debug(f"TextFSM parsed {len(parsed_data)} records")
-                    else:
-                        logger.debug("No TextFSM template found")
-
-                except Exception as ntc_error:
-                    logger.debug(f"TextFSM parsing failed: {str(ntc_error)}")
-
-            except ImportError:
-                logger.debug("TextFSM or ntc-templates not available, skipping parsing")
-            except Exception as parse_error:
-                logger.debug(f"TextFSM parsing failed: {str(parse_error)}")
-
-            return raw_output, parsed_data
+            return self._connection.send_command(command)
 
         except Exception as e:
             logger.error(f"Show command failed: {str(e)}")
@@ -507,3 +534,17 @@ class NetmikoConnector(BaseDeviceConnector):
             return True
         except Exception:
             return False
+
+    def is_healthy(self) -> bool:
+        """Check if the connection can be reused without reconnecting."""
+        if not self._connection:
+            return False
+
+        try:
+            # is_alive() checks the transport without a round trip to the device
+            return (
+                validate_connection_health(self._connection)
+                and self._connection.is_alive()
+            )
+        except Exception:
+            return False
@@ -0,0 +1,225 @@
+"""Process-local pool of persistent device sessions."""
+
+import contextlib
+import hashlib
+import hmac
+import secrets
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Iterator
+from dataclasses import dataclass
+
+from ..settings import ToolkitSettings
+from ..utils.logging import get_toolkit_logger
+from ..utils.network import record_connection_success
+from .base import BaseDeviceConnector
+
+logger = get_toolkit_logger(__name__)
+
+# (device id, hostname, port, credential fingerprint, connector class name)
+PoolKey = tuple[int | None, str, int, str, str]
+
+
+@dataclass
+class PooledSession:
+    """An idle connector held by the pool."""
+
+    connector: BaseDeviceConnector
+    last_used: float
+
+
+class ConnectionPool:
+    """Keep connected device sessions open between command executions.
+
+    Sessions are keyed by device, credential set and connector class. A session
+    is checked out for the duration of one execution, so it is never shared by
+    two threads at the same time. Idle sessions are evicted once they exceed the
+    configured idle timeout, or least-recently-used first when the pool is full.
+    """
+
+    def __init__(self, max_size: int = 32, idle_timeout: float = 120):
+        self.max_size = max_size
+        self.idle_timeout = idle_timeout
+        self._sessions: OrderedDict[PoolKey, list[PooledSession]] = OrderedDict()
+        self._lock = threading.Lock()
+        # Per-process secret so credential fingerprints are meaningless elsewhere
+        self._fingerprint_key = secrets.token_bytes(32)
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def make_key(
+        self, device_id: int | None, connector: BaseDeviceConnector
+    ) -> PoolKey:
+        """Build the pool key for a connector created for a device."""
+        config = connector.config
+        credential_material = f"{config.username}\0{config.password}".encode()
+        fingerprint = hmac.new(
+            self._fingerprint_key, credential_material, hashlib.sha256
+        ).hexdigest()
+        return (
+            device_id,
+            config.hostname,
+            config.port,
+            fingerprint,
+            type(connector).__name__,
+        )
+
+    def acquire(self, key: PoolKey) -> BaseDeviceConnector | None:
+        """Check out a healthy idle session for the key, if one exists."""
+        expired = self._collect_expired()
+        self._close_all(expired)
+
+        while True:
+            with self._lock:
+                sessions = self._sessions.get(key)
+                if not sessions:
+                    self.misses += 1
+                    return None
+
+                pooled = sessions.pop()
+                if not sessions:
+                    del self._sessions[key]
+
+            if pooled.connector.is_healthy():
+                with self._lock:
+                    self.hits += 1
+                logger.debug("Reusing pooled session for %s", key[1])
+                return pooled.connector
+
+            logger.debug("Discarding unhealthy pooled session for %s", key[1])
+            self._close_all([pooled.connector])
+
+    def release(self, key: PoolKey, connector: BaseDeviceConnector) -> None:
+        """Return a session to the pool, or close it if it can't be reused."""
+        if not connector.reusable:
+            # A command failed mid-execution; its output may still be unread
+            logger.debug("Not pooling session for %s after a failed command", key[1])
+            self._close_all([connector])
+            return
+
+        if not connector.is_healthy():
+            logger.debug("Not pooling unhealthy session for %s", key[1])
+            self._close_all([connector])
+            return
+
+        # A healthy session proves the host is reachable
+        record_connection_success(connector.config.hostname, connector.config.port)
+
+        evicted = []
+        with self._lock:
+            self._sessions.setdefault(key, []).append(
+                PooledSession(connector=connector, last_used=time.monotonic())
+            )
+            self._sessions.move_to_end(key)
+
+            while self._size() > self.max_size:
+                oldest_key = next(iter(self._sessions))
+                oldest_sessions = self._sessions[oldest_key]
+                evicted.append(oldest_sessions.pop(0).connector)
+                if not oldest_sessions:
+                    del self._sessions[oldest_key]
+                self.evictions += 1
+
+        self._close_all(evicted)
+
+    def discard(self, connector: BaseDeviceConnector) -> None:
+        """Close a checked-out session that must not be reused."""
+        self._close_all([connector])
+
+    @contextlib.contextmanager
+    def session(
+        self, device_id: int | None, connector: BaseDeviceConnector
+    ) -> Iterator[BaseDeviceConnector]:
+        """Yield a connected session, reusing a pooled one when available.
+
+        ``connector`` is a freshly created, unconnected connector. It is only
+        connected if no pooled session matches its key.
+        """
+        key = self.make_key(device_id, connector)
+        active = self.acquire(key)
+        if active is None:
+            active = connector
+            active.connect()
+
+        try:
+            yield active
+        except BaseException:
+            self.discard(active)
+            raise
+        else:
+            self.release(key, active)
+
+    def clear(self) -> None:
+        """Close every idle session held by the pool."""
+        with self._lock:
+            connectors = [
+                pooled.connector
+                for sessions in self._sessions.values()
+                for pooled in sessions
+            ]
+            self._sessions.clear()
+        self._close_all(connectors)
+
+    def get_stats(self) -> dict[str, int]:
+        """Get pool counters for monitoring."""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "size": self._size(),
+                "max_size": self.max_size,
+            }
+
+    def _size(self) -> int:
+        return sum(len(sessions) for sessions in self._sessions.values())
+
+    def _collect_expired(self) -> list[BaseDeviceConnector]:
+        """Remove sessions that have been idle for longer than the timeout."""
+        cutoff = time.monotonic() - self.idle_timeout
+        expired = []
+        with self._lock:
+            for key in list(self._sessions):
+                sessions = self._sessions[key]
+                fresh = [pooled for pooled in sessions if pooled.last_used >= cutoff]
+                expired.extend(
+                    pooled.connector for pooled in sessions if pooled.last_used < cutoff
+                )
+                if fresh:
+                    self._sessions[key] = fresh
+                else:
+                    del self._sessions[key]
+            self.evictions += len(expired)
+        return expired
+
+    def _close_all(self, connectors: list[BaseDeviceConnector]) -> None:
+        # Disconnect outside the lock - closing a session can block on I/O
+        for connector in connectors:
+            try:
+                connector.disconnect()
+            except Exception as e:
+                logger.debug("Error closing pooled session: %s", str(e))
+
+
+_pool: ConnectionPool | None = None
+_pool_lock = threading.Lock()
+
+
+def get_connection_pool() -> ConnectionPool | None:
+    """Get the process-wide connection pool, or None if pooling is disabled."""
+    global _pool
+
+    pool_config = ToolkitSettings.get_connection_pool_config()
+    if not pool_config.get("enabled", True):
+        return None
+
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = ConnectionPool(
+                    max_size=pool_config["max_size"],
+                    idle_timeout=pool_config["idle_timeout"],
+                )
+    return _pool
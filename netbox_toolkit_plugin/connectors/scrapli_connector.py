@@ -1,5 +1,6 @@
 """Scrapli-based device connector implementation."""
 
+import math
 import time
 from typing import Any
 
@@ -12,12 +13,17 @@ from ..exceptions import (
 from ..settings import ToolkitSettings
 from ..utils.connection import (
     cleanup_connection_resources,
+    get_connection_handles,
     validate_connection_health,
     wait_for_socket_cleanup,
 )
 from ..utils.error_parser import VendorErrorParser
 from ..utils.logging import get_toolkit_logger
-from ..utils.network import validate_device_connectivity
+from ..utils.network import (
+    invalidate_reachability,
+    record_connection_success,
+    validate_device_connectivity,
+)
 from .base import BaseDeviceConnector, CommandResult, ConnectionConfig
 
 logger = get_toolkit_logger(__name__)
@@ -100,8 +106,9 @@ class ScrapliConnector(BaseDeviceConnector):
 
     def _build_connection_params(self) -> dict[str, Any]:
         """Build connection parameters for Scrapli."""
-        # Use fast test timeouts for initial attempts if in fast fail mode
-        if self._fast_fail_mode:
+        # Use fast test timeouts for initial attempts if in fast fail mode.
+        # Adaptive timeouts are already tuned to the device, so keep them.
+        if self._fast_fail_mode and not self.config.adaptive_timeouts:
             fast_timeouts = ToolkitSettings.get_fast_test_timeouts()
             socket_timeout = fast_timeouts["socket"]
             transport_timeout = fast_timeouts["transport"]
@@ -212,7 +219,9 @@ class ScrapliConnector(BaseDeviceConnector):
             logger.debug(
                 f"Validating basic connectivity to {self.config.hostname}:{self.config.port}"
             )
-            validate_device_connectivity(self.config.hostname, self.config.port)
+            self.last_probe = validate_device_connectivity(
+                self.config.hostname, self.config.port
+            )
         except Exception as e:
             logger.error(
                 f"Pre-connection validation failed for {self.config.hostname}: {str(e)}"
@@ -250,16 +259,7 @@ class ScrapliConnector(BaseDeviceConnector):
                             "Switched to normal timeouts for subsequent attempts"
                         )
 
-                    # Adjust timeouts for SSH banner issues
-                    if (
-                        "banner" in str(last_error).lower()
-                        or "timed out" in str(last_error).lower()
-                    ):
-                        logger.debug(
-                            "Detected banner/timeout issue, increasing timeouts by 5s"
-                        )
-                        conn_params["timeout_socket"] += 5
-                        conn_params["timeout_transport"] += 5
+                    self._grow_retry_timeouts(conn_params, last_error)
 
                     retry_delay *= self._retry_config["backoff_multiplier"]
                 else:
@@ -272,11 +272,14 @@ class ScrapliConnector(BaseDeviceConnector):
                 self._connection = self._driver_class(**conn_params)
 
                 logger.debug("Opening connection to device")
+                open_start = time.perf_counter()
                 self._connection.open()
+                self._record_connect_timings(time.perf_counter() - open_start)
 
                 logger.info(
                     f"Successfully connected to {self.config.hostname} using {self._driver_class.__name__}"
                 )
+                record_connection_success(self.config.hostname, self.config.port)
                 return
 
             except Exception as e:
@@ -288,6 +291,11 @@ class ScrapliConnector(BaseDeviceConnector):
                     f"Connection attempt {attempt + 1} failed for {self.config.hostname}: {error_msg}"
                 )
 
+                # Clean up failed connection attempt before retrying or raising
+                if self._connection:
+                    logger.debug("Cleaning up failed connection attempt")
+                    self._release_connection()
+
                 # Check for authentication failure first (before fast-fail patterns)
                 if self._is_authentication_error(error_msg):
                     logger.error(
@@ -306,41 +314,59 @@ class ScrapliConnector(BaseDeviceConnector):
                         f"Fast-fail to Netmiko: {error_msg}"
                     ) from None
 
-                # Clean up failed connection attempt
-                if self._connection:
-                    try:
-                        logger.debug("Cleaning up failed connection attempt")
-                        self._connection.close()
-                    except Exception:
-                        pass
-                    self._connection = None
-
                 if attempt >= max_retries:
+                    # Don't trust the cached probe result for the next attempt
+                    invalidate_reachability(self.config.hostname, self.config.port)
                     error_msg = self._format_connection_error(e)
                     logger.error(
                         f"All connection attempts failed for {self.config.hostname}: {error_msg}"
                     )
                     raise DeviceConnectionError(error_msg) from e
 
+    def _grow_retry_timeouts(
+        self, conn_params: dict[str, Any], last_error: Exception | None
+    ) -> None:
+        """Grow the connection timeouts for a retry after an SSH banner issue."""
+        # Grow timeouts in proportion to their size, so tight adaptive
+        # timeouts and generous static ones are both extended sensibly
+        if (
+            "banner" in str(last_error).lower()
+            or "timed out" in str(last_error).lower()
+        ):
+            growth = ToolkitSettings.get_adaptive_timeout_config()["retry_growth"]
+            logger.debug(
+                f"Detected banner/timeout issue, growing timeouts by {growth}x"
+            )
+            for timeout_key in ("timeout_socket", "timeout_transport"):
+                conn_params[timeout_key] = math.ceil(conn_params[timeout_key] * growth)
+
     def disconnect(self) -> None:
         """Close connection to the device with proper socket cleanup."""
         if self._connection:
             logger.debug(f"Disconnecting from {self.config.hostname}")
-            try:
-                # Use the robust cleanup utility
-                cleanup_connection_resources(self._connection)
-                logger.debug("Connection cleanup completed successfully")
-            except Exception as e:
-                logger.warning(f"Error during connection cleanup: {str(e)}")
-                # Cleanup error ignored
-            finally:
-                self._connection = None
-                # Give time for socket cleanup to complete
-                wait_for_socket_cleanup()
-                logger.debug("Socket cleanup wait completed")
+            self._release_connection()
         else:
             logger.debug("No active connection to disconnect")
 
+    def _release_connection(self) -> None:
+        """Close the current connection and wait until its sockets are released."""
+        # Collect handles first - cleanup may drop the references to them
+        handles = get_connection_handles(self._connection)
+        try:
+            # Use the robust cleanup utility
+            cleanup_connection_resources(self._connection)
+            logger.debug("Connection cleanup completed successfully")
+        except Exception as e:
+            logger.warning(f"Error during connection cleanup: {str(e)}")
+            # Cleanup error ignored
+        finally:
+            self._connection = None
+            # Wait only as long as the sockets actually take to close
+            if wait_for_socket_cleanup(handles):
+                logger.debug("Connection handles released")
+            else:
+                logger.debug("Connection handles not released in time, forced close")
+
     def is_connected(self) -> bool:
         """Check if connection is active with proper error handling."""
         if not self._connection:
@@ -359,6 +385,12 @@ class ScrapliConnector(BaseDeviceConnector):
             self._connection = None
             return False
 
+    def is_healthy(self) -> bool:
+        """Check if the connection can be reused without reconnecting."""
+        if not self._connection:
+            return False
+        return validate_connection_health(self._connection)
+
     def _validate_and_recover_connection(self) -> bool:
         """Validate connection and attempt recovery if needed."""
         try:
@@ -420,146 +452,203 @@ class ScrapliConnector(BaseDeviceConnector):
                 response = self._connection.send_command(command)
 
             execution_time = time.time() - start_time
-            logger.debug(
-                f"Command completed in {execution_time:.2f}s, output length: {len(response.result)} chars"
-            )
+            return self._build_command_result(command, response, execution_time)
 
-            # Create initial result
-            result = CommandResult(
-                command=command,
-                output=response.result,
-                success=True,
-                execution_time=execution_time,
-            )
+        except Exception as e:
+            return self._build_failed_result(command, e, time.time() - start_time)
 
-            # Check for syntax errors in the output even if command executed successfully
-            parsed_error = self._error_parser.parse_command_output(
-                response.result, self.config.platform
-            )
-            if parsed_error:
-                logger.warning(
-                    f"Syntax error detected in command output: {parsed_error.error_type.value}"
-                )
-                # Update result with syntax error information
-                result.has_syntax_error = True
-                result.syntax_error_type = parsed_error.error_type.value
-                result.syntax_error_vendor = parsed_error.vendor
-                result.syntax_error_guidance = parsed_error.guidance
-
-                # Enhance the output with error information
-                enhanced_output = response.result + "\n\n" + "=" * 50 + "\n"
-                enhanced_output += "SYNTAX ERROR DETECTED\n" + "=" * 50 + "\n"
-                enhanced_output += f"Error Type: {parsed_error.error_type.value.replace('_', ' ').title()}\n"
-                enhanced_output += f"Vendor: {self._error_parser._get_vendor_display_name(parsed_error.vendor)}\n"
-                enhanced_output += f"Confidence: {parsed_error.confidence:.0%}\n\n"
-                enhanced_output += parsed_error.enhanced_message + "\n\n"
-                enhanced_output += parsed_error.guidance
-
-                result.output = enhanced_output
-            else:
-                # Check for empty output that might indicate a user error (e.g., invalid access list name)
-                if not response.result or not response.result.strip():
-                    # For certain command types, empty output might indicate invalid parameters
-                    if command.lower().startswith(("show access-list", "show acl")):
-                        # Set a custom syntax error for empty ACL results
-                        result.has_syntax_error = True
-                        result.syntax_error_type = "empty_result"
-                        result.syntax_error_vendor = self.config.platform or "generic"
-                        result.syntax_error_guidance = (
-                            "The command executed successfully but returned no output."
-                        )
-                        # Enhance the output with user-friendly message
-                        result.output = f"No output returned for command: {command}\n\nThis typically means:\n• The access list name is incorrect or doesn't exist\n• The access list exists but is empty\n• Check the access list name spelling\n• Verify the access list exists on this device"
+    def execute_commands(
+        self, commands: list[str], command_type: str = "show"
+    ) -> list[CommandResult]:
+        """Execute several commands in one session using scrapli's batch methods.
 
-            # Attempt to parse command output using TextFSM (only for successful commands without syntax errors)
-            if result.success and not result.has_syntax_error:
-                logger.debug("Attempting to parse command output with TextFSM")
-                result = self._attempt_parsing(result, response)
+        Args:
+            commands: The command strings to execute, in order
+            command_type: Type of commands ('show' or 'config')
 
-            return result
+        Returns:
+            One CommandResult per command, in the same order
+        """
+        if not commands:
+            return []
 
-        except OSError as e:
-            # Handle socket-related errors specifically
-            execution_time = time.time() - start_time
-            if "Bad file descriptor" in str(e) or e.errno == 9:
-                # Socket has been closed or is invalid
-                logger.error(f"Socket error during command execution: {str(e)}")
-                self._connection = None  # Mark connection as invalid
-                error_msg = f"Connection lost due to socket error: {str(e)}"
-            else:
-                logger.error(f"OS error during command execution: {str(e)}")
-                error_msg = f"OS error during command execution: {str(e)}"
-
-            return CommandResult(
-                command=command,
-                output="",
-                success=False,
-                error_message=error_msg,
-                execution_time=execution_time,
-            )
+        logger.info(
+            f"DEVICE_COMMAND: Sending {len(commands)} {command_type} commands to "
+            f"{self.config.hostname}: {commands!r}"
+        )
+
+        if not self._validate_and_recover_connection():
+            logger.error("Connection validation failed before executing commands")
+            raise DeviceConnectionError("Connection is not available or has been lost")
+
+        start_time = time.time()
 
+        try:
+            if command_type == "config":
+                # send_configs enters and leaves config mode once for the batch
+                config_lines, spans = self._split_config_commands(commands)
+                responses = self._join_config_responses(
+                    commands, spans, self._connection.send_configs(config_lines)
+                )
+            else:
+                responses = self._connection.send_commands(commands)
         except Exception as e:
             execution_time = time.time() - start_time
-            error_msg = f"Command execution failed: {str(e)}"
-            logger.error(f"Command execution failed for '{command}': {str(e)}")
+            return [
+                self._build_failed_result(command, e, execution_time)
+                for command in commands
+            ]
 
-            # Check if this is a connection-related error
-            if "connection" in str(e).lower() or "socket" in str(e).lower():
-                logger.warning(
-                    "Detected connection-related error, marking connection as invalid"
-                )
-                self._connection = None  # Mark connection as invalid
+        logger.debug(
+            f"Batch of {len(commands)} commands completed in "
+            f"{time.time() - start_time:.2f}s"
+        )
+
+        return [
+            self._build_command_result(command, response, response.elapsed_time)
+            for command, response in zip(commands, responses, strict=False)
+        ]
 
-            return CommandResult(
-                command=command,
-                output="",
-                success=False,
-                error_message=error_msg,
-                execution_time=execution_time,
+    @staticmethod
+    def _split_config_commands(
+        commands: list[str],
+    ) -> tuple[list[str], list[slice]]:
+        """Split config commands into lines, as send_config does for one command.
+
+        send_configs sends each item as a single line, so a multi-line command
+        must be split first to behave the same in a batch as on its own.
+
+        Returns:
+            Tuple of (lines to send, each command's slice of those lines)
+        """
+        lines = []
+        spans = []
+        for command in commands:
+            command_lines = command.splitlines() or [command]
+            spans.append(slice(len(lines), len(lines) + len(command_lines)))
+            lines.extend(command_lines)
+        return lines, spans
+
+    def _join_config_responses(
+        self, commands: list[str], spans: list[slice], multi_response
+    ) -> list:
+        """Combine the per-line responses of a config batch into one per command."""
+        responses = []
+        for command, span in zip(commands, spans, strict=True):
+            line_responses = type(multi_response)(multi_response[span])
+            # The same join send_config applies to the lines of one command
+            response = self._connection._post_send_config(
+                config=command, multi_response=line_responses
+            )
+            response.elapsed_time = sum(
+                line_response.elapsed_time for line_response in line_responses
             )
+            responses.append(response)
+        return responses
 
-    def _attempt_parsing(self, result: CommandResult, response) -> CommandResult:
-        """Attempt to parse command output using available parsers.
+    def _build_command_result(
+        self, command: str, response, execution_time: float
+    ) -> CommandResult:
+        """Build a CommandResult from a scrapli response.
 
         Args:
-            result: The current CommandResult
+            command: The command that was sent
             response: The scrapli response object
+            execution_time: Time taken to execute the command in seconds
 
         Returns:
-            Updated CommandResult with parsing information
+            CommandResult with syntax error details applied
         """
-        # Try TextFSM parsing first (most comprehensive template library)
-        try:
-            parsed_data = response.textfsm_parse_output()
+        logger.debug(
+            f"Command completed in {execution_time:.2f}s, output length: {len(response.result)} chars"
+        )
 
-            if parsed_data:
-                # TextFSM parsing successful
-                logger.debug(
-                    f"TextFSM parsing successful, parsed {len(parsed_data)} records"
-                )
-                result.parsed_output = parsed_data
-                result.parsing_success = True
-                result.parsing_method = "textfsm"
+        # Create initial result
+        result = CommandResult(
+            command=command,
+            output=response.result,
+            success=True,
+            execution_time=execution_time,
+            # Show output is parsed by the command's parsers for this platform
+            parsing_platform=response.textfsm_platform or None,
+        )
 
-                return result
-            else:
-                logger.debug(
-                    "TextFSM parsing returned empty result (no matching template)"
-                )
-                # TextFSM parsing returned empty result
+        # Check for syntax errors in the output even if command executed successfully
+        parsed_error = self._error_parser.parse_command_output(
+            response.result, self.config.platform
+        )
+        if parsed_error:
+            logger.warning(
+                f"Syntax error detected in command output: {parsed_error.error_type.value}"
+            )
+            # Update result with syntax error information
+            result.has_syntax_error = True
+            result.syntax_error_type = parsed_error.error_type.value
+            result.syntax_error_vendor = parsed_error.vendor
+            result.syntax_error_guidance = parsed_error.guidance
+
+            # Enhance the output with error information
+            enhanced_output = response.result + "\n\n" + "=" * 50 + "\n"
+            enhanced_output += "SYNTAX ERROR DETECTED\n" + "=" * 50 + "\n"
+            enhanced_output += f"Error Type: {parsed_error.error_type.value.replace('_', ' ').title()}\n"
+            enhanced_output += f"Vendor: {self._error_parser._get_vendor_display_name(parsed_error.vendor)}\n"
+            enhanced_output += f"Confidence: {parsed_error.confidence:.0%}\n\n"
+            enhanced_output += parsed_error.enhanced_message + "\n\n"
+            enhanced_output += parsed_error.guidance
+
+            result.output = enhanced_output
+        else:
+            # Check for empty output that might indicate a user error (e.g., invalid access list name)
+            if not response.result or not response.result.strip():
+                # For certain command types, empty output might indicate invalid parameters
+                if command.lower().startswith(("show access-list", "show acl")):
+                    # Set a custom syntax error for empty ACL results
+                    result.has_syntax_error = True
+                    result.syntax_error_type = "empty_result"
+                    result.syntax_error_vendor = self.config.platform or "generic"
+                    result.syntax_error_guidance = (
+                        "The command executed successfully but returned no output."
+                    )
+                    # Enhance the output with user-friendly message
+                    result.output = f"No output returned for command: {command}\n\nThis typically means:\n• The access list name is incorrect or doesn't exist\n• The access list exists but is empty\n• Check the access list name spelling\n• Verify the access list exists on this device"
 
-        except Exception as e:
-            # TextFSM parsing failed - this is common for commands without templates
-            error_msg = str(e)
-            logger.debug(f"TextFSM parsing failed: {error_msg}")
+        return result
 
-            # Store parsing error for debugging (but don't fail the command)
-            result.parsing_error = f"TextFSM: {error_msg}"
+    def _build_failed_result(
+        self, command: str, error: Exception, execution_time: float
+    ) -> CommandResult:
+        """Build a failed CommandResult for an exception raised while executing."""
+        # Timeouts and prompt mismatches can leave unread output on the channel
+        self.reusable = False
 
-        # Could add other parsers here in the future (Genie, TTP)
-        # For now, we only attempt TextFSM
+        if isinstance(error, OSError):
+            # Handle socket-related errors specifically
+            if "Bad file descriptor" in str(error) or error.errno == 9:
+                # Socket has been closed or is invalid
+                logger.error(f"Socket error during command execution: {str(error)}")
+                self._connection = None  # Mark connection as invalid
+                error_msg = f"Connection lost due to socket error: {str(error)}"
+            else:
+                logger.error(f"OS error during command execution: {str(error)}")
+                error_msg = f"OS error during command execution: {str(error)}"
+        else:
+            error_msg = f"Command execution failed: {str(error)}"
+            logger.error(f"Command execution failed for '{command}': {str(error)}")
 
-        return result
+            # Check if this is a connection-related error
+            if "connection" in str(error).lower() or "socket" in str(error).lower():
+                logger.warning(
+                    "Detected connection-related error, marking connection as invalid"
+                )
+                self._connection = None  # Mark connection as invalid
+
+        return CommandResult(
+            command=command,
+            output="",
+            success=False,
+            error_message=error_msg,
+            execution_time=execution_time,
+        )
 
     def _format_connection_error(self, error: Exception) -> str:
         """Format connection error with helpful troubleshooting information."""
@@ -27,3 +27,12 @@ class CommandExecutionError(ToolkitError):
 
 class UnsupportedPlatformError(ToolkitError):
     """Raised when device platform is not supported."""
+
+
+class CredentialVerificationBusyError(ToolkitError):
+    """Raised when too many credential hashing operations are already queued."""
+
+    def __init__(self, message: str, retry_after: int = 1):
+        super().__init__(message)
+        # Seconds clients should wait before retrying
+        self.retry_after = retry_after
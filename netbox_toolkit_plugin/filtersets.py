@@ -77,10 +77,16 @@ class CommandLogFilterSet(NetBoxModelFilterSet):
         lookup_expr="icontains",
         label="Command name contains",
     )
+    has_parsed_data = django_filters.BooleanFilter(
+        field_name="parsed_data_compressed",
+        lookup_expr="isnull",
+        exclude=True,
+        label="Has parsed data",
+    )
 
     class Meta:
         model = CommandLog
-        fields = ("command", "device", "username", "success")
+        fields = ("command", "device", "username", "success", "parsing_method")
 
     def search(self, queryset, name, value):
         """
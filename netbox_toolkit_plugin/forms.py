@@ -24,7 +24,16 @@ class CommandForm(NetBoxModelForm):
 
     class Meta:
         model = Command
-        fields = ("name", "command", "description", "platforms", "command_type", "tags")
+        fields = (
+            "name",
+            "command",
+            "description",
+            "platforms",
+            "command_type",
+            "parsers",
+            "ttp_template",
+            "tags",
+        )
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
@@ -715,6 +724,9 @@ class DeviceCredentialSetForm(NetBoxModelForm):
                             )
                             # Store both the hash for verification and encrypted raw token for display
                             instance.access_token = token_hash
+                            instance.access_token_fingerprint = (
+                                encryption_service.fingerprint_token(raw_token)
+                            )
                             instance.encrypted_token = encryption_service.encrypt_token(
                                 raw_token
                             )
@@ -0,0 +1,179 @@
+"""Compare the parsers on recorded command output."""
+
+from django.core.management.base import BaseCommand, CommandError
+
+from ...connectors.netmiko_connector import NetmikoConnector
+from ...models import Command as ToolkitCommand
+from ...models import CommandLog
+from ...parsers import ParserBenchmark, ParserSample, get_parser_registry
+from ...settings import ToolkitSettings
+
+
+class Command(BaseCommand):
+    help = (
+        "Time each installed parser on the output of recent successful show "
+        "command executions and report how many outputs each parsed and how "
+        "fast. The recommended order puts the parsers that covered the most "
+        "outputs first, fastest first among equals. Use --apply to store it "
+        "as each command's parser order."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--command",
+            action="append",
+            dest="commands",
+            metavar="ID_OR_NAME",
+            help="Command to benchmark (repeatable; default: all show commands)",
+        )
+        parser.add_argument(
+            "--parsers",
+            help="Comma separated parsers to compare (default: all installed)",
+        )
+        parser.add_argument(
+            "--samples",
+            type=int,
+            default=20,
+            help="Most recent outputs of each command to parse",
+        )
+        parser.add_argument(
+            "--iterations",
+            type=int,
+            default=5,
+            help="Times each output is parsed by each parser",
+        )
+        parser.add_argument(
+            "--platform",
+            help="Netmiko style platform to parse as, instead of each device's",
+        )
+        parser.add_argument(
+            "--apply",
+            action="store_true",
+            help="Store the recommended order on each command",
+        )
+
+    def handle(self, *args, **options):
+        if options["samples"] < 1:
+            raise CommandError("--samples must be at least 1")
+
+        benchmark = ParserBenchmark(
+            self._get_parsers(options["parsers"]), iterations=options["iterations"]
+        )
+
+        benchmarked = 0
+        for command in self._get_commands(options["commands"]):
+            samples = self._get_samples(
+                command, options["samples"], options["platform"]
+            )
+            if not samples:
+                if options["verbosity"] >= 2:
+                    self.stdout.write(f"{command.name}: no recorded output, skipped")
+                continue
+
+            timings = benchmark.run(samples)
+            recommended = benchmark.recommend(timings)
+            benchmarked += 1
+
+            self.stdout.write(
+                self.style.MIGRATE_HEADING(
+                    f"{command.name} ({len(samples)} recorded outputs)"
+                )
+            )
+            self.stdout.write(
+                f"  {'parser':<10} {'parsed':>8} {'errors':>7} "
+                f"{'first ms':>10} {'mean ms':>10} {'p95 ms':>10}"
+            )
+            for timing in timings:
+                self.stdout.write(
+                    f"  {timing.parser:<10} {f'{timing.parsed}/{timing.samples}':>8} "
+                    f"{timing.failed:>7} {self._format_ms(timing.first_ms):>10} "
+                    f"{self._format_ms(timing.mean_ms):>10} "
+                    f"{self._format_ms(timing.p95_ms):>10}"
+                )
+
+            if not recommended:
+                self.stdout.write(self.style.WARNING("  No parser parsed any output"))
+                continue
+
+            current = ",".join(command.parsers) or "default"
+            self.stdout.write(
+                f"  Recommended order: {','.join(recommended)} (current: {current})"
+            )
+            if options["apply"] and command.parsers != recommended:
+                command.parsers = recommended
+                command.save(update_fields=["parsers"])
+                self.stdout.write(self.style.SUCCESS("  Applied"))
+
+        if not benchmarked:
+            raise CommandError("No recorded output to benchmark")
+
+    def _get_parsers(self, names: str | None) -> list:
+        registry = get_parser_registry()
+        if not names:
+            parsers = registry.get_available()
+        else:
+            parsers = []
+            for name in (name.strip() for name in names.split(",")):
+                parser = registry.get(name)
+                if parser is None:
+                    raise CommandError(
+                        f"Unknown parser '{name}', choose from: "
+                        f"{', '.join(registry.names)}"
+                    )
+                if not parser.is_available():
+                    raise CommandError(f"Parser '{name}' is not installed")
+                parsers.append(parser)
+
+        if not parsers:
+            raise CommandError("No parsers are installed")
+        return parsers
+
+    def _get_commands(self, identifiers: list[str] | None):
+        commands = ToolkitCommand.objects.filter(command_type="show")
+        if not identifiers:
+            return commands
+
+        selected = []
+        for identifier in identifiers:
+            lookup = (
+                {"pk": identifier} if identifier.isdigit() else {"name": identifier}
+            )
+            try:
+                selected.append(commands.get(**lookup))
+            except ToolkitCommand.DoesNotExist as e:
+                raise CommandError(f"Show command '{identifier}' not found") from e
+            except ToolkitCommand.MultipleObjectsReturned as e:
+                raise CommandError(
+                    f"Several commands are named '{identifier}', use the ID"
+                ) from e
+        return selected
+
+    def _get_samples(
+        self, command: ToolkitCommand, limit: int, platform: str | None
+    ) -> list[ParserSample]:
+        logs = (
+            CommandLog.objects
+            .filter(command=command, success=True)
+            .exclude(output="")
+            .select_related("device__platform")
+            .order_by("-execution_time")[:limit]
+        )
+        return [
+            ParserSample(
+                platform=platform or self._get_platform(log),
+                command=command.command,
+                output=log.output,
+                template=command.ttp_template or None,
+            )
+            for log in logs
+        ]
+
+    def _get_platform(self, log: CommandLog) -> str | None:
+        """Get the Netmiko style platform the device's output was parsed as."""
+        if not log.device.platform:
+            return None
+        normalized = ToolkitSettings.normalize_platform(str(log.device.platform))
+        return NetmikoConnector.DEVICE_TYPE_MAP.get(normalized, normalized)
+
+    def _format_ms(self, value: float | None) -> str:
+        return "-" if value is None else f"{value:.2f}"
@@ -0,0 +1,108 @@
+"""Check that the hot CommandLog queries are planned with their indexes."""
+
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.utils import timezone
+
+from ...models import CommandLog
+
+
+class Command(BaseCommand):
+    help = (
+        "Show the query plans of the hot CommandLog queries and check that each "
+        "uses the index added for it. Parameters are sampled from the newest log "
+        "entry. On small tables the planner prefers sequential scans, so use "
+        "--prefer-indexes to check the indexes are usable before data grows."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--analyze",
+            action="store_true",
+            help="Run the queries (EXPLAIN ANALYZE) to include actual timings",
+        )
+        parser.add_argument(
+            "--prefer-indexes",
+            action="store_true",
+            help="Disable sequential scans while planning (PostgreSQL only)",
+        )
+
+    def handle(self, *args, **options):
+        sample = (
+            CommandLog.objects
+            .order_by("-pk")
+            .values("device_id", "command_id", "username")
+            .first()
+        )
+        if sample is None:
+            raise CommandError("There are no command logs to sample parameters from")
+
+        now = timezone.now()
+        queries = [
+            (
+                "Rate limit window",
+                "ntk_cmdlog_device_ok_time",
+                CommandLog.objects.filter(
+                    device_id=sample["device_id"],
+                    execution_time__gte=now - timedelta(minutes=5),
+                    success=True,
+                ),
+            ),
+            (
+                "Device recent history",
+                "ntk_cmdlog_device_time",
+                CommandLog.objects.filter(device_id=sample["device_id"]).order_by(
+                    "-execution_time"
+                )[:3],
+            ),
+            (
+                "Command history",
+                "ntk_cmdlog_command_time",
+                CommandLog.objects.filter(command_id=sample["command_id"]).order_by(
+                    "-execution_time"
+                )[:50],
+            ),
+            (
+                "User history",
+                "ntk_cmdlog_user_time",
+                CommandLog.objects.filter(username=sample["username"]).order_by(
+                    "-execution_time"
+                )[:50],
+            ),
+            (
+                "Last 24 hours",
+                "ntk_cmdlog_time",
+                CommandLog.objects.filter(
+                    execution_time__gte=now - timedelta(hours=24)
+                ),
+            ),
+        ]
+
+        missing = 0
+        # The transaction scopes SET LOCAL and any ANALYZE side effects
+        with transaction.atomic():
+            if options["prefer_indexes"]:
+                if connection.vendor != "postgresql":
+                    raise CommandError("--prefer-indexes requires PostgreSQL")
+                with connection.cursor() as cursor:
+                    cursor.execute("SET LOCAL enable_seqscan = off")
+
+            for label, index_name, queryset in queries:
+                plan = queryset.explain(analyze=options["analyze"])
+                if index_name in plan:
+                    self.stdout.write(self.style.SUCCESS(f"{label}: uses {index_name}"))
+                else:
+                    missing += 1
+                    self.stdout.write(
+                        self.style.WARNING(f"{label}: does not use {index_name}")
+                    )
+
+                if options["verbosity"] >= 2 or index_name not in plan:
+                    self.stdout.write(plan)
+
+            transaction.set_rollback(True)
+
+        if missing:
+            raise CommandError(f"{missing} queries are not planned with their index")
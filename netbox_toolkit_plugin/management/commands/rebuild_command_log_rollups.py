@@ -0,0 +1,43 @@
+"""Recompute the hourly statistics rollups from CommandLog."""
+
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from ...services.statistics_service import CommandStatisticsService
+
+
+class Command(BaseCommand):
+    help = (
+        "Recompute the hourly command log rollups used by the statistics "
+        "dashboard and API. Rollups are kept up to date as logs are written, "
+        "so this is only needed to correct them after logs are edited or "
+        "deleted. Run it with --hours periodically (e.g. from cron) to compact "
+        "recent history, or without it to rebuild everything."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--hours",
+            type=int,
+            help="Only rebuild this many of the most recent hours",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Rollup rows written per query",
+        )
+
+    def handle(self, *args, **options):
+        start = None
+        if options["hours"] is not None:
+            if options["hours"] < 1:
+                raise CommandError("--hours must be at least 1")
+            start = timezone.now() - timedelta(hours=options["hours"] - 1)
+
+        written = CommandStatisticsService().rebuild(
+            start=start, batch_size=options["batch_size"]
+        )
+        self.stdout.write(self.style.SUCCESS(f"Wrote {written} rollup rows"))
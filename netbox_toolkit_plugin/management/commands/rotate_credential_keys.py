@@ -0,0 +1,127 @@
+"""Re-encrypt stored device credentials after rotating the pepper or SECRET_KEY."""
+
+import os
+
+from django.core.management.base import BaseCommand, CommandError
+
+from ...services.key_rotation_service import KeyRotationService, KeyRotationStats
+
+
+class Command(BaseCommand):
+    help = (
+        "Re-encrypt all device credential sets from the old pepper/SECRET_KEY to "
+        "the new ones. Secrets are read from the named environment variables so "
+        "they never appear in the process list. Secrets that are not given "
+        "default to the currently configured values."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--old-pepper-env",
+            help="Environment variable holding the pepper the credentials use now",
+        )
+        parser.add_argument(
+            "--old-secret-key-env",
+            help="Environment variable holding the SECRET_KEY the credentials use now",
+        )
+        parser.add_argument(
+            "--new-pepper-env",
+            help="Environment variable holding the pepper to rotate to",
+        )
+        parser.add_argument(
+            "--new-secret-key-env",
+            help="Environment variable holding the SECRET_KEY to rotate to",
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=2000,
+            help="Rows streamed per database round trip and per worker task",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=500,
+            help="Rows written per bulk update",
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=1,
+            help="Worker processes to rotate with (each may use one Argon2 "
+            "memory_cost when re-hashing tokens)",
+        )
+        parser.add_argument(
+            "--checkpoint",
+            help="File to record progress in, so an interrupted run can resume",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Decrypt and re-encrypt in memory without saving anything",
+        )
+
+    def handle(self, *args, **options):
+        # BaseCommand doesn't keep the verbosity; progress reporting needs it
+        self.verbosity = options["verbosity"]
+
+        if not options["old_pepper_env"] and not options["old_secret_key_env"]:
+            raise CommandError(
+                "Give --old-pepper-env and/or --old-secret-key-env for the secrets "
+                "the credentials are currently encrypted with"
+            )
+
+        try:
+            service = KeyRotationService(
+                old_pepper=self._read_secret(options["old_pepper_env"]),
+                old_secret_key=self._read_secret(options["old_secret_key_env"]),
+                new_pepper=self._read_secret(options["new_pepper_env"]),
+                new_secret_key=self._read_secret(options["new_secret_key_env"]),
+                chunk_size=options["chunk_size"],
+                batch_size=options["batch_size"],
+                workers=options["workers"],
+                checkpoint_path=options["checkpoint"],
+                dry_run=options["dry_run"],
+            )
+            stats = service.run(progress=self._report_progress)
+        except ValueError as e:
+            raise CommandError(str(e)) from e
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{'Dry run: ' if options['dry_run'] else ''}"
+                f"{stats.rotated} rotated, {stats.already_rotated} already rotated, "
+                f"{stats.failed} failed"
+            )
+        )
+        if stats.tokens_rehashed:
+            self.stdout.write(f"{stats.tokens_rehashed} credential tokens re-hashed")
+        if stats.tokens_unrecoverable:
+            self.stdout.write(
+                self.style.WARNING(
+                    f"{stats.tokens_unrecoverable} credential tokens could not be "
+                    "re-hashed and must be regenerated by their owners"
+                )
+            )
+        if stats.failed:
+            self.stdout.write(
+                self.style.WARNING(
+                    "Credential sets that failed could not be decrypted with the old "
+                    "secrets and were left unchanged"
+                )
+            )
+
+    def _read_secret(self, env_var: str | None) -> str | None:
+        if not env_var:
+            return None
+        value = os.environ.get(env_var)
+        if not value:
+            raise CommandError(f"Environment variable {env_var} is not set")
+        return value
+
+    def _report_progress(self, last_pk: int, stats: KeyRotationStats) -> None:
+        if self.verbosity >= 2:
+            self.stdout.write(
+                f"Up to pk {last_pk}: {stats.rotated} rotated, "
+                f"{stats.already_rotated} already rotated, {stats.failed} failed"
+            )
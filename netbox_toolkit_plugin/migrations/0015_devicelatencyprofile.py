@@ -0,0 +1,35 @@
+# Generated migration for adaptive per-device timeouts
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dcim', '0210_macaddress_ordering'),
+        ('netbox_toolkit_plugin', '0014_add_encrypted_token_field'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DeviceLatencyProfile',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False)),
+                ('connect_ewma', models.FloatField(blank=True, help_text='Average TCP connect time in seconds', null=True)),
+                ('connect_p95', models.FloatField(blank=True, help_text='95th percentile TCP connect time in seconds', null=True)),
+                ('auth_ewma', models.FloatField(blank=True, help_text='Average SSH login time in seconds', null=True)),
+                ('auth_p95', models.FloatField(blank=True, help_text='95th percentile SSH login time in seconds', null=True)),
+                ('op_ewma', models.FloatField(blank=True, help_text='Average command execution time in seconds', null=True)),
+                ('op_p95', models.FloatField(blank=True, help_text='95th percentile command execution time in seconds', null=True)),
+                ('samples', models.JSONField(default=dict, help_text='Recent samples per metric, oldest first')),
+                ('sample_count', models.PositiveIntegerField(default=0)),
+                ('last_updated', models.DateTimeField(auto_now=True)),
+                ('device', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='toolkit_latency_profile', to='dcim.device')),
+            ],
+            options={
+                'verbose_name': 'Device Latency Profile',
+                'verbose_name_plural': 'Device Latency Profiles',
+            },
+        ),
+    ]
@@ -0,0 +1,27 @@
+# Generated migration for indexed credential token lookup
+#
+# Existing credential sets start without a fingerprint. It is filled in the
+# first time their token is successfully verified.
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('netbox_toolkit_plugin', '0015_devicelatencyprofile'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='devicecredentialset',
+            name='access_token_fingerprint',
+            field=models.CharField(
+                blank=True,
+                db_index=True,
+                editable=False,
+                help_text='Keyed HMAC of the credential token for fast lookup',
+                max_length=64,
+            ),
+        ),
+    ]
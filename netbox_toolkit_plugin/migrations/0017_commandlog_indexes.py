@@ -0,0 +1,56 @@
+# Generated migration for CommandLog query indexes
+#
+# The indexes are built concurrently so large log tables stay writable while
+# the migration runs. Concurrent index builds can't run inside a transaction.
+
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    atomic = False
+
+    dependencies = [
+        ('netbox_toolkit_plugin', '0016_devicecredentialset_access_token_fingerprint'),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name='commandlog',
+            index=models.Index(
+                fields=['device', '-execution_time'],
+                name='ntk_cmdlog_device_time',
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name='commandlog',
+            index=models.Index(
+                condition=models.Q(('success', True)),
+                fields=['device', '-execution_time'],
+                name='ntk_cmdlog_device_ok_time',
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name='commandlog',
+            index=models.Index(
+                fields=['command', 'execution_time'],
+                name='ntk_cmdlog_command_time',
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name='commandlog',
+            index=models.Index(
+                fields=['username', 'execution_time'],
+                name='ntk_cmdlog_user_time',
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name='commandlog',
+            index=models.Index(fields=['execution_time'], name='ntk_cmdlog_time'),
+        ),
+        AddIndexConcurrently(
+            model_name='commandlog',
+            index=models.Index(fields=['created'], name='ntk_cmdlog_created'),
+        ),
+    ]
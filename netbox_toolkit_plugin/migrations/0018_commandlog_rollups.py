@@ -0,0 +1,116 @@
+# Generated migration for hourly CommandLog statistics rollups
+
+from datetime import timezone
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count, Max, Min, Sum
+from django.db.models.functions import SHA256, TruncHour
+
+
+def backfill_rollups(apps, schema_editor):
+    """Aggregate existing command logs into the new rollup tables."""
+    CommandLog = apps.get_model('netbox_toolkit_plugin', 'CommandLog')
+    CommandLogRollup = apps.get_model('netbox_toolkit_plugin', 'CommandLogRollup')
+    CommandLogErrorRollup = apps.get_model('netbox_toolkit_plugin', 'CommandLogErrorRollup')
+    hour = TruncHour('execution_time', tzinfo=timezone.utc)
+
+    totals = (
+        CommandLog.objects
+        .values('command_id', 'device_id', 'success', bucket=hour)
+        .annotate(
+            platform_id=Max('device__platform_id'),
+            count=Count('pk'),
+            duration_count=Count('execution_duration'),
+            duration_sum=Sum('execution_duration'),
+            duration_min=Min('execution_duration'),
+            duration_max=Max('execution_duration'),
+        )
+        .order_by()
+    )
+    CommandLogRollup.objects.bulk_create(
+        (
+            CommandLogRollup(
+                hour=row['bucket'],
+                command_id=row['command_id'],
+                device_id=row['device_id'],
+                platform_id=row['platform_id'],
+                success=row['success'],
+                count=row['count'],
+                duration_count=row['duration_count'],
+                duration_sum=row['duration_sum'] or 0,
+                duration_min=row['duration_min'],
+                duration_max=row['duration_max'],
+            )
+            for row in totals.iterator(chunk_size=1000)
+        ),
+        batch_size=1000,
+    )
+
+    errors = (
+        CommandLog.objects
+        .exclude(error_message='')
+        .values(bucket=hour, error_digest=SHA256('error_message'))
+        .annotate(message=Max('error_message'), count=Count('pk'))
+        .order_by()
+    )
+    CommandLogErrorRollup.objects.bulk_create(
+        (
+            CommandLogErrorRollup(
+                hour=row['bucket'],
+                error_digest=row['error_digest'],
+                error_message=row['message'],
+                count=row['count'],
+            )
+            for row in errors.iterator(chunk_size=1000)
+        ),
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dcim', '0210_macaddress_ordering'),
+        ('netbox_toolkit_plugin', '0017_commandlog_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CommandLogRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False)),
+                ('hour', models.DateTimeField(help_text='Start of the hour (UTC)')),
+                ('success', models.BooleanField()),
+                ('count', models.PositiveIntegerField(default=0)),
+                ('duration_count', models.PositiveIntegerField(default=0, help_text='Executions with a recorded duration')),
+                ('duration_sum', models.FloatField(default=0)),
+                ('duration_min', models.FloatField(blank=True, null=True)),
+                ('duration_max', models.FloatField(blank=True, null=True)),
+                ('command', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='netbox_toolkit_plugin.command')),
+                ('device', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='dcim.device')),
+                ('platform', models.ForeignKey(blank=True, help_text='Platform of the device when the executions were counted', null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='dcim.platform')),
+            ],
+            options={
+                'verbose_name': 'Command Log Rollup',
+                'verbose_name_plural': 'Command Log Rollups',
+                'constraints': [models.UniqueConstraint(fields=('hour', 'command', 'device', 'success'), name='ntk_rollup_unique')],
+            },
+        ),
+        migrations.CreateModel(
+            name='CommandLogErrorRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False)),
+                ('hour', models.DateTimeField(help_text='Start of the hour (UTC)')),
+                ('error_digest', models.CharField(max_length=64)),
+                ('error_message', models.TextField()),
+                ('count', models.PositiveIntegerField(default=0)),
+            ],
+            options={
+                'verbose_name': 'Command Log Error Rollup',
+                'verbose_name_plural': 'Command Log Error Rollups',
+                'constraints': [models.UniqueConstraint(fields=('hour', 'error_digest'), name='ntk_error_rollup_unique')],
+            },
+        ),
+        migrations.RunPython(backfill_rollups, migrations.RunPython.noop),
+    ]
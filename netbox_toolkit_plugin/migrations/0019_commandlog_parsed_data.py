@@ -0,0 +1,23 @@
+# Generated migration to store parsed output on command logs
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('netbox_toolkit_plugin', '0018_commandlog_rollups'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='commandlog',
+            name='parsed_data_compressed',
+            field=models.BinaryField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='commandlog',
+            name='parsing_method',
+            field=models.CharField(blank=True, help_text='Parser that produced the parsed data (e.g. textfsm)', max_length=20),
+        ),
+    ]
@@ -0,0 +1,24 @@
+# Generated migration to select structured output parsers per command
+
+import django.contrib.postgres.fields
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('netbox_toolkit_plugin', '0019_commandlog_parsed_data'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='command',
+            name='parsers',
+            field=django.contrib.postgres.fields.ArrayField(base_field=models.CharField(choices=[('textfsm', 'TextFSM'), ('ttp', 'TTP'), ('genie', 'Genie')], max_length=20), blank=True, default=list, help_text='Parsers to try in order, first success wins (e.g. genie,textfsm). Leave empty to use the default order', size=None),
+        ),
+        migrations.AddField(
+            model_name='command',
+            name='ttp_template',
+            field=models.TextField(blank=True, help_text='TTP template used by the ttp parser', verbose_name='TTP template'),
+        ),
+    ]
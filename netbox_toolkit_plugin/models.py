@@ -1,3 +1,5 @@
+from django.contrib.postgres.fields import ArrayField
+from django.core.exceptions import ValidationError
 from django.db import models
 from django.db.models import Q
 from django.utils import timezone
@@ -5,6 +7,8 @@ from django.utils import timezone
 from netbox.models import NetBoxModel
 from utilities.querysets import RestrictedQuerySet
 
+from .utils.parsed_data import decode_parsed_data, encode_parsed_data
+
 
 class Command(NetBoxModel):
     name = models.CharField(max_length=100)
@@ -29,6 +33,27 @@ class Command(NetBoxModel):
         help_text="Type of command for categorization and permission control",
     )
 
+    # Structured output parsing, see the parsers package
+    parsers = ArrayField(
+        base_field=models.CharField(
+            max_length=20,
+            choices=[
+                ("textfsm", "TextFSM"),
+                ("ttp", "TTP"),
+                ("genie", "Genie"),
+            ],
+        ),
+        blank=True,
+        default=list,
+        help_text="Parsers to try in order, first success wins (e.g. genie,textfsm). "
+        "Leave empty to use the default order",
+    )
+    ttp_template = models.TextField(
+        blank=True,
+        verbose_name="TTP template",
+        help_text="TTP template used by the ttp parser",
+    )
+
     class Meta:
         ordering = ["name"]
 
@@ -66,6 +91,16 @@ class Command(NetBoxModel):
             "plugins:netbox_toolkit_plugin:command_detail", kwargs={"pk": self.pk}
         )
 
+    def clean(self):
+        super().clean()
+
+        if len(set(self.parsers)) != len(self.parsers):
+            raise ValidationError({"parsers": "Each parser can only be listed once."})
+        if "ttp" in self.parsers and not self.ttp_template.strip():
+            raise ValidationError({
+                "ttp_template": "A TTP template is required to use the ttp parser."
+            })
+
 
 class CommandLog(NetBoxModel):
     command = models.ForeignKey(
@@ -85,6 +120,37 @@ class CommandLog(NetBoxModel):
         blank=True, null=True, help_text="Command execution time in seconds"
     )
 
+    # Structured output parsed when the command ran, see utils.parsed_data
+    parsed_data_compressed = models.BinaryField(blank=True, null=True, editable=False)
+    parsing_method = models.CharField(
+        max_length=20,
+        blank=True,
+        help_text="Parser that produced the parsed data (e.g. textfsm)",
+    )
+
+    class Meta:
+        indexes = [
+            # Device history, newest first
+            models.Index(
+                fields=["device", "-execution_time"], name="ntk_cmdlog_device_time"
+            ),
+            # Rate limiting counts only successful executions per device
+            models.Index(
+                fields=["device", "-execution_time"],
+                name="ntk_cmdlog_device_ok_time",
+                condition=Q(success=True),
+            ),
+            models.Index(
+                fields=["command", "execution_time"], name="ntk_cmdlog_command_time"
+            ),
+            models.Index(
+                fields=["username", "execution_time"], name="ntk_cmdlog_user_time"
+            ),
+            # Statistics and export date ranges
+            models.Index(fields=["execution_time"], name="ntk_cmdlog_time"),
+            models.Index(fields=["created"], name="ntk_cmdlog_created"),
+        ]
+
     def __str__(self):
         return f"{self.command} on {self.device}"
 
@@ -96,6 +162,20 @@ class CommandLog(NetBoxModel):
             "plugins:netbox_toolkit_plugin:commandlog_view", kwargs={"pk": self.pk}
         )
 
+    @property
+    def parsed_data(self):
+        """Get the structured output parsed when the command ran, or None."""
+        return decode_parsed_data(self.parsed_data_compressed)
+
+    @parsed_data.setter
+    def parsed_data(self, value):
+        self.parsed_data_compressed = encode_parsed_data(value)
+
+    @property
+    def has_parsed_data(self):
+        """Check whether structured output was stored for this log."""
+        return bool(self.parsed_data_compressed)
+
 
 class CommandVariable(models.Model):
     """Model for defining variables that can be used in commands."""
@@ -158,6 +238,159 @@ class CommandVariable(models.Model):
         return f"Variable: {self.display_name}"
 
 
+class DeviceLatencyProfile(models.Model):
+    """Observed connection and command latencies for a device.
+
+    Each metric keeps an exponentially weighted moving average and the 95th
+    percentile of a bounded window of recent samples. Timeouts for the device
+    are derived from these instead of static defaults.
+    """
+
+    METRICS = ("connect", "auth", "op")
+
+    device = models.OneToOneField(
+        to="dcim.Device",
+        on_delete=models.CASCADE,
+        related_name="toolkit_latency_profile",
+    )
+    connect_ewma = models.FloatField(
+        blank=True, null=True, help_text="Average TCP connect time in seconds"
+    )
+    connect_p95 = models.FloatField(
+        blank=True, null=True, help_text="95th percentile TCP connect time in seconds"
+    )
+    auth_ewma = models.FloatField(
+        blank=True, null=True, help_text="Average SSH login time in seconds"
+    )
+    auth_p95 = models.FloatField(
+        blank=True, null=True, help_text="95th percentile SSH login time in seconds"
+    )
+    op_ewma = models.FloatField(
+        blank=True, null=True, help_text="Average command execution time in seconds"
+    )
+    op_p95 = models.FloatField(
+        blank=True,
+        null=True,
+        help_text="95th percentile command execution time in seconds",
+    )
+    samples = models.JSONField(
+        default=dict, help_text="Recent samples per metric, oldest first"
+    )
+    sample_count = models.PositiveIntegerField(default=0)
+    last_updated = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = "Device Latency Profile"
+        verbose_name_plural = "Device Latency Profiles"
+
+    def __str__(self):
+        return f"Latency profile for {self.device}"
+
+    def add_sample(self, metric: str, value: float, alpha: float, window: int):
+        """Add a latency sample and update the metric's average and p95."""
+        if metric not in self.METRICS:
+            raise ValueError(f"Unknown latency metric: {metric}")
+
+        recent = self.samples.get(metric, [])
+        recent.append(round(value, 4))
+        recent = recent[-window:]
+        self.samples[metric] = recent
+
+        ewma = getattr(self, f"{metric}_ewma")
+        ewma = value if ewma is None else alpha * value + (1 - alpha) * ewma
+        setattr(self, f"{metric}_ewma", ewma)
+
+        # Nearest-rank percentile over the window
+        ordered = sorted(recent)
+        rank = max(0, -(-95 * len(ordered) // 100) - 1)
+        setattr(self, f"{metric}_p95", ordered[rank])
+
+        if metric == "op":
+            self.sample_count += 1
+
+    def get_metric(self, metric: str) -> float | None:
+        """Get the slower of the average and p95 for a metric."""
+        values = [
+            value
+            for value in (
+                getattr(self, f"{metric}_ewma"),
+                getattr(self, f"{metric}_p95"),
+            )
+            if value is not None
+        ]
+        return max(values) if values else None
+
+
+class CommandLogRollup(models.Model):
+    """Hourly totals of command executions for the statistics dashboard.
+
+    Each row counts the executions of one command on one device with the same
+    outcome that started within an hour (UTC). Rows are updated as command
+    logs are written and deleted; the rebuild_command_log_rollups management
+    command recomputes them from CommandLog.
+    """
+
+    hour = models.DateTimeField(help_text="Start of the hour (UTC)")
+    command = models.ForeignKey(to=Command, on_delete=models.CASCADE, related_name="+")
+    device = models.ForeignKey(
+        to="dcim.Device", on_delete=models.CASCADE, related_name="+"
+    )
+    platform = models.ForeignKey(
+        to="dcim.Platform",
+        on_delete=models.SET_NULL,
+        related_name="+",
+        blank=True,
+        null=True,
+        help_text="Platform of the device when the executions were counted",
+    )
+    success = models.BooleanField()
+    count = models.PositiveIntegerField(default=0)
+    duration_count = models.PositiveIntegerField(
+        default=0, help_text="Executions with a recorded duration"
+    )
+    duration_sum = models.FloatField(default=0)
+    duration_min = models.FloatField(blank=True, null=True)
+    duration_max = models.FloatField(blank=True, null=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["hour", "command", "device", "success"],
+                name="ntk_rollup_unique",
+            ),
+        ]
+        verbose_name = "Command Log Rollup"
+        verbose_name_plural = "Command Log Rollups"
+
+    def __str__(self):
+        return f"{self.command} on {self.device} at {self.hour}"
+
+
+class CommandLogErrorRollup(models.Model):
+    """Hourly counts of each distinct command error message.
+
+    Messages are grouped by their SHA-256 digest, so the dashboard never
+    groups by the error text itself.
+    """
+
+    hour = models.DateTimeField(help_text="Start of the hour (UTC)")
+    error_digest = models.CharField(max_length=64)
+    error_message = models.TextField()
+    count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["hour", "error_digest"], name="ntk_error_rollup_unique"
+            ),
+        ]
+        verbose_name = "Command Log Error Rollup"
+        verbose_name_plural = "Command Log Error Rollups"
+
+    def __str__(self):
+        return f"{self.error_message[:50]} at {self.hour}"
+
+
 class DeviceCredentialSetManager(models.Manager):
     """Custom manager for DeviceCredentialSet with platform filtering logic"""
 
@@ -241,6 +474,15 @@ class DeviceCredentialSet(NetBoxModel):
         help_text="Secure token hash for credential access via API",
     )
 
+    # Keyed fingerprint of the token for indexed lookup (see fingerprint_token)
+    access_token_fingerprint = models.CharField(
+        max_length=64,
+        blank=True,
+        editable=False,
+        db_index=True,
+        help_text="Keyed HMAC of the credential token for fast lookup",
+    )
+
     # Encrypted raw token for display purposes
     encrypted_token = models.TextField(
         blank=True,
@@ -314,7 +556,12 @@ class DeviceCredentialSet(NetBoxModel):
             if hasattr(self, "_state") and self._state.adding:
                 return self.name
 
-            platform_count = self.platforms.count() if hasattr(self, "platforms") else 0
+            # List views annotate platform_count to avoid a query per row
+            platform_count = getattr(self, "platform_count", None)
+            if platform_count is None:
+                platform_count = (
+                    self.platforms.count() if hasattr(self, "platforms") else 0
+                )
             if platform_count > 0:
                 return f"{self.name} ({platform_count} platforms)"
             return f"{self.name} (all platforms)"
@@ -337,24 +584,75 @@ class DeviceCredentialSet(NetBoxModel):
         self.last_used = timezone.now()
         self.save(update_fields=["last_used"])
 
+    @classmethod
+    def load_decrypted_fields(cls, credential_sets):
+        """
+        Decrypt the usernames and display tokens of many credential sets at once.
+
+        The results are stored on each instance, so the username and raw_token
+        properties of a page of rows need one encryption service and no
+        per-row setup.
+
+        Args:
+            credential_sets: Iterable of DeviceCredentialSet instances
+        """
+        credential_sets = list(credential_sets)
+        if not credential_sets:
+            return
+
+        from netbox_toolkit_plugin.services.encryption_service import (
+            CredentialEncryptionService,
+        )
+
+        try:
+            encryption_service = CredentialEncryptionService()
+        except Exception:
+            # Leave the properties to report the failure row by row
+            return
+
+        usernames = encryption_service.decrypt_usernames([
+            (credential_set.encrypted_username, credential_set.encryption_key_id)
+            for credential_set in credential_sets
+        ])
+        tokens = encryption_service.decrypt_tokens([
+            credential_set.encrypted_token for credential_set in credential_sets
+        ])
+        for credential_set, username, token in zip(
+            credential_sets, usernames, tokens, strict=True
+        ):
+            # Keyed by ciphertext so re-encrypted fields are never served stale
+            credential_set._decrypted_username = (
+                credential_set.encrypted_username,
+                username,
+            )
+            credential_set._decrypted_token = (credential_set.encrypted_token, token)
+
     @property
     def username(self):
         """
         Get the decrypted username for display purposes.
         Returns the decrypted username or error message if decryption fails.
         """
-        try:
-            from netbox_toolkit_plugin.services.encryption_service import (
-                CredentialEncryptionService,
-            )
+        cached = self.__dict__.get("_decrypted_username")
+        if cached is not None and cached[0] == self.encrypted_username:
+            username = cached[1]
+        else:
+            try:
+                from netbox_toolkit_plugin.services.encryption_service import (
+                    CredentialEncryptionService,
+                )
+
+                encryption_service = CredentialEncryptionService()
+                username = encryption_service.decrypt_usernames([
+                    (self.encrypted_username, self.encryption_key_id)
+                ])[0]
+            except Exception:
+                username = None
+            self._decrypted_username = (self.encrypted_username, username)
 
-            encryption_service = CredentialEncryptionService()
-            credentials = encryption_service.decrypt_credentials(
-                self.encrypted_username, self.encrypted_password, self.encryption_key_id
-            )
-            return credentials["username"]
-        except Exception:
+        if username is None:
             return "⚠️ Decryption failed - recreate credential set"
+        return username
 
     @property
     def raw_token(self):
@@ -365,6 +663,10 @@ class DeviceCredentialSet(NetBoxModel):
         if not self.encrypted_token:
             return None
 
+        cached = self.__dict__.get("_decrypted_token")
+        if cached is not None and cached[0] == self.encrypted_token:
+            return cached[1]
+
         try:
             from netbox_toolkit_plugin.services.encryption_service import (
                 CredentialEncryptionService,
@@ -372,6 +674,9 @@ class DeviceCredentialSet(NetBoxModel):
 
             encryption_service = CredentialEncryptionService()
             # Use the token-specific encryption method
-            return encryption_service.decrypt_token(self.encrypted_token)
+            token = encryption_service.decrypt_token(self.encrypted_token)
         except Exception:
-            return None
+            token = None
+
+        self._decrypted_token = (self.encrypted_token, token)
+        return token
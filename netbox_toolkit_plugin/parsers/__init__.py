@@ -0,0 +1,30 @@
+"""Parsers package for turning command output into structured data."""
+
+from .base import BaseParser, TemplateCache
+from .benchmark import ParserBenchmark, ParserSample, ParserTiming
+from .genie_parser import GenieParser
+from .registry import (
+    ParseResult,
+    ParserRegistry,
+    get_parser_order,
+    get_parser_registry,
+    parse_command_output,
+)
+from .textfsm_parser import TextFSMParser
+from .ttp_parser import TTPParser
+
+__all__ = [
+    "BaseParser",
+    "TemplateCache",
+    "ParseResult",
+    "ParserRegistry",
+    "get_parser_registry",
+    "get_parser_order",
+    "parse_command_output",
+    "TextFSMParser",
+    "TTPParser",
+    "GenieParser",
+    "ParserBenchmark",
+    "ParserSample",
+    "ParserTiming",
+]
@@ -0,0 +1,108 @@
+"""Base parser interface for structured command output."""
+
+import threading
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from collections.abc import Callable, Hashable
+from concurrent.futures import Future
+from typing import Any
+
+_MISSING = object()
+
+
+class BaseParser(ABC):
+    """Abstract base class for command output parsers."""
+
+    # Name used in parser orders and stored as the log's parsing method
+    name: str = ""
+    # Human readable name
+    label: str = ""
+    # Whether the parser needs a template supplied with the command
+    requires_template: bool = False
+
+    @abstractmethod
+    def is_available(self) -> bool:
+        """Check if the parser's library is installed."""
+
+    @abstractmethod
+    def parse(
+        self,
+        platform: str | None,
+        command: str,
+        output: str,
+        template: str | None = None,
+    ) -> Any:
+        """Parse raw command output.
+
+        Args:
+            platform: Netmiko style platform, e.g. cisco_ios (None if unknown)
+            command: Command that produced the output
+            output: Raw command output
+            template: Template supplied with the command, for parsers that
+                need one
+
+        Returns:
+            Structured data, or None if the parser has nothing for the command
+
+        Raises:
+            ImportError: The parser's library is not installed
+        """
+
+    def parse_or_defer(
+        self,
+        platform: str | None,
+        command: str,
+        output: str,
+        template: str | None = None,
+    ) -> tuple[Any, Future | None]:
+        """Parse raw command output, possibly off the calling thread.
+
+        Parsers that can hand work elsewhere override this.
+
+        Returns:
+            Tuple of (parsed data, future resolving to the parsed data)
+        """
+        return self.parse(platform, command, output, template), None
+
+    @abstractmethod
+    def clear(self) -> None:
+        """Forget the parser's compiled templates."""
+
+
+class TemplateCache:
+    """Bounded, thread-safe LRU of compiled templates or template lookups.
+
+    None is cached like any other value, so lookups that find no template
+    aren't repeated either.
+    """
+
+    def __init__(self, max_entries: int = 256):
+        self.max_entries = max(1, max_entries)
+        self._entries: OrderedDict[Hashable, Any] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_or_create(self, key: Hashable, factory: Callable[[], Any]) -> Any:
+        """Get a cached value, creating it with ``factory`` on a miss."""
+        with self._lock:
+            value = self._entries.get(key, _MISSING)
+            if value is not _MISSING:
+                self._entries.move_to_end(key)
+                return value
+
+        # Compile outside the lock; a concurrent miss just compiles twice
+        value = factory()
+
+        with self._lock:
+            value = self._entries.setdefault(key, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return value
+
+    def clear(self) -> None:
+        """Drop every cached value."""
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -0,0 +1,121 @@
+"""Benchmark harness comparing parsers on recorded command output."""
+
+import statistics
+import time
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+
+from .base import BaseParser
+
+
+@dataclass
+class ParserSample:
+    """A recorded command output to parse."""
+
+    platform: str | None
+    command: str
+    output: str
+    template: str | None = None
+
+
+@dataclass
+class ParserTiming:
+    """How one parser did on a set of samples."""
+
+    parser: str
+    samples: int = 0
+    # Samples the parser returned data for
+    parsed: int = 0
+    # Samples the parser raised an error on
+    failed: int = 0
+    # Seconds for each sample's first parse, including template compilation
+    first_times: list[float] = field(default_factory=list)
+    # Seconds for every later parse, with the template already compiled
+    times: list[float] = field(default_factory=list)
+
+    @property
+    def coverage(self) -> float:
+        return self.parsed / self.samples if self.samples else 0.0
+
+    @property
+    def first_ms(self) -> float | None:
+        return statistics.fmean(self.first_times) * 1000 if self.first_times else None
+
+    @property
+    def mean_ms(self) -> float | None:
+        times = self.times or self.first_times
+        return statistics.fmean(times) * 1000 if times else None
+
+    @property
+    def p95_ms(self) -> float | None:
+        times = sorted(self.times or self.first_times)
+        if not times:
+            return None
+        return times[int(0.95 * (len(times) - 1))] * 1000
+
+
+class ParserBenchmark:
+    """Time parsers on the same recorded outputs.
+
+    Each sample is parsed ``iterations`` times per parser. The first parse
+    of a sample pays for any template lookup and compilation; later parses
+    show the steady state with the template cached. Parser caches are
+    cleared before each parser runs, so results don't depend on what ran
+    earlier in the process.
+    """
+
+    def __init__(self, parsers: Iterable[BaseParser], iterations: int = 5):
+        self.parsers = list(parsers)
+        self.iterations = max(1, iterations)
+
+    def run(self, samples: list[ParserSample]) -> list[ParserTiming]:
+        """
+        Benchmark every parser on the samples.
+
+        Returns:
+            One ParserTiming per parser, in the order the parsers were given
+        """
+        return [self._run_parser(parser, samples) for parser in self.parsers]
+
+    @staticmethod
+    def recommend(timings: list[ParserTiming]) -> list[str]:
+        """
+        Order the parsers that parsed any sample: best coverage first, then fastest.
+
+        Returns:
+            Parser names suitable for a command's parser order
+        """
+        covering = [timing for timing in timings if timing.parsed]
+        covering.sort(key=lambda timing: (-timing.parsed, timing.mean_ms))
+        return [timing.parser for timing in covering]
+
+    def _run_parser(
+        self, parser: BaseParser, samples: list[ParserSample]
+    ) -> ParserTiming:
+        timing = ParserTiming(parser=parser.name)
+        parser.clear()
+
+        for sample in samples:
+            timing.samples += 1
+            if parser.requires_template and not sample.template:
+                continue
+
+            for iteration in range(self.iterations):
+                start = time.perf_counter()
+                try:
+                    data = parser.parse(
+                        sample.platform, sample.command, sample.output, sample.template
+                    )
+                except Exception:
+                    timing.failed += 1
+                    break
+                elapsed = time.perf_counter() - start
+
+                if iteration == 0:
+                    timing.first_times.append(elapsed)
+                    if data:
+                        timing.parsed += 1
+                else:
+                    timing.times.append(elapsed)
+
+        return timing
@@ -0,0 +1,106 @@
+"""Genie parser backed by the Cisco pyATS parser library."""
+
+import threading
+from typing import Any
+
+from .base import BaseParser, TemplateCache
+
+try:
+    from genie.conf.base import Device as GenieDevice
+    from genie.libs.parser.utils import get_parser
+    from genie.metaparser.util.exceptions import SchemaEmptyParserError
+    from pyats.datastructures import AttrDict
+
+    HAS_GENIE = True
+except ImportError:
+    HAS_GENIE = False
+
+
+class GenieParser(BaseParser):
+    """Parse output with the Genie parser matching the command.
+
+    Finding a Genie parser means matching the command against the whole
+    parser index. The parser class found (or that there is none) is cached
+    per OS and command, as is the offline device each OS is parsed with.
+    """
+
+    name = "genie"
+    label = "Genie"
+
+    # Netmiko style platforms to Genie OS names, as Netmiko maps them
+    OS_MAP = {
+        "cisco_ios": "ios",
+        "cisco_xe": "iosxe",
+        "cisco_iosxe": "iosxe",
+        "cisco_xr": "iosxr",
+        "cisco_iosxr": "iosxr",
+        "cisco_nxos": "nxos",
+        "cisco_asa": "asa",
+        "juniper_junos": "junos",
+    }
+
+    def __init__(self, max_entries: int = 256):
+        # (Genie OS, command) -> (parser class, parser kwargs), or None
+        self._parsers = TemplateCache(max_entries)
+        self._devices: dict[str, Any] = {}
+        self._devices_lock = threading.Lock()
+
+    def is_available(self) -> bool:
+        return HAS_GENIE
+
+    def get_genie_os(self, platform: str | None) -> str | None:
+        """Get the Genie OS name of a platform, or None if Genie has no parsers."""
+        if not platform:
+            return None
+        for suffix in ("_ssh", "_telnet", "_serial"):
+            platform = platform.removesuffix(suffix)
+        return self.OS_MAP.get(platform)
+
+    def parse(
+        self,
+        platform: str | None,
+        command: str,
+        output: str,
+        template: str | None = None,
+    ) -> dict[str, Any] | None:
+        genie_os = self.get_genie_os(platform)
+        if genie_os is None:
+            return None
+        if not HAS_GENIE:
+            raise ImportError("Genie parsing requires pyats and genie")
+
+        device = self._get_device(genie_os)
+        command = " ".join(command.split())
+        found = self._parsers.get_or_create(
+            (genie_os, command), lambda: self._find_parser(command, device)
+        )
+        if found is None:
+            return None
+
+        parser_class, parser_kwargs = found
+        try:
+            return parser_class(device=device).parse(output=output, **parser_kwargs)
+        except SchemaEmptyParserError:
+            # The parser matched nothing in the output
+            return None
+
+    def clear(self) -> None:
+        self._parsers.clear()
+
+    def _find_parser(self, command: str, device: Any) -> tuple[type, dict] | None:
+        try:
+            return get_parser(command, device)
+        except Exception:
+            # ParserNotFound, or a command Genie can't tokenize
+            return None
+
+    def _get_device(self, genie_os: str) -> Any:
+        """Get an offline Genie device for an OS, used only to select parsers."""
+        with self._devices_lock:
+            device = self._devices.get(genie_os)
+            if device is None:
+                device = GenieDevice("netbox_toolkit", os=genie_os)
+                device.custom.setdefault("abstraction", {})["order"] = ["os"]
+                device.cli = AttrDict({"execute": None})
+                self._devices[genie_os] = device
+            return device
@@ -0,0 +1,192 @@
+"""Registry of parsers and the pipeline that tries them in order."""
+
+import threading
+from collections.abc import Iterable
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any
+
+from ..settings import ToolkitSettings
+from ..utils.logging import get_toolkit_logger
+from .base import BaseParser
+from .genie_parser import GenieParser
+from .textfsm_parser import TextFSMParser
+from .ttp_parser import TTPParser
+
+if TYPE_CHECKING:
+    from ..models import Command
+
+logger = get_toolkit_logger(__name__)
+
+
+@dataclass
+class ParseResult:
+    """Outcome of running output through a parser order."""
+
+    data: Any = None
+    # Parser that produced the data, or is still producing it off-thread
+    method: str | None = None
+    # Resolves to the parsed data when a large output is parsed off-thread
+    future: Future | None = field(default=None, repr=False)
+    # "<parser>: <error>" for every parser that failed along the way
+    errors: list[str] = field(default_factory=list)
+
+    @property
+    def success(self) -> bool:
+        return bool(self.data)
+
+
+class ParserRegistry:
+    """Parsers by name, tried in a per-command order where the first success wins."""
+
+    def __init__(self):
+        self._parsers: dict[str, BaseParser] = {}
+
+    def register(self, parser: BaseParser) -> None:
+        """Register a parser, replacing any registered under the same name."""
+        self._parsers[parser.name] = parser
+
+    def get(self, name: str) -> BaseParser | None:
+        """Get a registered parser by name."""
+        return self._parsers.get(name)
+
+    @property
+    def names(self) -> list[str]:
+        """Names of all registered parsers, in registration order."""
+        return list(self._parsers)
+
+    def get_available(self) -> list[BaseParser]:
+        """Get the registered parsers whose libraries are installed."""
+        return [parser for parser in self._parsers.values() if parser.is_available()]
+
+    def parse(
+        self,
+        order: Iterable[str],
+        platform: str | None,
+        command: str,
+        output: str,
+        template: str | None = None,
+        defer: bool = True,
+    ) -> ParseResult:
+        """
+        Try parsers in order until one returns data.
+
+        Parsers that aren't installed, or need a template when there is
+        none, are skipped. A parser that hands the output off-thread ends the
+        pipeline, since whether it succeeds isn't known yet.
+
+        Args:
+            order: Parser names, highest priority first
+            platform: Netmiko style platform, e.g. cisco_ios (None if unknown)
+            command: Command that produced the output
+            output: Raw command output
+            template: Template stored on the command (used by TTP)
+            defer: Allow large outputs to be parsed off-thread
+
+        Returns:
+            ParseResult with the first parser's data, or no data if none
+            succeeded
+        """
+        result = ParseResult()
+
+        for name in order:
+            parser = self.get(name)
+            if parser is None:
+                result.errors.append(f"{name}: unknown parser")
+                continue
+            if not parser.is_available():
+                logger.debug("Parser %s is not installed, skipping it", name)
+                continue
+            if parser.requires_template and not template:
+                continue
+
+            try:
+                if defer:
+                    data, future = parser.parse_or_defer(
+                        platform, command, output, template
+                    )
+                else:
+                    data, future = (
+                        parser.parse(platform, command, output, template),
+                        None,
+                    )
+            except Exception as e:
+                # Parsing failures never fail the command
+                logger.debug("%s parsing failed: %s", parser.label, str(e))
+                result.errors.append(f"{parser.label}: {e}")
+                continue
+
+            if future is not None:
+                logger.debug("%s parsing moved to the parse executor", parser.label)
+                result.method = name
+                result.future = future
+                return result
+
+            if data:
+                logger.debug("%s parsing successful", parser.label)
+                result.data = data
+                result.method = name
+                return result
+
+            logger.debug("%s parsing returned no data", parser.label)
+
+        return result
+
+    def clear(self) -> None:
+        """Forget the compiled templates of every parser."""
+        for parser in self._parsers.values():
+            parser.clear()
+
+
+_parser_registry: ParserRegistry | None = None
+_parser_registry_lock = threading.Lock()
+
+
+def get_parser_registry() -> ParserRegistry:
+    """Get the process-wide parser registry with the built-in parsers registered."""
+    global _parser_registry
+
+    if _parser_registry is None:
+        with _parser_registry_lock:
+            if _parser_registry is None:
+                max_entries = ToolkitSettings.get_parsers_config()[
+                    "max_cached_templates"
+                ]
+                registry = ParserRegistry()
+                registry.register(TextFSMParser())
+                registry.register(TTPParser(max_entries=max_entries))
+                registry.register(GenieParser(max_entries=max_entries))
+                _parser_registry = registry
+    return _parser_registry
+
+
+def get_parser_order(command: "Command") -> list[str]:
+    """Get the parsers to try for a command, highest priority first."""
+    return list(command.parsers) or list(
+        ToolkitSettings.get_parsers_config()["default_order"]
+    )
+
+
+def parse_command_output(
+    command: "Command", platform: str | None, output: str, defer: bool = True
+) -> ParseResult:
+    """
+    Parse a command's output with the command's parser order.
+
+    Args:
+        command: Command that was executed
+        platform: Netmiko style platform the output came from
+        output: Raw command output
+        defer: Allow large outputs to be parsed off-thread
+
+    Returns:
+        ParseResult of the first parser that succeeded
+    """
+    return get_parser_registry().parse(
+        get_parser_order(command),
+        platform,
+        command.command,
+        output,
+        template=command.ttp_template or None,
+        defer=defer,
+    )
@@ -0,0 +1,63 @@
+"""TextFSM parser backed by the ntc-templates library."""
+
+from concurrent.futures import Future
+from typing import Any
+
+from ..utils.parse_executor import parse_or_defer
+from ..utils.textfsm_cache import (
+    HAS_TEXTFSM,
+    get_textfsm_template_cache,
+    parse_textfsm_output,
+)
+from .base import BaseParser
+
+
+class TextFSMParser(BaseParser):
+    """Parse output with the ntc-templates template matching the command.
+
+    Templates are resolved and compiled once per process by the TextFSM
+    template cache, and large outputs go to the parse executor if it is
+    enabled.
+    """
+
+    name = "textfsm"
+    label = "TextFSM"
+
+    def is_available(self) -> bool:
+        return HAS_TEXTFSM
+
+    def parse(
+        self,
+        platform: str | None,
+        command: str,
+        output: str,
+        template: str | None = None,
+    ) -> list[dict[str, Any]] | None:
+        if not platform:
+            return None
+        return parse_textfsm_output(platform=platform, command=command, data=output)
+
+    def parse_or_defer(
+        self,
+        platform: str | None,
+        command: str,
+        output: str,
+        template: str | None = None,
+    ) -> tuple[list[dict[str, Any]] | None, Future | None]:
+        if not platform:
+            return None, None
+
+        # Only defer commands that have a template, so a command without one
+        # still falls through to the next parser straight away
+        template_cache = get_textfsm_template_cache()
+        if template_cache is not None and not template_cache.has_template(
+            platform, command
+        ):
+            return None, None
+
+        return parse_or_defer(platform=platform, command=command, data=output)
+
+    def clear(self) -> None:
+        template_cache = get_textfsm_template_cache()
+        if template_cache is not None:
+            template_cache.clear()
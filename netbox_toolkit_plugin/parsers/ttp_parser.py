@@ -0,0 +1,72 @@
+"""TTP parser using templates stored on the command."""
+
+import threading
+from typing import Any
+
+from .base import BaseParser, TemplateCache
+
+try:
+    from ttp import ttp
+
+    HAS_TTP = True
+except ImportError:
+    HAS_TTP = False
+
+
+class TTPParser(BaseParser):
+    """Parse output with the command's TTP (Template Text Parser) template.
+
+    Loading a TTP template builds its groups and compiles their regexes,
+    which takes far longer than parsing a typical output with it. Loaded
+    templates are cached by their text and reused; TTP parser objects aren't
+    thread-safe, so each is used by one thread at a time.
+    """
+
+    name = "ttp"
+    label = "TTP"
+    requires_template = True
+
+    def __init__(self, max_entries: int = 256):
+        # Template text -> (lock, loaded ttp parser)
+        self._templates = TemplateCache(max_entries)
+
+    def is_available(self) -> bool:
+        return HAS_TTP
+
+    def parse(
+        self,
+        platform: str | None,
+        command: str,
+        output: str,
+        template: str | None = None,
+    ) -> Any:
+        if not template:
+            return None
+        if not HAS_TTP:
+            raise ImportError("TTP parsing requires ttp")
+
+        lock, parser = self._templates.get_or_create(
+            template, lambda: (threading.Lock(), self._load(template))
+        )
+        with lock:
+            try:
+                # TTP reads text that names an existing file or directory from
+                # disk; a leading newline keeps device output plain text
+                parser.set_input("\n" + output)
+                parser.parse(one=True)
+                # One template with one input: [[result]]. The lists are the
+                # parser's own, so take the result out before clearing them.
+                results = parser.result()
+                result = results[0][0] if results and results[0] else None
+            finally:
+                parser.clear_input()
+                parser.clear_result()
+
+        return result or None
+
+    def clear(self) -> None:
+        self._templates.clear()
+
+    def _load(self, template: str) -> Any:
+        # As with the input, the newline stops template text being read as a path
+        return ttp(template="\n" + template, log_level="ERROR")
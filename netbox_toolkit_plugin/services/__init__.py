@@ -1,7 +1,21 @@
 """Services package for business logic."""
 
+from .adaptive_timeout_service import AdaptiveTimeoutService
+from .async_command_service import AsyncCommandExecutionService
+from .bulk_execution_service import BulkExecutionService
 from .command_service import CommandExecutionService
 from .device_service import DeviceService
+from .log_export_service import CommandLogExportService
 from .rate_limiting_service import RateLimitingService
+from .statistics_service import CommandStatisticsService
 
-__all__ = ["CommandExecutionService", "DeviceService", "RateLimitingService"]
+__all__ = [
+    "AdaptiveTimeoutService",
+    "AsyncCommandExecutionService",
+    "BulkExecutionService",
+    "CommandExecutionService",
+    "CommandLogExportService",
+    "CommandStatisticsService",
+    "DeviceService",
+    "RateLimitingService",
+]
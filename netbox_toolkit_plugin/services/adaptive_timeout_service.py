@@ -0,0 +1,137 @@
+"""Service for deriving per-device timeouts from observed latencies."""
+
+import math
+from typing import Any
+
+from django.db import transaction
+
+from ..connectors.base import BaseDeviceConnector, CommandResult
+from ..models import DeviceLatencyProfile
+from ..settings import ToolkitSettings
+from ..utils.logging import get_toolkit_logger
+
+logger = get_toolkit_logger(__name__)
+
+
+class AdaptiveTimeoutService:
+    """Record device latencies and turn them into connection timeouts.
+
+    Every successful execution feeds the TCP connect time, SSH login time and
+    command execution time into the device's DeviceLatencyProfile. Once enough
+    samples exist, timeouts are the slower of the moving average and p95 times
+    a headroom multiplier, clamped to configured bounds. Fast devices then fail
+    quickly when something is wrong, and slow devices get enough time instead
+    of timing out and burning a retry.
+
+    The op metric mixes every command run on the device, so a history of
+    quick commands says nothing about a slow one like ``show tech``. The ops
+    timeout is therefore only ever raised above the static one, never lowered.
+    """
+
+    # ConnectionConfig timeout -> profile metric it is derived from
+    TIMEOUT_METRICS = {
+        "socket": "connect",
+        "transport": "auth",
+        "ops": "op",
+    }
+
+    # Timeouts that may grow past their static value but never shrink below it
+    STATIC_FLOOR_TIMEOUTS = frozenset({"ops"})
+
+    def __init__(self):
+        self.config = ToolkitSettings.get_adaptive_timeout_config()
+
+    def get_timeouts(
+        self, device: Any, base_timeouts: dict[str, int]
+    ) -> dict[str, int] | None:
+        """
+        Derive timeouts for a device from its latency profile.
+
+        Args:
+            device: Target device
+            base_timeouts: Static timeouts, used for any metric without samples
+
+        Returns:
+            Timeouts dictionary in the same shape as base_timeouts, or None if
+            adaptive timeouts are disabled or too few samples exist
+        """
+        if not self.config.get("enabled", True) or device.pk is None:
+            return None
+
+        try:
+            profile = DeviceLatencyProfile.objects.filter(device=device).first()
+        except Exception as e:
+            logger.debug("Could not load latency profile for %s: %s", device, str(e))
+            return None
+
+        if profile is None or profile.sample_count < self.config["min_samples"]:
+            return None
+
+        timeouts = dict(base_timeouts)
+        for timeout_key, metric in self.TIMEOUT_METRICS.items():
+            observed = profile.get_metric(metric)
+            if observed is None:
+                continue
+            derived = self._clamp(
+                timeout_key, math.ceil(observed * self.config["multiplier"])
+            )
+            if timeout_key in self.STATIC_FLOOR_TIMEOUTS and timeout_key in timeouts:
+                derived = max(derived, timeouts[timeout_key])
+            timeouts[timeout_key] = derived
+
+        return timeouts
+
+    def record_execution(
+        self,
+        device: Any,
+        connector: BaseDeviceConnector,
+        results: list[CommandResult],
+    ) -> None:
+        """
+        Record the latencies of a successful execution.
+
+        Connect timings are only recorded once per session, so reusing a pooled
+        session doesn't count the original login again.
+
+        Args:
+            device: Target device
+            connector: Connector the commands ran on
+            results: Results of the commands that ran
+        """
+        if not self.config.get("enabled", True) or device.pk is None:
+            return
+
+        samples = list(connector.connect_timings.items())
+        connector.connect_timings = {}
+        samples.extend(
+            ("op", result.execution_time)
+            for result in results
+            if result.success and result.execution_time is not None
+        )
+        if not samples:
+            return
+
+        try:
+            with transaction.atomic():
+                profile, _ = (
+                    DeviceLatencyProfile.objects.select_for_update().get_or_create(
+                        device=device
+                    )
+                )
+                for metric, value in samples:
+                    profile.add_sample(
+                        metric,
+                        value,
+                        alpha=self.config["ewma_alpha"],
+                        window=self.config["window"],
+                    )
+                profile.save()
+        except Exception as e:
+            # Timeout tuning is an optimization - never fail an execution over it
+            logger.debug("Could not record latencies for %s: %s", device, str(e))
+
+    def _clamp(self, timeout_key: str, value: int) -> int:
+        return max(
+            self.config[f"min_{timeout_key}"],
+            min(value, self.config[f"max_{timeout_key}"]),
+        )
@@ -0,0 +1,278 @@
+"""Asyncio-based service for executing commands on many devices at once."""
+
+import asyncio
+from collections import defaultdict
+from typing import Any
+
+from django.db import connections
+
+from asgiref.sync import sync_to_async
+
+from ..connectors.async_scrapli_connector import AsyncScrapliConnector
+from ..connectors.base import CommandResult
+from ..connectors.factory import ConnectorFactory
+from ..connectors.scrapli_connector import ScrapliConnector
+from ..models import Command
+from ..settings import ToolkitSettings
+from ..utils.logging import get_toolkit_logger
+from .bulk_execution_service import BulkExecutionJob
+from .command_service import CommandExecutionService
+
+logger = get_toolkit_logger(__name__)
+
+
+def _run_db_work(func, *args, **kwargs):
+    """Run ORM work in a worker thread and release its database connection."""
+    try:
+        return func(*args, **kwargs)
+    finally:
+        connections.close_all()
+
+
+class AsyncCommandExecutionService:
+    """Async variant of CommandExecutionService.
+
+    Scrapli-capable devices are driven by AsyncScrapliConnector on the event
+    loop, so one worker can run hundreds of device sessions concurrently.
+    Database work (connection config, credentials and logging) runs through
+    ``sync_to_async``. Platforms that need Netmiko, and fast-fail fallbacks,
+    run the sync Netmiko path in a worker thread.
+    """
+
+    def __init__(self):
+        self.connector_factory = ConnectorFactory()
+        self._sync_service = CommandExecutionService()
+        bulk_config = ToolkitSettings.get_bulk_execution_config()
+        self.max_concurrency = max(1, bulk_config["async_max_concurrency"])
+        self.per_device_concurrency = max(1, bulk_config["per_device_concurrency"])
+
+    async def execute_command_with_retry(
+        self,
+        command: "Command",
+        device: Any,
+        username: str,
+        password: str,
+        max_retries: int = 1,
+    ) -> "CommandResult":
+        """
+        Execute a command with connection retry capability.
+
+        Args:
+            command: Command to execute
+            device: Target device
+            username: Authentication username
+            password: Authentication password
+            max_retries: Maximum number of retry attempts
+
+        Returns:
+            CommandResult with execution details
+        """
+        base_config = await sync_to_async(
+            self.connector_factory._build_connection_config
+        )(device, username, password)
+
+        connector_class = await sync_to_async(
+            self.connector_factory.get_preferred_connector_class
+        )(
+            device,
+            base_config.platform,
+            self.connector_factory._get_primary_connector_by_platform(
+                base_config.platform
+            ),
+        )
+        if connector_class is not ScrapliConnector:
+            # Platform is mapped (or known to work better) with Netmiko - use the
+            # sync path
+            return await sync_to_async(_run_db_work, thread_sensitive=False)(
+                self._sync_service.execute_command_with_retry,
+                command,
+                device,
+                username,
+                password,
+                max_retries,
+            )
+
+        last_error = None
+
+        for attempt in range(max_retries + 1):
+            connector = AsyncScrapliConnector(
+                self.connector_factory._prepare_connector_config(
+                    base_config, ScrapliConnector
+                )
+            )
+            try:
+                async with connector:
+                    result = await connector.execute_command(
+                        command.command, command.command_type
+                    )
+                await sync_to_async(self._sync_service._record_session_success)(
+                    device, connector, [result]
+                )
+                return await self._log_result(command, device, result, username)
+
+            except Exception as e:
+                last_error = e
+                error_msg = str(e)
+                logger.warning(
+                    "Async execution attempt %d failed for %s: %s",
+                    attempt + 1,
+                    device.name,
+                    error_msg,
+                )
+
+                if self._sync_service._is_authentication_error(error_msg):
+                    break
+
+                if (
+                    "Fast-fail to Netmiko" in error_msg
+                    or ToolkitSettings.should_fast_fail_to_netmiko(error_msg)
+                ):
+                    try:
+                        result = await sync_to_async(
+                            _run_db_work, thread_sensitive=False
+                        )(
+                            self._execute_netmiko_fallback,
+                            command,
+                            device,
+                            username,
+                            password,
+                        )
+                        return await self._log_result(command, device, result, username)
+                    except Exception as fallback_error:
+                        last_error = fallback_error
+                        break
+
+                if not self._sync_service._is_connection_error(error_msg):
+                    break
+
+        error_msg = str(last_error) if last_error else "Unknown error"
+        if last_error and self._sync_service._is_authentication_error(error_msg):
+            error_msg = f"Authentication failed: {error_msg}"
+
+        error_result = await sync_to_async(self._sync_service._enhance_error_result)(
+            CommandResult(
+                command=command.command,
+                output="",
+                success=False,
+                error_message=error_msg,
+            ),
+            last_error or Exception(error_msg),
+            device,
+        )
+        return await self._log_result(command, device, error_result, username)
+
+    async def execute_command_with_token(
+        self,
+        command: "Command",
+        device: Any,
+        credential_token: str,
+        user,
+        max_retries: int = 1,
+    ) -> "CommandResult":
+        """
+        Execute a command using stored credentials via token.
+
+        Args:
+            command: Command to execute
+            device: Target device
+            credential_token: Credential token for stored credentials
+            user: User requesting the execution
+            max_retries: Maximum number of retry attempts
+
+        Returns:
+            CommandResult with execution details
+
+        Raises:
+            CredentialVerificationBusyError: If the token couldn't be verified
+                because too many Argon2 operations are queued
+        """
+        from .credential_service import CredentialService
+
+        # Token verification is CPU heavy - run it off the event loop
+        success, credentials, _credential_set, error = await sync_to_async(
+            _run_db_work, thread_sensitive=False
+        )(
+            CredentialService().get_credentials_for_device,
+            credential_token,
+            user,
+            device,
+        )
+
+        if not success:
+            error_result = CommandResult(
+                command=command.command,
+                output="",
+                success=False,
+                error_message=f"Credential retrieval failed: {error}",
+                execution_time=0.0,
+            )
+            return await sync_to_async(self._sync_service._enhance_error_result)(
+                error_result, Exception(error), device
+            )
+
+        return await self.execute_command_with_retry(
+            command=command,
+            device=device,
+            username=credentials["username"],
+            password=credentials["password"],
+            max_retries=max_retries,
+        )
+
+    async def execute_bulk(
+        self, jobs: list[BulkExecutionJob], user, max_retries: int = 1
+    ) -> dict[int, CommandResult | Exception]:
+        """
+        Execute many jobs concurrently on the event loop.
+
+        Args:
+            jobs: Validated executions to run
+            user: User requesting the executions
+            max_retries: Maximum number of retry attempts per execution
+
+        Returns:
+            Dictionary mapping each job's execution_id to its CommandResult, or
+            to the exception raised while executing it
+        """
+        global_limit = asyncio.Semaphore(self.max_concurrency)
+        device_limits = defaultdict(
+            lambda: asyncio.Semaphore(self.per_device_concurrency)
+        )
+
+        async def run(job: BulkExecutionJob) -> CommandResult:
+            async with device_limits[job.device.pk], global_limit:
+                return await self.execute_command_with_token(
+                    job.command,
+                    job.device,
+                    job.credential_token,
+                    user,
+                    max_retries=max_retries,
+                )
+
+        outcomes = await asyncio.gather(
+            *(run(job) for job in jobs), return_exceptions=True
+        )
+        return {
+            job.execution_id: outcome
+            for job, outcome in zip(jobs, outcomes, strict=True)
+        }
+
+    def _execute_netmiko_fallback(
+        self, command: "Command", device: Any, username: str, password: str
+    ) -> CommandResult:
+        """Run a command through the sync Netmiko fallback connector."""
+        connector = self._sync_service._create_fallback_connector(
+            device, username, password
+        )
+        with self._sync_service._open_session(device, connector) as session:
+            result = session.execute_command(command.command, command.command_type)
+        self._sync_service._record_session_success(device, session, [result])
+        return result
+
+    async def _log_result(
+        self, command: "Command", device: Any, result: CommandResult, username: str
+    ) -> CommandResult:
+        command_log = await sync_to_async(self._sync_service._log_command_execution)(
+            command, device, result, username
+        )
+        result.command_log_id = command_log.id
+        return result
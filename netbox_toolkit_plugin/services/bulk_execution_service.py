@@ -0,0 +1,122 @@
+"""Service for executing many commands across devices concurrently."""
+
+from collections import defaultdict, deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from typing import Any
+
+from django.db import connections
+
+from ..connectors.base import CommandResult
+from ..models import Command
+from ..settings import ToolkitSettings
+from ..utils.logging import get_toolkit_logger
+from .command_service import CommandExecutionService
+
+logger = get_toolkit_logger(__name__)
+
+
+@dataclass
+class BulkExecutionJob:
+    """A validated command execution waiting to run."""
+
+    execution_id: int
+    command: Command
+    device: Any
+    credential_token: str
+
+
+class BulkExecutionService:
+    """Run command executions concurrently with global and per-device limits.
+
+    Executions for different devices run in parallel up to ``max_workers``.
+    Executions for the same device are limited to ``per_device_concurrency``
+    at a time, so a large batch against one device can't overwhelm it or tie
+    up every worker.
+    """
+
+    def __init__(self):
+        bulk_config = ToolkitSettings.get_bulk_execution_config()
+        self.max_workers = max(1, bulk_config["max_workers"])
+        self.per_device_concurrency = max(1, bulk_config["per_device_concurrency"])
+
+    def execute(
+        self, jobs: list[BulkExecutionJob], user, max_retries: int = 1
+    ) -> dict[int, CommandResult | Exception]:
+        """
+        Execute jobs concurrently.
+
+        Args:
+            jobs: Validated executions to run
+            user: User requesting the executions
+            max_retries: Maximum number of retry attempts per execution
+
+        Returns:
+            Dictionary mapping each job's execution_id to its CommandResult, or
+            to the exception raised while executing it
+        """
+        if not jobs:
+            return {}
+
+        logger.info(
+            "Executing %d bulk jobs with %d workers (per-device limit %d)",
+            len(jobs),
+            self.max_workers,
+            self.per_device_concurrency,
+        )
+
+        # Queue jobs per device, preserving request order within each device
+        pending: dict[Any, deque[BulkExecutionJob]] = defaultdict(deque)
+        for job in jobs:
+            pending[job.device.pk].append(job)
+
+        results: dict[int, CommandResult | Exception] = {}
+        running: dict[Future, BulkExecutionJob] = {}
+
+        with ThreadPoolExecutor(
+            max_workers=min(self.max_workers, len(jobs)),
+            thread_name_prefix="toolkit-bulk",
+        ) as executor:
+
+            def submit_next(device_pk) -> None:
+                queue = pending[device_pk]
+                if queue:
+                    job = queue.popleft()
+                    future = executor.submit(self._run_job, job, user, max_retries)
+                    running[future] = job
+
+            # Start up to the per-device limit for every device
+            for device_pk in list(pending):
+                for _ in range(self.per_device_concurrency):
+                    submit_next(device_pk)
+
+            while running:
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    job = running.pop(future)
+                    try:
+                        results[job.execution_id] = future.result()
+                    except Exception as e:
+                        logger.warning(
+                            "Bulk execution %d failed: %s", job.execution_id, str(e)
+                        )
+                        results[job.execution_id] = e
+                    # Free the device slot for the next job on the same device
+                    submit_next(job.device.pk)
+
+        return results
+
+    def _run_job(self, job: BulkExecutionJob, user, max_retries: int) -> CommandResult:
+        """Run a single job in a worker thread."""
+        try:
+            command_service = CommandExecutionService()
+            return command_service.execute_command_with_token(
+                job.command,
+                job.device,
+                job.credential_token,
+                user,
+                max_retries=max_retries,
+            )
+        finally:
+            # Worker threads get their own database connections - release them
+            connections.close_all()
@@ -1,16 +1,26 @@
 """Service for handling command execution on devices."""
 
+import itertools
+import threading
+from concurrent.futures import Future
 from typing import Any
 
+from django.db import connections, transaction
+
 from dcim.models import Device
 
-from ..connectors.base import CommandResult
+from ..connectors.base import BaseDeviceConnector, CommandResult
 from ..connectors.factory import ConnectorFactory
 from ..connectors.netmiko_connector import NetmikoConnector
-from ..exceptions import DeviceConnectionError
+from ..connectors.pool import get_connection_pool
+from ..exceptions import CredentialVerificationBusyError, DeviceConnectionError
 from ..models import Command, CommandLog
+from ..parsers import parse_command_output
 from ..settings import ToolkitSettings
 from ..utils.logging import get_toolkit_logger
+from ..utils.parsed_data import encode_parsed_data
+from .adaptive_timeout_service import AdaptiveTimeoutService
+from .rate_limiting_service import RateLimitingService
 
 logger = get_toolkit_logger(__name__)
 
@@ -20,6 +30,8 @@ class CommandExecutionService:
 
     def __init__(self):
         self.connector_factory = ConnectorFactory()
+        self.adaptive_timeouts = AdaptiveTimeoutService()
+        self.rate_limiting = RateLimitingService()
 
     def execute_command_with_retry(
         self,
@@ -67,15 +79,17 @@ class CommandExecutionService:
                     device.name,
                 )
 
-                # Execute command using context manager for proper cleanup
-                with connector:
-                    result = connector.execute_command(
+                # Execute command in a pooled session (or a one-off session
+                # when pooling is disabled) for proper cleanup
+                with self._open_session(device, connector) as session:
+                    result = session.execute_command(
                         command.command, command.command_type
                     )
                     logger.debug(
                         "Command executed successfully, output length: %d chars",
                         len(result.output) if result.output else 0,
                     )
+                self._record_session_success(device, session, [result])
 
                 # If successful, log and return
                 logger.info(
@@ -165,31 +179,15 @@ class CommandExecutionService:
                         device.name,
                     )
                     try:
-                        # Create Netmiko connector directly for fallback
-                        base_config = self.connector_factory._build_connection_config(
+                        fallback_connector = self._create_fallback_connector(
                             device, username, password
                         )
-                        netmiko_config = (
-                            self.connector_factory._prepare_connector_config(
-                                base_config, NetmikoConnector
-                            )
-                        )
-                        fallback_connector = NetmikoConnector(netmiko_config)
 
                         # Execute command using Netmiko fallback connector
-                        with fallback_connector:
-                            result = fallback_connector.execute_command(
+                        with self._open_session(device, fallback_connector) as session:
+                            result = session.execute_command(
                                 command.command, command.command_type
                             )
-                            logger.info(
-                                "Command executed successfully using Netmiko fallback on %s",
-                                device.name,
-                            )
-                            command_log = self._log_command_execution(
-                                command, device, result, username
-                            )
-                            result.command_log_id = command_log.id
-                            return result
 
                     except Exception as fallback_error:
                         logger.warning(
@@ -199,6 +197,18 @@ class CommandExecutionService:
                         last_error = fallback_error
                         break  # Don't retry after fallback failure
 
+                    # The session is back in the pool before the database work
+                    self._record_session_success(device, session, [result])
+                    logger.info(
+                        "Command executed successfully using Netmiko fallback on %s",
+                        device.name,
+                    )
+                    command_log = self._log_command_execution(
+                        command, device, result, username
+                    )
+                    result.command_log_id = command_log.id
+                    return result
+
                 # If this was a socket/connection error and we have retries left, continue
                 elif attempt < max_retries and (
                     "socket" in error_msg.lower()
@@ -232,6 +242,149 @@ class CommandExecutionService:
 
         return error_result
 
+    def execute_many(
+        self,
+        commands: list["Command"],
+        device: Any,
+        username: str,
+        password: str,
+    ) -> list["CommandResult"]:
+        """
+        Execute several commands on a device over a single session.
+
+        The device is connected once and every command runs on the same
+        session, so only the first command pays the connection overhead.
+
+        Args:
+            commands: Commands to execute, in order
+            device: Target device
+            username: Authentication username
+            password: Authentication password
+
+        Returns:
+            One CommandResult per command, in the same order, each with its
+            own CommandLog entry
+        """
+        if not commands:
+            return []
+
+        logger.info(
+            "Executing %d commands on device %s in a single session",
+            len(commands),
+            device.name,
+        )
+
+        try:
+            connector = self.connector_factory.create_connector(
+                device, username, password
+            )
+            results = self._execute_batch(connector, commands, device)
+
+        except Exception as e:
+            error_msg = str(e)
+
+            if not self._is_authentication_error(error_msg) and (
+                "Fast-fail to Netmiko" in error_msg
+                or ToolkitSettings.should_fast_fail_to_netmiko(error_msg)
+            ):
+                logger.info(
+                    "Fast-fail pattern detected, attempting batch fallback to Netmiko for device %s",
+                    device.name,
+                )
+                try:
+                    fallback_connector = self._create_fallback_connector(
+                        device, username, password
+                    )
+                    results = self._execute_batch(fallback_connector, commands, device)
+                except Exception as fallback_error:
+                    logger.warning(
+                        "Netmiko fallback also failed for device %s", device.name
+                    )
+                    results = self._build_batch_error_results(
+                        commands, fallback_error, device
+                    )
+            else:
+                logger.error(
+                    "Batch execution failed for device %s: %s", device.name, error_msg
+                )
+                results = self._build_batch_error_results(commands, e, device)
+
+        for command, result in zip(commands, results, strict=True):
+            command_log = self._log_command_execution(command, device, result, username)
+            result.command_log_id = command_log.id
+
+        return results
+
+    def _execute_batch(
+        self,
+        connector: BaseDeviceConnector,
+        commands: list["Command"],
+        device: Device,
+    ) -> list[CommandResult]:
+        """Run commands on one session, batching consecutive commands of a type."""
+        results = []
+
+        with self._open_session(device, connector) as session:
+            # Group consecutive commands by type so show and config commands
+            # each use the connector's batch method for their type
+            for command_type, group in itertools.groupby(
+                commands, key=lambda command: command.command_type
+            ):
+                group = list(group)
+                results.extend(
+                    session.execute_commands(
+                        [command.command for command in group], command_type
+                    )
+                )
+
+        self._record_session_success(device, session, results)
+
+        return results
+
+    def _build_batch_error_results(
+        self, commands: list["Command"], error: Exception, device: Device
+    ) -> list[CommandResult]:
+        """Build one failed result per command when the session itself failed."""
+        error_msg = str(error)
+        if self._is_authentication_error(error_msg):
+            error_msg = f"Authentication failed: {error_msg}"
+
+        return [
+            self._enhance_error_result(
+                CommandResult(
+                    command=command.command,
+                    output="",
+                    success=False,
+                    error_message=error_msg,
+                ),
+                error,
+                device,
+            )
+            for command in commands
+        ]
+
+    def _record_session_success(
+        self,
+        device: Device,
+        connector: BaseDeviceConnector,
+        results: list[CommandResult],
+    ) -> None:
+        """Remember what worked for the device after a successful session."""
+        self.connector_factory.record_connector_success(device, connector)
+        self.adaptive_timeouts.record_execution(device, connector, results)
+
+    def _create_fallback_connector(
+        self, device: Device, username: str, password: str
+    ) -> NetmikoConnector:
+        """Create a Netmiko connector directly for fallback."""
+        base_config = self.connector_factory._build_connection_config(
+            device, username, password
+        )
+        netmiko_config = self.connector_factory._prepare_connector_config(
+            base_config, NetmikoConnector
+        )
+        return NetmikoConnector(netmiko_config)
+
     def execute_command_with_token(
         self,
         command: "Command",
@@ -252,6 +405,10 @@ class CommandExecutionService:
 
         Returns:
             CommandResult with execution details
+
+        Raises:
+            CredentialVerificationBusyError: If the token couldn't be verified
+                because too many Argon2 operations are queued
         """
         from .credential_service import CredentialService
 
@@ -314,6 +471,10 @@ class CommandExecutionService:
 
         Returns:
             CommandResult with execution details
+
+        Raises:
+            CredentialVerificationBusyError: If deriving the decryption key
+                had to wait for too many queued Argon2 operations
         """
         from ..models import DeviceCredentialSet
 
@@ -351,6 +512,8 @@ class CommandExecutionService:
                 credential_set.encrypted_password,
                 credential_set.encryption_key_id,
             )
+        except CredentialVerificationBusyError:
+            raise
         except Exception as e:
             error_result = CommandResult(
                 command=command.command,
@@ -370,10 +533,55 @@ class CommandExecutionService:
             max_retries=max_retries,
         )
 
+    def _open_session(self, device: Device, connector: BaseDeviceConnector):
+        """Get a context manager yielding a connected session for the device.
+
+        Reuses a pooled session for the same device, credentials and connector
+        class when the session pool is enabled.
+        """
+        pool = get_connection_pool()
+        if pool is None:
+            return connector
+        return pool.session(device.pk, connector)
+
+    def _parse_result(self, command: Command, result: CommandResult) -> None:
+        """Parse show command output with the command's parsers, first success wins."""
+        if (
+            not result.success
+            or result.has_syntax_error
+            or command.command_type != "show"
+            or not result.output
+        ):
+            return
+
+        outcome = parse_command_output(command, result.parsing_platform, result.output)
+        result.parsing_method = outcome.method
+        if outcome.future is not None:
+            result.parsing_future = outcome.future
+        elif outcome.success:
+            result.parsed_output = outcome.data
+            result.parsing_success = True
+        elif outcome.errors:
+            result.parsing_error = "; ".join(outcome.errors)
+
+    def _encode_parsed_output(self, result: CommandResult) -> bytes | None:
+        """Encode a result's parsed output for its log entry, if any."""
+        if not result.parsing_success or not result.parsed_output:
+            return None
+
+        try:
+            return encode_parsed_data(result.parsed_output)
+        except (TypeError, ValueError) as e:
+            logger.warning("Could not store parsed output: %s", str(e))
+            return None
+
     def _log_command_execution(
         self, command: Command, device: Device, result: CommandResult, username: str
     ) -> CommandLog:
         """Log command execution to database."""
+        # Every execution path logs its results, so parse here once for all
+        self._parse_result(command, result)
+
         if result.success:
             output = result.output
             # If syntax error was detected, note it in the success flag
@@ -399,16 +607,42 @@ class CommandExecutionService:
             success = False
             error_message = core_error
 
-        # Create log entry with concise technical details
-        command_log = CommandLog.objects.create(
-            command=command,
-            device=device,
-            output=output,
-            username=username,
-            success=success,
-            error_message=error_message,
-            execution_duration=result.execution_time,
-        )
+        # Keep the structured output so exports don't have to parse again
+        parsed_data = self._encode_parsed_output(result)
+
+        # Create log entry with concise technical details in its own short
+        # transaction rather than inside a caller's long-running one
+        with transaction.atomic():
+            command_log = CommandLog.objects.create(
+                command=command,
+                device=device,
+                output=output,
+                username=username,
+                success=success,
+                error_message=error_message,
+                execution_duration=result.execution_time,
+                parsed_data_compressed=parsed_data,
+                parsing_method=(result.parsing_method or "") if parsed_data else "",
+            )
+
+        if result.parsing_future is not None:
+            # Store the parsed output once the parse executor finishes it
+            parsing_future = result.parsing_future
+            transaction.on_commit(
+                lambda: parsing_future.add_done_callback(
+                    self._get_deferred_parse_callback(
+                        command_log.pk, result.parsing_method
+                    )
+                )
+            )
+
+        if success:
+            # Count the execution once its log entry is committed
+            transaction.on_commit(
+                lambda: self.rate_limiting.record_successful_execution(
+                    device, command_log.execution_time
+                )
+            )
 
         if result.has_syntax_error:
             pass  # Syntax error detected but not logging
@@ -417,6 +651,35 @@ class CommandExecutionService:
 
         return command_log
 
+    def _get_deferred_parse_callback(self, command_log_id: int, parsing_method: str):
+        """Build a future callback that stores off-thread parsed output on a log."""
+        caller_thread_id = threading.get_ident()
+
+        def store_parsed_output(future: Future) -> None:
+            try:
+                parsed_data = encode_parsed_data(future.result())
+                if parsed_data is not None:
+                    CommandLog.objects.filter(pk=command_log_id).update(
+                        parsed_data_compressed=parsed_data,
+                        parsing_method=parsing_method,
+                    )
+                    logger.debug(
+                        "Stored deferred parse of command log %s", command_log_id
+                    )
+            except Exception as e:
+                logger.debug(
+                    "Deferred parse of command log %s failed: %s",
+                    command_log_id,
+                    str(e),
+                )
+            finally:
+                # Callbacks of pending futures run on the executor's own thread,
+                # which must not keep database connections open
+                if threading.get_ident() != caller_thread_id:
+                    connections.close_all()
+
+        return store_parsed_output
+
     def _enhance_error_result(
         self, result: CommandResult, error: Exception, device: Device
     ) -> CommandResult:
@@ -4,8 +4,10 @@ Service for handling credential token operations and validation
 
 from django.contrib.auth.models import User
 
+from ..exceptions import CredentialVerificationBusyError
 from ..models import DeviceCredentialSet
 from .encryption_service import CredentialEncryptionService
+from .verified_token_cache import get_verified_token_cache
 
 
 class CredentialService:
@@ -22,23 +24,60 @@ class CredentialService:
 
         Returns:
             (is_valid, credential_set, error_message)
+
+        Raises:
+            CredentialVerificationBusyError: If the token couldn't be verified
+                because too many Argon2 operations are queued; this is not a
+                bad token, so callers should ask the client to retry
         """
         # Basic format validation first
         if not self.encryption_service.validate_token_format(access_token):
             return False, None, "Invalid token format"
 
         try:
-            # Get all credential sets for this user
-            user_credential_sets = DeviceCredentialSet.objects.filter(owner=user)
-
-            # Check each credential set's stored hash against the provided token
-            for credential_set in user_credential_sets:
-                if self.encryption_service.validate_access_token(
-                    access_token,
-                    credential_set.access_token,
-                    credential_set.id,
-                    user.pk,
-                ):
+            fingerprint = self.encryption_service.fingerprint_token(access_token)
+
+            # Recently verified tokens skip the Argon2id verification. The
+            # fingerprint is matched against the row, so a regenerated token
+            # misses even in workers that haven't seen the invalidation.
+            token_cache = get_verified_token_cache()
+            if token_cache is not None:
+                credential_set_id = token_cache.get(fingerprint, user.pk)
+                if credential_set_id is not None:
+                    credential_set = DeviceCredentialSet.objects.filter(
+                        pk=credential_set_id,
+                        owner=user,
+                        access_token_fingerprint=fingerprint,
+                    ).first()
+                    if credential_set is not None:
+                        return True, credential_set, None
+
+            # Find the candidate with one indexed query, then verify its hash
+            credential_set = DeviceCredentialSet.objects.filter(
+                owner=user, access_token_fingerprint=fingerprint
+            ).first()
+            if credential_set is not None:
+                if self._verify_token(access_token, credential_set, user):
+                    if token_cache is not None:
+                        token_cache.set(fingerprint, user.pk, credential_set.pk)
+                    return True, credential_set, None
+                return (
+                    False,
+                    None,
+                    "Invalid credential token or token does not belong to current user",
+                )
+
+            # Credential sets created before fingerprints existed are checked
+            # one by one, and get their fingerprint on the first match
+            legacy_credential_sets = DeviceCredentialSet.objects.filter(
+                owner=user, access_token_fingerprint=""
+            )
+            for credential_set in legacy_credential_sets:
+                if self._verify_token(access_token, credential_set, user):
+                    credential_set.access_token_fingerprint = fingerprint
+                    credential_set.save(update_fields=["access_token_fingerprint"])
+                    if token_cache is not None:
+                        token_cache.set(fingerprint, user.pk, credential_set.pk)
                     return True, credential_set, None
 
             # If no credential set matched, token is invalid
@@ -48,6 +87,8 @@ class CredentialService:
                 "Invalid credential token or token does not belong to current user",
             )
 
+        except CredentialVerificationBusyError:
+            raise
         except Exception as e:
             from ..utils.error_sanitizer import ErrorSanitizer
 
@@ -56,6 +97,17 @@ class CredentialService:
             )
             return False, None, sanitized_error
 
+    def _verify_token(
+        self, access_token: str, credential_set: DeviceCredentialSet, user: User
+    ) -> bool:
+        """Verify a token against a credential set's stored Argon2id hash."""
+        return self.encryption_service.validate_access_token(
+            access_token,
+            credential_set.access_token,
+            credential_set.id,
+            user.pk,
+        )
+
     def get_credentials_by_token(
         self, access_token: str, user: User
     ) -> tuple[bool, dict[str, str] | None, str | None]:
@@ -79,6 +131,8 @@ class CredentialService:
                 credential_set.encryption_key_id,
             )
             return True, decrypted_credentials, None
+        except CredentialVerificationBusyError:
+            raise
         except Exception as e:
             from ..utils.error_sanitizer import ErrorSanitizer
 
@@ -139,6 +193,9 @@ class CredentialService:
                 credential_set.encryption_key_id,
             )
             return True, decrypted_credentials, credential_set, None
+        except CredentialVerificationBusyError:
+            # Deriving the master key on a cold cache runs Argon2 as well
+            raise
         except Exception:
             error_message = (
                 "Unable to decrypt stored credentials. This typically occurs when "
@@ -168,10 +225,25 @@ class CredentialService:
 
             # Store both the hash and encrypted raw token
             credential_set.access_token = token_hash  # Store the hash for verification
+            credential_set.access_token_fingerprint = (
+                self.encryption_service.fingerprint_token(new_token)
+            )  # Store the fingerprint for lookup
             credential_set.encrypted_token = self.encryption_service.encrypt_token(
                 new_token
             )  # Store encrypted raw token for display
-            credential_set.save(update_fields=["access_token", "encrypted_token"])
+            credential_set.save(
+                update_fields=[
+                    "access_token",
+                    "access_token_fingerprint",
+                    "encrypted_token",
+                ]
+            )
+
+            # The post_save signal invalidates cached verifications as well, but
+            # the old token must stop working even if signals are bypassed
+            token_cache = get_verified_token_cache()
+            if token_cache is not None:
+                token_cache.invalidate_credential_set(credential_set.pk)
 
             return True, new_token, None  # Return the raw token to user
         except DeviceCredentialSet.DoesNotExist:
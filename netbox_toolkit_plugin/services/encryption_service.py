@@ -9,7 +9,14 @@ pepper-based security enhancements.
 
 import base64
 import hashlib
+import hmac
+import math
 import secrets
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable
+from typing import Any, TypeVar
 
 from django.conf import settings
 
@@ -17,6 +24,9 @@ from cryptography.fernet import Fernet
 from cryptography.hazmat.primitives import hashes
 from cryptography.hazmat.primitives.kdf.hkdf import HKDF
 
+from ..exceptions import CredentialVerificationBusyError
+from ..utils.logging import get_toolkit_logger
+
 try:
     import argon2
 
@@ -24,6 +34,159 @@ try:
 except ImportError:
     HAS_ARGON2 = False
 
+logger = get_toolkit_logger(__name__)
+
+T = TypeVar("T")
+
+# Maximum number of per-credential HKDF keys kept in memory
+CREDENTIAL_KEY_CACHE_SIZE = 1024
+
+# Derived keys are memoized per process. Entries are keyed by a digest of every
+# input to the derivation, so a different pepper, SECRET_KEY or set of parameters
+# never reuses a stale key.
+_master_keys: dict[str, bytes] = {}
+_credential_keys: OrderedDict[tuple[str, str], bytes] = OrderedDict()
+# Guards the dicts above and below; only held for dict operations
+_key_cache_lock = threading.Lock()
+# One lock per master key, held while it is derived, so a slow derivation
+# doesn't block decrypts that use keys already in the cache
+_master_key_locks: dict[str, threading.Lock] = {}
+
+
+def clear_key_cache() -> None:
+    """Forget all memoized keys, e.g. after rotating the pepper or SECRET_KEY."""
+    with _key_cache_lock:
+        _master_keys.clear()
+        _credential_keys.clear()
+        _master_key_locks.clear()
+
+
+class Argon2Executor:
+    """Run Argon2 operations with concurrency bounded by a memory budget.
+
+    Every Argon2 hash or verify allocates ``memory_cost`` KiB for its duration,
+    so unbounded concurrency under burst load can exhaust a worker's memory.
+    Operations run on the caller's thread once one of the slots is free. The
+    number of slots is the memory budget divided by the memory cost. Callers
+    that wait longer than ``queue_timeout``, or arrive when ``max_queue``
+    callers are already waiting, get CredentialVerificationBusyError instead.
+    """
+
+    def __init__(
+        self,
+        memory_budget_mb: int,
+        memory_cost_kib: int,
+        max_queue: int = 32,
+        queue_timeout: float = 10,
+    ):
+        self.concurrency = max(1, (memory_budget_mb * 1024) // max(1, memory_cost_kib))
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self._slots = threading.BoundedSemaphore(self.concurrency)
+        self._lock = threading.Lock()
+        self._waiting = 0
+        self._in_flight = 0
+        self.completed = 0
+        self.rejected = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    def run(self, func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """
+        Run an Argon2 operation once a slot is free.
+
+        Raises:
+            CredentialVerificationBusyError: If the queue is full or no slot
+                became free within the queue timeout
+        """
+        with self._lock:
+            if self._waiting >= self.max_queue:
+                self.rejected += 1
+                raise CredentialVerificationBusyError(
+                    "Too many credential verifications in progress, please retry",
+                    retry_after=self.retry_after,
+                )
+            self._waiting += 1
+
+        wait_start = time.monotonic()
+        acquired = self._slots.acquire(timeout=self.queue_timeout)
+        wait_time = time.monotonic() - wait_start
+
+        with self._lock:
+            self._waiting -= 1
+            self.total_wait += wait_time
+            self.max_wait = max(self.max_wait, wait_time)
+            if not acquired:
+                self.rejected += 1
+            else:
+                self._in_flight += 1
+
+        if not acquired:
+            logger.warning(
+                "Argon2 operation rejected after waiting %.2fs for a free slot",
+                wait_time,
+            )
+            raise CredentialVerificationBusyError(
+                "Timed out waiting for credential verification, please retry",
+                retry_after=self.retry_after,
+            )
+
+        if wait_time > 1:
+            logger.debug("Argon2 operation waited %.2fs for a free slot", wait_time)
+
+        try:
+            return func(*args, **kwargs)
+        finally:
+            self._slots.release()
+            with self._lock:
+                self._in_flight -= 1
+                self.completed += 1
+
+    @property
+    def retry_after(self) -> int:
+        """Seconds a rejected caller should wait: one queue timeout, rounded up."""
+        return max(1, math.ceil(self.queue_timeout))
+
+    def get_stats(self) -> dict[str, Any]:
+        """Get executor counters for monitoring."""
+        with self._lock:
+            started = self.completed + self._in_flight
+            return {
+                "concurrency": self.concurrency,
+                "in_flight": self._in_flight,
+                "waiting": self._waiting,
+                "completed": self.completed,
+                "rejected": self.rejected,
+                "avg_queue_wait": self.total_wait / started if started else 0.0,
+                "max_queue_wait": self.max_wait,
+            }
+
+
+_argon2_executor: Argon2Executor | None = None
+_argon2_executor_lock = threading.Lock()
+
+
+def get_argon2_executor() -> Argon2Executor:
+    """Get the process-wide Argon2 executor."""
+    global _argon2_executor
+
+    if _argon2_executor is None:
+        with _argon2_executor_lock:
+            if _argon2_executor is None:
+                from ..settings import ToolkitSettings
+
+                executor_config = ToolkitSettings.get_argon2_executor_config()
+                memory_cost = ToolkitSettings.get_security_config()["argon2"][
+                    "memory_cost"
+                ]
+                _argon2_executor = Argon2Executor(
+                    memory_budget_mb=executor_config["memory_budget_mb"],
+                    memory_cost_kib=memory_cost,
+                    max_queue=executor_config["max_queue"],
+                    queue_timeout=executor_config["queue_timeout"],
+                )
+    return _argon2_executor
+
 
 class CredentialEncryptionService:
     """
@@ -45,18 +208,27 @@ class CredentialEncryptionService:
 
     Important - Secret Rotation:
     Changing PEPPER or SECRET_KEY will make existing encrypted credentials
-    inaccessible. This is acceptable since the plugin stores credentials for
-    convenience only - they are not the source of truth. Simply recreate the
+    inaccessible. Re-encrypt them from the old secrets to the new ones with
+    the rotate_credential_keys management command, or recreate the
     DeviceCredentialSet objects with the actual credentials after rotation.
 
     Recommended Practice:
     - Set PEPPER once during initial deployment
     - Store PEPPER securely (e.g., environment variable, secrets manager)
-    - If rotation needed: delete old credentials, users re-enter them
+    - If rotation needed: run rotate_credential_keys with the old secrets
     """
 
-    def __init__(self):
-        """Initialize the encryption service with enhanced security configuration."""
+    def __init__(self, pepper: str | None = None, secret_key: str | None = None):
+        """
+        Initialize the encryption service with enhanced security configuration.
+
+        The overrides let key rotation hold services for the old and new
+        secrets side by side. Normal callers should not pass them.
+
+        Args:
+            pepper: Pepper to use instead of the configured one
+            secret_key: SECRET_KEY to use instead of Django's setting
+        """
         if not HAS_ARGON2:
             raise ImportError(
                 "argon2-cffi is required for enhanced security features. "
@@ -67,7 +239,10 @@ class CredentialEncryptionService:
         from ..settings import ToolkitSettings
 
         self._security_config = ToolkitSettings.get_security_config()
-        self._pepper = self._security_config["pepper"].encode("utf-8")
+        if pepper is None:
+            pepper = self._security_config["pepper"]
+        self._pepper = pepper.encode("utf-8")
+        self._secret_key = (secret_key or settings.SECRET_KEY).encode("utf-8")
         self._argon2_config = self._security_config["argon2"]
 
         # Initialize Argon2 hasher with configured parameters
@@ -79,9 +254,15 @@ class CredentialEncryptionService:
             salt_len=self._argon2_config["salt_len"],
         )
 
-        # Derive master key using enhanced method
+        # Derive master key using enhanced method (memoized per process)
+        self._master_key_id = self._get_master_key_id()
         self._master_key = self._derive_master_key()
 
+    @property
+    def master_key_id(self) -> str:
+        """Digest identifying the secrets and parameters behind the master key."""
+        return self._master_key_id
+
     def encrypt_credentials(self, username: str, password: str) -> dict[str, str]:
         """
         Encrypt credentials using Fernet with Argon2id-derived keys.
@@ -201,6 +382,68 @@ class CredentialEncryptionService:
         except Exception as e:
             raise ValueError(f"Failed to decrypt token: {str(e)}") from e
 
+    def decrypt_usernames(self, items: list[tuple[str, str]]) -> list[str | None]:
+        """
+        Decrypt the usernames of many credential sets at once.
+
+        List views show a username for every row. Building one cipher per
+        distinct key ID from the memoized master key keeps a page of rows to a
+        single key derivation pass instead of a full service setup per row.
+
+        Args:
+            items: (encrypted_username, key_id) pairs
+
+        Returns:
+            Decrypted usernames in the same order, with None for any entry
+            that could not be decrypted
+        """
+        ciphers: dict[str, Fernet] = {}
+        usernames: list[str | None] = []
+        for encrypted_username, key_id in items:
+            try:
+                fernet = ciphers.get(key_id)
+                if fernet is None:
+                    fernet = ciphers[key_id] = Fernet(
+                        self._derive_credential_key(key_id)
+                    )
+                decrypted = fernet.decrypt(
+                    base64.b64decode(encrypted_username.encode("utf-8"))
+                )
+                usernames.append(decrypted.decode("utf-8"))
+            except Exception as e:
+                logger.debug("Failed to decrypt username: %s", str(e))
+                usernames.append(None)
+
+        return usernames
+
+    def decrypt_tokens(self, encrypted_tokens: list[str]) -> list[str | None]:
+        """
+        Decrypt many encrypted tokens with a single master key cipher.
+
+        Args:
+            encrypted_tokens: Base64 encoded encrypted tokens
+
+        Returns:
+            Decrypted tokens in the same order, with None for any entry that is
+            empty or could not be decrypted
+        """
+        fernet = Fernet(self._master_key)
+        tokens: list[str | None] = []
+        for encrypted_token in encrypted_tokens:
+            if not encrypted_token:
+                tokens.append(None)
+                continue
+            try:
+                decrypted = fernet.decrypt(
+                    base64.b64decode(encrypted_token.encode("utf-8"))
+                )
+                tokens.append(decrypted.decode("utf-8"))
+            except Exception as e:
+                logger.debug("Failed to decrypt token: %s", str(e))
+                tokens.append(None)
+
+        return tokens
+
     def generate_access_token(
         self, credential_set_id: int, user_id: int
     ) -> tuple[str, str]:
@@ -224,6 +467,44 @@ class CredentialEncryptionService:
 
         return raw_token, token_hash
 
+    def hash_access_token(
+        self, raw_token: str, credential_set_id: int, user_id: int
+    ) -> str:
+        """
+        Hash an existing token for storage, e.g. after rotating the pepper.
+
+        Args:
+            raw_token: The raw token to hash
+            credential_set_id: ID of the credential set
+            user_id: ID of the user who owns the credentials
+
+        Returns:
+            Argon2id hash to store in database
+        """
+        return self._hash_token_for_storage(raw_token, credential_set_id, user_id)
+
+    def fingerprint_token(self, raw_token: str) -> str:
+        """
+        Compute the lookup fingerprint of an access token.
+
+        The fingerprint is an HMAC-SHA256 of the token keyed with the pepper.
+        It is deterministic, so it can be stored in an indexed column to find
+        the matching credential set with one query. The Argon2id hash is then
+        verified for that row only. Without the pepper the fingerprint can't be
+        used to test token guesses.
+
+        Args:
+            raw_token: Token provided by user
+
+        Returns:
+            Hex encoded fingerprint (64 characters)
+        """
+        return hmac.new(
+            self._pepper,
+            b"netbox_toolkit_token_fingerprint_v1:" + raw_token.encode("utf-8"),
+            hashlib.sha256,
+        ).hexdigest()
+
     def validate_access_token(
         self, raw_token: str, stored_hash: str, credential_set_id: int, user_id: int
     ) -> bool:
@@ -246,16 +527,59 @@ class CredentialEncryptionService:
             )
 
             # Verify using Argon2id - this is timing-attack resistant
-            self._password_hasher.verify(stored_hash, token_with_context)
+            get_argon2_executor().run(
+                self._password_hasher.verify, stored_hash, token_with_context
+            )
             return True
 
         except argon2.exceptions.VerifyMismatchError:
             return False
+        except CredentialVerificationBusyError:
+            # Overload is not a mismatch - let callers report it as such
+            raise
         except Exception:
             # Log but don't expose internal errors
             return False
 
+    def _get_master_key_id(self) -> str:
+        """Build the memoization key for the master key from its inputs."""
+        derivation_inputs = b"\0".join([
+            self._pepper,
+            self._secret_key,
+            str(self._security_config.get("master_key_derivation")).encode(),
+        ])
+        return hashlib.sha256(derivation_inputs).hexdigest()
+
     def _derive_master_key(self) -> bytes:
+        """
+        Get the master encryption key, deriving it once per process.
+
+        Argon2id derivation is deliberately slow, and the service is created
+        often, so the key is memoized. Use clear_key_cache() to force a fresh
+        derivation.
+
+        Returns:
+            32-byte key suitable for Fernet encryption
+        """
+        master_key = _master_keys.get(self._master_key_id)
+        if master_key is not None:
+            return master_key
+
+        with _key_cache_lock:
+            derivation_lock = _master_key_locks.setdefault(
+                self._master_key_id, threading.Lock()
+            )
+
+        with derivation_lock:
+            # Another thread may have derived it while we waited for the lock
+            master_key = _master_keys.get(self._master_key_id)
+            if master_key is None:
+                master_key = self._compute_master_key()
+                with _key_cache_lock:
+                    _master_keys[self._master_key_id] = master_key
+            return master_key
+
+    def _compute_master_key(self) -> bytes:
         """
         Derive master encryption key using Argon2id with pepper.
 
@@ -271,7 +595,7 @@ class CredentialEncryptionService:
         # Use pepper as primary secret, SECRET_KEY as secondary for defense in depth
         # This isolates credential encryption from Django's SECRET_KEY
         primary_secret = self._pepper
-        secondary_secret = settings.SECRET_KEY.encode("utf-8")
+        secondary_secret = self._secret_key
 
         # Service-specific salt to prevent key reuse
         salt = b"netbox_toolkit_credentials_v2"
@@ -282,7 +606,8 @@ class CredentialEncryptionService:
             key_material = primary_secret + secondary_secret + salt
 
             # Use lower parameters for master key derivation (performance)
-            derived_key_raw = argon2.low_level.hash_secret_raw(
+            derived_key_raw = get_argon2_executor().run(
+                argon2.low_level.hash_secret_raw,
                 secret=key_material,
                 salt=salt[:16],  # Argon2 needs exactly 16 bytes for salt
                 time_cost=2,  # Lower than token hashing
@@ -313,12 +638,33 @@ class CredentialEncryptionService:
         simple hashing as it provides proper key stretching and domain
         separation.
 
+        Derived keys are kept in a bounded per-process LRU cache.
+
         Args:
             key_id: Unique identifier for this credential set
 
         Returns:
             32-byte key suitable for Fernet encryption
         """
+        cache_key = (self._master_key_id, key_id)
+        with _key_cache_lock:
+            credential_key = _credential_keys.get(cache_key)
+            if credential_key is not None:
+                _credential_keys.move_to_end(cache_key)
+                return credential_key
+
+        credential_key = self._compute_credential_key(key_id)
+
+        with _key_cache_lock:
+            _credential_keys[cache_key] = credential_key
+            _credential_keys.move_to_end(cache_key)
+            while len(_credential_keys) > CREDENTIAL_KEY_CACHE_SIZE:
+                _credential_keys.popitem(last=False)
+
+        return credential_key
+
+    def _compute_credential_key(self, key_id: str) -> bytes:
+        """Derive a credential key with HKDF from the master key."""
         # Use HKDF for proper cryptographic key derivation
         # This provides defense-in-depth over simple SHA256 hashing
         hkdf = HKDF(
@@ -391,4 +737,4 @@ class CredentialEncryptionService:
         token_with_context = self._create_token_context(
             raw_token, credential_set_id, user_id
         )
-        return self._password_hasher.hash(token_with_context)
+        return get_argon2_executor().run(self._password_hasher.hash, token_with_context)
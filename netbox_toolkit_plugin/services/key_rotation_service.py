@@ -0,0 +1,353 @@
+"""Service for re-encrypting stored credentials after rotating secrets."""
+
+import hashlib
+import json
+import multiprocessing
+import os
+from collections.abc import Callable, Iterator
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass, fields
+
+from django.db import connections, transaction
+
+from ..models import DeviceCredentialSet
+from ..settings import ToolkitSettings
+from ..utils.logging import get_toolkit_logger
+from .encryption_service import CredentialEncryptionService
+
+logger = get_toolkit_logger(__name__)
+
+# Fields rewritten when a credential set moves to the new keys
+ROTATED_FIELDS = [
+    "encrypted_username",
+    "encrypted_password",
+    "encryption_key_id",
+    "encrypted_token",
+    "access_token",
+    "access_token_fingerprint",
+]
+
+
+@dataclass
+class KeyRotationStats:
+    """Counters for a key rotation run."""
+
+    rotated: int = 0
+    already_rotated: int = 0
+    failed: int = 0
+    tokens_rehashed: int = 0
+    tokens_unrecoverable: int = 0
+
+    def merge(self, other: "KeyRotationStats") -> None:
+        """Add another set of counters to this one."""
+        for field in fields(self):
+            setattr(
+                self, field.name, getattr(self, field.name) + getattr(other, field.name)
+            )
+
+
+@dataclass(frozen=True)
+class RotationSecrets:
+    """Old and new secrets of a rotation."""
+
+    old_pepper: str
+    old_secret_key: str | None
+    new_pepper: str
+    new_secret_key: str | None
+
+
+class KeyRotationService:
+    """Re-encrypt every credential set from old secrets to new ones.
+
+    Both master keys are derived once up front. Credential sets are split into
+    primary key ranges of ``chunk_size`` rows, each streamed with a server-side
+    iterator and written back with ``bulk_update`` in batches of
+    ``batch_size``. With ``workers`` above one the ranges run in forked worker
+    processes, which inherit the derived keys.
+
+    After each range the highest primary key below which every range is done
+    is written to the checkpoint file, so an interrupted run resumes there.
+    Rows that already decrypt with the new keys are skipped, so ranges
+    finished after the checkpoint are never rotated twice.
+
+    Token hashes and fingerprints are keyed with the pepper. When the pepper
+    changes they are recomputed from the encrypted display token. Sets without
+    one keep a token that stops validating and must be regenerated.
+    """
+
+    def __init__(
+        self,
+        old_pepper: str | None = None,
+        old_secret_key: str | None = None,
+        new_pepper: str | None = None,
+        new_secret_key: str | None = None,
+        chunk_size: int = 2000,
+        batch_size: int = 500,
+        workers: int = 1,
+        checkpoint_path: str | None = None,
+        dry_run: bool = False,
+    ):
+        configured_pepper = ToolkitSettings.get_security_config()["pepper"]
+        self.secrets = RotationSecrets(
+            old_pepper=old_pepper or configured_pepper,
+            old_secret_key=old_secret_key,
+            new_pepper=new_pepper or configured_pepper,
+            new_secret_key=new_secret_key,
+        )
+        self.chunk_size = max(1, chunk_size)
+        self.batch_size = max(1, batch_size)
+        self.workers = max(1, workers)
+        self.checkpoint_path = checkpoint_path
+        self.dry_run = dry_run
+
+        # Derive both master keys once; forked workers inherit them
+        old_service, new_service = _get_services(self.secrets)
+        if old_service.master_key_id == new_service.master_key_id:
+            raise ValueError("The old and new secrets are identical")
+        self.rotation_id = hashlib.sha256(
+            f"{old_service.master_key_id}:{new_service.master_key_id}".encode()
+        ).hexdigest()
+        self.rehash_tokens = self.secrets.old_pepper != self.secrets.new_pepper
+
+    def run(
+        self, progress: Callable[[int, KeyRotationStats], None] | None = None
+    ) -> KeyRotationStats:
+        """
+        Rotate all credential sets not covered by the checkpoint.
+
+        Args:
+            progress: Called with the checkpointed primary key and the running
+                totals after each range completes
+
+        Returns:
+            Totals for the whole rotation, including earlier resumed runs
+        """
+        last_pk, stats = self._load_checkpoint()
+        ranges = list(self._plan_ranges(last_pk))
+        if not ranges:
+            return stats
+
+        logger.info(
+            "Rotating credential keys for %d ranges after pk %d with %d workers",
+            len(ranges),
+            last_pk,
+            self.workers,
+        )
+
+        for end_pk, range_stats in self._run_ranges(ranges):
+            stats.merge(range_stats)
+            self._save_checkpoint(end_pk, stats)
+            if progress is not None:
+                progress(end_pk, stats)
+
+        return stats
+
+    def _plan_ranges(self, after_pk: int) -> Iterator[tuple[int, int]]:
+        """Split the remaining credential sets into primary key ranges."""
+        primary_keys = (
+            DeviceCredentialSet.objects
+            .filter(pk__gt=after_pk)
+            .order_by("pk")
+            .values_list("pk", flat=True)
+            .iterator(chunk_size=self.chunk_size)
+        )
+        start_pk = None
+        count = 0
+        for pk in primary_keys:
+            if start_pk is None:
+                start_pk = pk
+            count += 1
+            if count == self.chunk_size:
+                yield start_pk, pk
+                start_pk = None
+                count = 0
+        if start_pk is not None:
+            yield start_pk, pk
+
+    def _run_ranges(
+        self, ranges: list[tuple[int, int]]
+    ) -> Iterator[tuple[int, KeyRotationStats]]:
+        """Rotate ranges, yielding results in range order."""
+        args = (self.batch_size, self.chunk_size, self.rehash_tokens, self.dry_run)
+
+        if self.workers == 1 or len(ranges) == 1:
+            for start_pk, end_pk in ranges:
+                yield end_pk, _rotate_range(self.secrets, start_pk, end_pk, *args)
+            return
+
+        # Forked children must not share the parent's database connections
+        connections.close_all()
+        with ProcessPoolExecutor(
+            max_workers=min(self.workers, len(ranges)),
+            mp_context=multiprocessing.get_context("fork"),
+        ) as executor:
+            futures = [
+                executor.submit(_rotate_range, self.secrets, start_pk, end_pk, *args)
+                for start_pk, end_pk in ranges
+            ]
+            try:
+                # Waiting in submission order keeps the checkpoint contiguous
+                for (_start_pk, end_pk), future in zip(ranges, futures, strict=True):
+                    yield end_pk, future.result()
+            except BaseException:
+                executor.shutdown(wait=True, cancel_futures=True)
+                raise
+
+    def _load_checkpoint(self) -> tuple[int, KeyRotationStats]:
+        if not self.checkpoint_path or not os.path.exists(self.checkpoint_path):
+            return 0, KeyRotationStats()
+
+        with open(self.checkpoint_path) as checkpoint_file:
+            checkpoint = json.load(checkpoint_file)
+
+        if checkpoint.get("rotation") != self.rotation_id:
+            raise ValueError(
+                f"Checkpoint {self.checkpoint_path} belongs to a different rotation"
+            )
+
+        logger.info(
+            "Resuming credential key rotation after pk %d", checkpoint["last_pk"]
+        )
+        return checkpoint["last_pk"], KeyRotationStats(**checkpoint["stats"])
+
+    def _save_checkpoint(self, last_pk: int, stats: KeyRotationStats) -> None:
+        if not self.checkpoint_path or self.dry_run:
+            return
+
+        temp_path = f"{self.checkpoint_path}.tmp"
+        with open(temp_path, "w") as checkpoint_file:
+            json.dump(
+                {
+                    "rotation": self.rotation_id,
+                    "last_pk": last_pk,
+                    "stats": asdict(stats),
+                },
+                checkpoint_file,
+            )
+        os.replace(temp_path, self.checkpoint_path)
+
+
+def _get_services(
+    rotation_secrets: RotationSecrets,
+) -> tuple[CredentialEncryptionService, CredentialEncryptionService]:
+    """Build encryption services for the old and new secrets."""
+    return (
+        CredentialEncryptionService(
+            pepper=rotation_secrets.old_pepper,
+            secret_key=rotation_secrets.old_secret_key,
+        ),
+        CredentialEncryptionService(
+            pepper=rotation_secrets.new_pepper,
+            secret_key=rotation_secrets.new_secret_key,
+        ),
+    )
+
+
+def _rotate_range(
+    rotation_secrets: RotationSecrets,
+    start_pk: int,
+    end_pk: int,
+    batch_size: int,
+    chunk_size: int,
+    rehash_tokens: bool,
+    dry_run: bool,
+) -> KeyRotationStats:
+    """Rotate the credential sets in a primary key range.
+
+    Runs in worker processes, so it is a module-level function.
+    """
+    old_service, new_service = _get_services(rotation_secrets)
+    stats = KeyRotationStats()
+    pending: list[DeviceCredentialSet] = []
+
+    queryset = (
+        DeviceCredentialSet.objects
+        .filter(pk__gte=start_pk, pk__lte=end_pk)
+        .order_by("pk")
+        .only("pk", "owner", *ROTATED_FIELDS)
+    )
+    for credential_set in queryset.iterator(chunk_size=chunk_size):
+        if _rotate_credential_set(
+            credential_set, old_service, new_service, rehash_tokens, stats
+        ):
+            pending.append(credential_set)
+        if len(pending) >= batch_size:
+            _write_batch(pending, dry_run)
+            pending = []
+
+    _write_batch(pending, dry_run)
+    return stats
+
+
+def _rotate_credential_set(
+    credential_set: DeviceCredentialSet,
+    old_service: CredentialEncryptionService,
+    new_service: CredentialEncryptionService,
+    rehash_tokens: bool,
+    stats: KeyRotationStats,
+) -> bool:
+    """Re-encrypt one credential set in memory.
+
+    Returns:
+        True if the credential set changed and needs saving
+    """
+    try:
+        new_service.decrypt_credentials(
+            credential_set.encrypted_username,
+            credential_set.encrypted_password,
+            credential_set.encryption_key_id,
+        )
+        stats.already_rotated += 1
+        return False
+    except ValueError:
+        pass
+
+    try:
+        credentials = old_service.decrypt_credentials(
+            credential_set.encrypted_username,
+            credential_set.encrypted_password,
+            credential_set.encryption_key_id,
+        )
+    except ValueError:
+        logger.warning(
+            "Credential set %s can't be decrypted with the old secrets, skipping",
+            credential_set.pk,
+        )
+        stats.failed += 1
+        return False
+
+    encrypted = new_service.encrypt_credentials(
+        credentials["username"], credentials["password"]
+    )
+    credential_set.encrypted_username = encrypted["encrypted_username"]
+    credential_set.encrypted_password = encrypted["encrypted_password"]
+    credential_set.encryption_key_id = encrypted["key_id"]
+
+    raw_token = old_service.decrypt_tokens([credential_set.encrypted_token])[0]
+    if raw_token is not None:
+        credential_set.encrypted_token = new_service.encrypt_token(raw_token)
+        if rehash_tokens:
+            credential_set.access_token = new_service.hash_access_token(
+                raw_token, credential_set.pk, credential_set.owner_id
+            )
+            credential_set.access_token_fingerprint = new_service.fingerprint_token(
+                raw_token
+            )
+            stats.tokens_rehashed += 1
+    else:
+        credential_set.encrypted_token = ""
+        if rehash_tokens:
+            # The old token can't be re-hashed and will have to be regenerated
+            credential_set.access_token_fingerprint = ""
+            stats.tokens_unrecoverable += 1
+
+    stats.rotated += 1
+    return True
+
+
+def _write_batch(credential_sets: list[DeviceCredentialSet], dry_run: bool) -> None:
+    if not credential_sets or dry_run:
+        return
+
+    with transaction.atomic():
+        DeviceCredentialSet.objects.bulk_update(credential_sets, ROTATED_FIELDS)
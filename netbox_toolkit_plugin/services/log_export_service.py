@@ -0,0 +1,160 @@
+"""Service for streaming command log exports."""
+
+import csv
+import json
+import zlib
+from collections.abc import Callable, Iterable, Iterator
+from typing import Any
+
+from django.db.models import QuerySet
+
+from rest_framework.utils.encoders import JSONEncoder
+
+from ..models import CommandLog
+
+
+class _Echo:
+    """File-like object that hands csv.writer output straight back."""
+
+    def write(self, value: str) -> str:
+        return value
+
+
+class CommandLogExportService:
+    """Stream command logs as CSV, NDJSON or JSON without buffering the export.
+
+    Logs are read with a server-side cursor in chunks and written out chunk by
+    chunk, so memory use doesn't grow with the size of the export and the
+    first bytes are sent as soon as the first chunk is read. Any format can
+    be gzip-compressed on the fly.
+    """
+
+    FORMATS = {
+        "csv": ("text/csv", "csv"),
+        "ndjson": ("application/x-ndjson", "ndjson"),
+        "json": ("application/json", "json"),
+    }
+
+    CSV_HEADER = [
+        "ID",
+        "Command",
+        "Device",
+        "User",
+        "Success",
+        "Created",
+        "Execution Time",
+        "Execution Duration",
+        "Error Message",
+    ]
+
+    def __init__(self, chunk_size: int = 1000):
+        self.chunk_size = max(1, chunk_size)
+
+    def get_content_type(self, export_format: str, compress: bool = False) -> str:
+        """Get the response content type of an export."""
+        return "application/gzip" if compress else self.FORMATS[export_format][0]
+
+    def get_filename(self, export_format: str, compress: bool = False) -> str:
+        """Get the download file name of an export."""
+        filename = f"command_logs.{self.FORMATS[export_format][1]}"
+        return f"{filename}.gz" if compress else filename
+
+    def stream(
+        self,
+        queryset: QuerySet,
+        export_format: str,
+        serialize: Callable[[list[CommandLog]], list[dict[str, Any]]] | None = None,
+        compress: bool = False,
+    ) -> Iterator[bytes]:
+        """
+        Stream an export of a CommandLog queryset.
+
+        Args:
+            queryset: Logs to export, in the order they should be written
+            export_format: One of FORMATS
+            serialize: Turns a chunk of logs into dictionaries; required for
+                the NDJSON and JSON formats
+            compress: gzip-compress the output
+
+        Returns:
+            Iterator of encoded output chunks
+        """
+        if export_format not in self.FORMATS:
+            raise ValueError(f"Unsupported export format: {export_format}")
+
+        if export_format == "csv":
+            pieces = self._stream_csv(queryset)
+        elif export_format == "ndjson":
+            pieces = self._stream_ndjson(queryset, serialize)
+        else:
+            pieces = self._stream_json(queryset, serialize)
+
+        encoded = (piece.encode("utf-8") for piece in pieces)
+        return self._gzip(encoded) if compress else encoded
+
+    def _stream_csv(self, queryset: QuerySet) -> Iterator[str]:
+        writer = csv.writer(_Echo())
+        yield writer.writerow(self.CSV_HEADER)
+
+        # Command output is by far the largest column and isn't exported
+        logs = queryset.select_related("command", "device").defer("output")
+        for chunk in self._chunks(logs.prefetch_related(None)):
+            yield "".join(
+                writer.writerow([
+                    log.id,
+                    log.command.name,
+                    log.device.name,
+                    log.username,
+                    log.success,
+                    log.created.isoformat() if log.created else "",
+                    log.execution_time.isoformat(),
+                    log.execution_duration
+                    if log.execution_duration is not None
+                    else "",
+                    log.error_message,
+                ])
+                for log in chunk
+            )
+
+    def _stream_ndjson(
+        self, queryset: QuerySet, serialize: Callable | None
+    ) -> Iterator[str]:
+        for chunk in self._chunks(queryset.select_related("command", "device")):
+            yield "".join(
+                json.dumps(item, cls=JSONEncoder) + "\n" for item in serialize(chunk)
+            )
+
+    def _stream_json(
+        self, queryset: QuerySet, serialize: Callable | None
+    ) -> Iterator[str]:
+        # The count is written last so the rows don't have to be counted first
+        yield '{"results": ['
+        count = 0
+        for chunk in self._chunks(queryset.select_related("command", "device")):
+            items = [json.dumps(item, cls=JSONEncoder) for item in serialize(chunk)]
+            yield ("," if count else "") + ",".join(items)
+            count += len(items)
+        yield f'], "count": {count}}}'
+
+    def _chunks(self, queryset: QuerySet) -> Iterator[list[CommandLog]]:
+        chunk = []
+        for log in queryset.iterator(chunk_size=self.chunk_size):
+            chunk.append(log)
+            if len(chunk) >= self.chunk_size:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+
+    def _gzip(self, pieces: Iterable[bytes]) -> Iterator[bytes]:
+        compressor = zlib.compressobj(wbits=16 + zlib.MAX_WBITS)
+        first = True
+        for piece in pieces:
+            data = compressor.compress(piece)
+            if first:
+                # Flush so the client gets the gzip header and first rows now
+                data += compressor.flush(zlib.Z_SYNC_FLUSH)
+                first = False
+            if data:
+                yield data
+        yield compressor.flush()
@@ -0,0 +1,372 @@
+"""Stores for counting recent command executions per device."""
+
+import math
+import time
+from abc import ABC, abstractmethod
+from collections import Counter
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from datetime import timezone as dt_timezone
+
+from django.core.cache import cache
+from django.db.models import Count, Min
+from django.utils import timezone
+
+from ..models import CommandLog
+from ..utils.logging import get_toolkit_logger
+
+logger = get_toolkit_logger(__name__)
+
+
+@dataclass
+class RateLimitScope:
+    """A set of executions that share a limit."""
+
+    # Unique cache key component, e.g. "device:12"
+    key: str
+    # Human readable name used in messages
+    label: str
+    # CommandLog filters selecting the executions in this scope
+    filters: dict = field(default_factory=dict)
+    # False for scopes CommandLog can't attribute executions to, which are
+    # only counted by their reservations
+    logged: bool = True
+
+
+class RateLimitBackend(ABC):
+    """Interface for rate limit counter stores."""
+
+    @abstractmethod
+    def get_usage(
+        self, scope: RateLimitScope, window_seconds: int
+    ) -> tuple[int, datetime | None]:
+        """
+        Get recent successful executions in a scope.
+
+        Args:
+            scope: Executions to count
+            window_seconds: Length of the rate limit window
+
+        Returns:
+            Tuple of (count, reset_at) where reset_at is when the oldest counted
+            execution leaves the window, or None if nothing is counted
+        """
+
+    def record_success(  # noqa: B027
+        self, scopes: list[RateLimitScope], executed_at: datetime, window_seconds: int
+    ):
+        """
+        Record a successful execution that was just logged in every scope.
+
+        Does nothing by default, for backends that count from CommandLog.
+        """
+
+
+class DatabaseRateLimitBackend(RateLimitBackend):
+    """Count executions straight from CommandLog.
+
+    Always accurate, but every check scans the scope's recent log entries.
+    """
+
+    def get_usage(
+        self, scope: RateLimitScope, window_seconds: int
+    ) -> tuple[int, datetime | None]:
+        usage = CommandLog.objects.filter(
+            **scope.filters,
+            execution_time__gte=timezone.now() - timedelta(seconds=window_seconds),
+            success=True,  # Only count successful commands
+        ).aggregate(count=Count("pk"), oldest=Min("execution_time"))
+
+        if not usage["oldest"]:
+            return 0, None
+        return usage["count"], usage["oldest"] + timedelta(seconds=window_seconds)
+
+
+class CacheRateLimitBackend(RateLimitBackend):
+    """Sliding window counters kept in the Django cache.
+
+    The window is split into ``buckets`` slots, each an atomic cache counter
+    incremented when an execution succeeds. A check reads every slot in one
+    ``get_many`` call, so its cost doesn't grow with the size of CommandLog.
+    The oldest slot is counted until all of it has left the window, so limits
+    err on the strict side by at most one slot.
+
+    Counters are rebuilt from CommandLog when a scope has none yet, and again
+    once per window, so restarts, evictions and missed updates heal
+    themselves. Use a cache shared by all workers (NetBox's default Redis
+    cache) - a per-process cache would count each worker separately.
+    """
+
+    CACHE_PREFIX = "netbox_toolkit:rate_limit"
+
+    def __init__(self, buckets: int = 30):
+        self.buckets = max(1, buckets)
+        self.fallback = DatabaseRateLimitBackend()
+
+    def get_usage(
+        self, scope: RateLimitScope, window_seconds: int
+    ) -> tuple[int, datetime | None]:
+        try:
+            width = window_seconds / self.buckets
+            current = self._bucket_index(timezone.now(), width)
+            indexes = range(current - self.buckets, current + 1)
+            bucket_keys = [
+                self._bucket_key(scope.key, window_seconds, index) for index in indexes
+            ]
+            seeded_key = self._seeded_key(scope.key, window_seconds)
+            values = cache.get_many([*bucket_keys, seeded_key])
+
+            if seeded_key not in values:
+                return self._reconcile(scope, window_seconds)
+
+            count = 0
+            oldest = None
+            for index, key in zip(indexes, bucket_keys, strict=True):
+                bucket_count = values.get(key, 0)
+                if bucket_count:
+                    count += bucket_count
+                    if oldest is None:
+                        oldest = index
+        except Exception as e:
+            logger.warning("Rate limit cache unavailable, using CommandLog: %s", e)
+            return self.fallback.get_usage(scope, window_seconds)
+
+        if oldest is None:
+            return 0, None
+        return count, self._bucket_end(oldest, width) + timedelta(
+            seconds=window_seconds
+        )
+
+    def record_success(
+        self, scopes: list[RateLimitScope], executed_at: datetime, window_seconds: int
+    ):
+        width = window_seconds / self.buckets
+        index = self._bucket_index(executed_at, width)
+        ttl = self._bucket_ttl(window_seconds)
+
+        for scope in scopes:
+            try:
+                # Until the counters are seeded, the next check rebuilds them
+                # from CommandLog, which already includes this execution
+                if cache.get(self._seeded_key(scope.key, window_seconds)) is None:
+                    continue
+
+                key = self._bucket_key(scope.key, window_seconds, index)
+                if not cache.add(key, 1, ttl):
+                    try:
+                        cache.incr(key)
+                    except ValueError:
+                        # Expired between add() and incr()
+                        cache.set(key, 1, ttl)
+            except Exception as e:
+                logger.warning("Could not record execution in rate limit cache: %s", e)
+
+    def _reconcile(
+        self, scope: RateLimitScope, window_seconds: int
+    ) -> tuple[int, datetime | None]:
+        """Rebuild a scope's counters from CommandLog."""
+        width = window_seconds / self.buckets
+        current = self._bucket_index(timezone.now(), width)
+        oldest = current - self.buckets
+        window_start = datetime.fromtimestamp(oldest * width, tz=dt_timezone.utc)
+
+        execution_times = CommandLog.objects.filter(
+            **scope.filters, execution_time__gte=window_start, success=True
+        ).values_list("execution_time", flat=True)
+        bucket_counts = Counter(
+            self._bucket_index(execution_time, width)
+            for execution_time in execution_times
+        )
+
+        ttl = self._bucket_ttl(window_seconds)
+        cache.set_many(
+            {
+                self._bucket_key(scope.key, window_seconds, index): bucket_counts[index]
+                for index in range(oldest, current + 1)
+            },
+            ttl,
+        )
+        cache.set(self._seeded_key(scope.key, window_seconds), True, window_seconds)
+        logger.debug("Rebuilt rate limit counters for %s from CommandLog", scope.key)
+
+        if not bucket_counts:
+            return 0, None
+        return sum(bucket_counts.values()), self._bucket_end(
+            min(bucket_counts), width
+        ) + timedelta(seconds=window_seconds)
+
+    def _bucket_index(self, moment: datetime, width: float) -> int:
+        return math.floor(moment.timestamp() / width)
+
+    def _bucket_end(self, index: int, width: float) -> datetime:
+        return datetime.fromtimestamp((index + 1) * width, tz=dt_timezone.utc)
+
+    def _bucket_ttl(self, window_seconds: int) -> int:
+        # Long enough for a slot to be read until it has fully left the window
+        return math.ceil(window_seconds * (self.buckets + 2) / self.buckets)
+
+    def _bucket_key(self, scope_key: str, window_seconds: int, index: int) -> str:
+        return f"{self.CACHE_PREFIX}:{window_seconds}:{scope_key}:{index}"
+
+    def _seeded_key(self, scope_key: str, window_seconds: int) -> str:
+        return f"{self.CACHE_PREFIX}:{window_seconds}:{scope_key}:seeded"
+
+
+class RateLimitReservation:
+    """Capacity held in one or more scopes while commands run."""
+
+    def __init__(
+        self,
+        store: "ReservationStore",
+        in_flight_keys: list[str],
+        consumed_keys: list[str],
+        count: int,
+        slot: int | None,
+    ):
+        self.store = store
+        self.in_flight_keys = in_flight_keys
+        self.consumed_keys = consumed_keys
+        self.count = count
+        self.slot = slot
+        self.released = False
+
+    def release(self, successful: int = 0) -> None:
+        """
+        Give back the capacity of commands that have finished.
+
+        Scopes counted from CommandLog get all their in-flight capacity back,
+        because successful commands are counted from their log entries from
+        then on. Scopes only counted in the cache keep the successful commands
+        and are refunded the rest.
+
+        Args:
+            successful: Number of the reserved commands that succeeded
+        """
+        if self.released:
+            return
+        self.released = True
+        self.store.release(self, successful)
+
+
+class ReservationStore:
+    """Cache counters of admitted executions.
+
+    Admission increments the counters of every scope first and only then
+    checks the totals, backing out if any scope is over its limit. With atomic
+    cache increments, concurrent requests can't all pass a check that only one
+    of them fits in; at worst both back out and one retries.
+
+    Counters live in per-minute slots. In-flight slots expire after
+    ``timeout`` seconds, so reservations leaked by a crashed worker free
+    themselves. Consumed slots expire once they leave the rate limit window.
+    """
+
+    CACHE_PREFIX = "netbox_toolkit:rate_limit_reserved"
+    SLOT_SECONDS = 60
+
+    def __init__(self, timeout: int = 600):
+        self.timeout = max(self.SLOT_SECONDS, timeout)
+
+    def acquire(
+        self,
+        in_flight_keys: list[str],
+        consumed_keys: list[str],
+        count: int,
+        window_seconds: int,
+    ) -> RateLimitReservation:
+        """
+        Reserve capacity for ``count`` executions.
+
+        Args:
+            in_flight_keys: Scopes whose completed executions are counted from
+                CommandLog, so only running executions are held here
+            consumed_keys: Scopes counted only in the cache, which keep
+                successful executions for the whole window
+            count: Number of executions
+            window_seconds: Length of the rate limit window
+        """
+        slot = self._current_slot()
+        acquired = []
+        try:
+            for kind, keys, ttl in (
+                ("in_flight", in_flight_keys, self.timeout),
+                ("consumed", consumed_keys, window_seconds),
+            ):
+                for scope_key in keys:
+                    self._increment(
+                        self._slot_key(kind, scope_key, slot),
+                        count,
+                        ttl + self.SLOT_SECONDS,
+                    )
+                    acquired.append(self._slot_key(kind, scope_key, slot))
+        except Exception as e:
+            # Without the cache, admission falls back to completed executions
+            logger.warning("Could not reserve rate limit capacity: %s", e)
+            self._decrement(acquired, count)
+            return RateLimitReservation(self, [], [], count, None)
+
+        return RateLimitReservation(self, in_flight_keys, consumed_keys, count, slot)
+
+    def get_in_flight(self, scope_key: str) -> int:
+        """Get the number of admitted executions that haven't finished."""
+        return self._sum_slots("in_flight", scope_key, self.timeout)
+
+    def get_consumed(self, scope_key: str, window_seconds: int) -> int:
+        """Get the number of executions held in a cache-only scope."""
+        return self._sum_slots("consumed", scope_key, window_seconds)
+
+    def release(self, reservation: RateLimitReservation, successful: int) -> None:
+        if reservation.slot is None:
+            return
+
+        self._decrement(
+            [
+                self._slot_key("in_flight", scope_key, reservation.slot)
+                for scope_key in reservation.in_flight_keys
+            ],
+            reservation.count,
+        )
+        refund = max(0, reservation.count - successful)
+        if refund:
+            self._decrement(
+                [
+                    self._slot_key("consumed", scope_key, reservation.slot)
+                    for scope_key in reservation.consumed_keys
+                ],
+                refund,
+            )
+
+    def _sum_slots(self, kind: str, scope_key: str, horizon: int) -> int:
+        slot = self._current_slot()
+        oldest = slot - math.ceil(horizon / self.SLOT_SECONDS)
+        keys = [
+            self._slot_key(kind, scope_key, index) for index in range(oldest, slot + 1)
+        ]
+        try:
+            return max(0, sum(cache.get_many(keys).values()))
+        except Exception as e:
+            logger.warning("Could not read rate limit reservations: %s", e)
+            return 0
+
+    def _increment(self, key: str, count: int, ttl: int) -> None:
+        if not cache.add(key, count, ttl):
+            try:
+                cache.incr(key, count)
+            except ValueError:
+                # Expired between add() and incr()
+                cache.set(key, count, ttl)
+
+    def _decrement(self, keys: list[str], count: int) -> None:
+        for key in keys:
+            try:
+                cache.decr(key, count)
+            except ValueError:
+                pass  # Slot already expired
+            except Exception as e:
+                logger.warning("Could not release rate limit reservation: %s", e)
+
+    def _current_slot(self) -> int:
+        return int(time.time() // self.SLOT_SECONDS)
+
+    def _slot_key(self, kind: str, scope_key: str, slot: int) -> str:
+        return f"{self.CACHE_PREFIX}:{kind}:{scope_key}:{slot}"
@@ -4,6 +4,13 @@ from django.conf import settings
 from django.utils import timezone
 
 from ..models import CommandLog
+from .rate_limit_backends import (
+    CacheRateLimitBackend,
+    DatabaseRateLimitBackend,
+    RateLimitBackend,
+    RateLimitScope,
+    ReservationStore,
+)
 
 
 class RateLimitingService:
@@ -14,6 +21,14 @@ class RateLimitingService:
         self.plugin_settings = getattr(settings, "PLUGINS_CONFIG", {}).get(
             "netbox_toolkit_plugin", {}
         )
+        self.backend = self._create_backend()
+        self.reservations = ReservationStore(timeout=self.get_reservation_timeout())
+
+    def _create_backend(self) -> RateLimitBackend:
+        """Create the counter store selected by the rate_limit_backend setting"""
+        if self.get_rate_limit_backend() == "database":
+            return DatabaseRateLimitBackend()
+        return CacheRateLimitBackend()
 
     def is_rate_limiting_enabled(self):
         """Check if rate limiting is enabled in plugin settings"""
@@ -27,6 +42,22 @@ class RateLimitingService:
         """Get the time window in minutes for rate limiting"""
         return self.plugin_settings.get("time_window_minutes", 5)
 
+    def get_user_command_limit(self):
+        """Get the maximum number of commands a user may run across all devices within the time window (None for no limit)"""
+        return self.plugin_settings.get("user_command_limit")
+
+    def get_global_command_limit(self):
+        """Get the maximum number of commands allowed across all devices within the time window (None for no limit)"""
+        return self.plugin_settings.get("global_command_limit")
+
+    def get_reservation_timeout(self):
+        """Get how many seconds an unreleased reservation is held before it expires"""
+        return self.plugin_settings.get("rate_limit_reservation_timeout", 600)
+
+    def get_rate_limit_backend(self):
+        """Get the counter store used for rate limiting ('cache' or 'database')"""
+        return self.plugin_settings.get("rate_limit_backend", "cache")
+
     def get_bypass_users(self):
         """Get list of usernames that bypass rate limiting"""
         return self.plugin_settings.get("bypass_users", [])
@@ -70,19 +101,162 @@ class RateLimitingService:
         Returns:
             int: Number of recent successful commands
         """
+        if not user:
+            current_count, _reset_at = self._get_usage(device)
+            return current_count
+
+        # Per-user counts aren't tracked by the counter store
         time_window = self.get_time_window_minutes()
         cutoff_time = timezone.now() - timedelta(minutes=time_window)
 
-        query = CommandLog.objects.filter(
+        return CommandLog.objects.filter(
             device=device,
             execution_time__gte=cutoff_time,
             success=True,  # Only count successful commands
+            username=user.username,
+        ).count()
+
+    def record_successful_execution(self, device, executed_at):
+        """
+        Count a successful command execution towards the rate limits
+
+        Args:
+            device: Device object the command ran on
+            executed_at: When the execution was logged
+        """
+        if not self.is_rate_limiting_enabled():
+            return
+
+        scopes = [
+            scope for scope, _limit in self._get_limited_scopes(device) if scope.logged
+        ]
+        self.backend.record_success(
+            scopes, executed_at, self.get_time_window_minutes() * 60
+        )
+
+    def reserve(self, device, user, count=1):
+        """
+        Reserve rate limit capacity for commands before connecting to the device
+
+        The device, user and global limits are checked together. Capacity is
+        held until the reservation is released, so concurrent requests can't
+        all pass the check and then overrun the device. Always release the
+        reservation with the number of successful commands once they have
+        finished, so the capacity of failed commands is refunded.
+
+        Args:
+            device: Device object the commands will run on
+            user: User object running the commands
+            count: Number of commands to reserve capacity for
+
+        Returns:
+            dict: The same keys as check_rate_limit, plus 'reservation' holding
+            a RateLimitReservation to release, or None if nothing was reserved
+        """
+        if not self.is_rate_limiting_enabled() or self.user_bypasses_rate_limiting(
+            user
+        ):
+            result = self.check_rate_limit(device, user)
+            result["reservation"] = None
+            return result
+
+        scopes = self._get_limited_scopes(device, user)
+        reservation = self.reservations.acquire(
+            in_flight_keys=[scope.key for scope, _limit in scopes if scope.logged],
+            consumed_keys=[scope.key for scope, _limit in scopes if not scope.logged],
+            count=count,
+            window_seconds=self.get_time_window_minutes() * 60,
         )
 
-        if user:
-            query = query.filter(username=user.username)
+        # The in-flight counts now include this reservation
+        result = self._evaluate_scopes(scopes, pending=0)
+        if not result["allowed"]:
+            reservation.release()
+            result["reservation"] = None
+            return result
+
+        result["reservation"] = reservation
+        return result
+
+    def _get_limited_scopes(self, device, user=None):
+        """Get (scope, limit) pairs for every limit that applies to an execution"""
+        scopes = [(self._get_device_scope(device), self.get_device_command_limit())]
+
+        user_limit = self.get_user_command_limit()
+        if user is not None and user_limit is not None:
+            # CommandLog records the device login rather than the NetBox user,
+            # so per-user usage is only tracked by reservations
+            scopes.append((
+                RateLimitScope(
+                    key=f"user:{user.pk}", label=f"user {user.username}", logged=False
+                ),
+                user_limit,
+            ))
+
+        global_limit = self.get_global_command_limit()
+        if global_limit is not None:
+            scopes.append((
+                RateLimitScope(key="global", label="all devices"),
+                global_limit,
+            ))
+
+        return scopes
+
+    def _get_device_scope(self, device):
+        """Get the scope of executions on one device"""
+        return RateLimitScope(
+            key=f"device:{device.pk}",
+            label=f"device {device}",
+            filters={"device_id": device.pk},
+        )
+
+    def _evaluate_scopes(self, scopes, pending):
+        """
+        Check scopes against their limits, counting completed and in-flight commands
+
+        Args:
+            scopes: (scope, limit) pairs from _get_limited_scopes
+            pending: Commands about to run that aren't reserved yet
+
+        Returns:
+            dict: check_rate_limit result for the first scope over its limit,
+            or for the device scope if every scope is within its limit
+        """
+        time_window = self.get_time_window_minutes()
+        results = []
+        for scope, limit in scopes:
+            if scope.logged:
+                completed, _reset_at = self.backend.get_usage(scope, time_window * 60)
+                current_count = completed + self.reservations.get_in_flight(scope.key)
+            else:
+                current_count = self.reservations.get_consumed(
+                    scope.key, time_window * 60
+                )
+
+            if current_count + pending > limit:
+                return {
+                    "allowed": False,
+                    "current_count": current_count,
+                    "limit": limit,
+                    "time_window_minutes": time_window,
+                    "reason": f"Rate limit exceeded for {scope.label}: {current_count}/{limit} commands in last {time_window} minutes",
+                }
+            results.append((current_count, limit))
+
+        current_count, limit = results[0]
+        return {
+            "allowed": True,
+            "current_count": current_count,
+            "limit": limit,
+            "time_window_minutes": time_window,
+            "reason": "Within rate limits",
+        }
 
-        return query.count()
+    def _get_usage(self, device):
+        """Get (count, reset_at) for the device's recent successful commands"""
+        return self.backend.get_usage(
+            self._get_device_scope(device), self.get_time_window_minutes() * 60
+        )
 
     def check_rate_limit(self, device, user):
         """
@@ -121,27 +295,8 @@ class RateLimitingService:
                 "reason": "User bypasses rate limiting",
             }
 
-        # Check current command count
-        current_count = self.get_recent_command_count(device)
-        limit = self.get_device_command_limit()
-        time_window = self.get_time_window_minutes()
-
-        if current_count >= limit:
-            return {
-                "allowed": False,
-                "current_count": current_count,
-                "limit": limit,
-                "time_window_minutes": time_window,
-                "reason": f"Rate limit exceeded: {current_count}/{limit} successful commands in last {time_window} minutes",
-            }
-
-        return {
-            "allowed": True,
-            "current_count": current_count,
-            "limit": limit,
-            "time_window_minutes": time_window,
-            "reason": "Within rate limits",
-        }
+        # Check completed and in-flight commands against every limit
+        return self._evaluate_scopes(self._get_limited_scopes(device, user), pending=1)
 
     def get_rate_limit_status(self, device, user):
         """
@@ -164,16 +319,17 @@ class RateLimitingService:
                 "message": "You have unlimited command execution (bypass enabled)",
             }
 
-        current_count = self.get_recent_command_count(device)
+        current_count, reset_at = self._get_usage(device)
         limit = self.get_device_command_limit()
         time_window = self.get_time_window_minutes()
         remaining = max(0, limit - current_count)
+        time_until_reset = (
+            self._time_until(reset_at) if current_count >= limit else None
+        )
 
         # Determine status and appropriate message
         if current_count >= limit:
             status = "exceeded"
-            # Get time until reset for exceeded status
-            time_until_reset = self.get_time_until_reset(device)
             if time_until_reset:
                 minutes_until_reset = int(time_until_reset.total_seconds() / 60) + 1
                 message = f"Rate limit exceeded! ({current_count}/{limit} successful commands) - Try again in {minutes_until_reset} minutes"
@@ -199,9 +355,7 @@ class RateLimitingService:
             "message": message,
             "is_exceeded": current_count >= limit,
             "is_warning": remaining <= 2 and current_count < limit,
-            "time_until_reset": self.get_time_until_reset(device)
-            if current_count >= limit
-            else None,
+            "time_until_reset": time_until_reset,
         }
 
     def get_time_until_reset(self, device):
@@ -214,23 +368,13 @@ class RateLimitingService:
         Returns:
             timedelta or None: Time until oldest successful command expires, None if no recent successful commands
         """
-        time_window = self.get_time_window_minutes()
-        cutoff_time = timezone.now() - timedelta(minutes=time_window)
+        _current_count, reset_at = self._get_usage(device)
+        return self._time_until(reset_at)
 
-        oldest_command = (
-            CommandLog.objects.filter(
-                device=device,
-                execution_time__gte=cutoff_time,
-                success=True,  # Only consider successful commands
-            )
-            .order_by("execution_time")
-            .first()
-        )
-
-        if not oldest_command:
+    def _time_until(self, reset_at):
+        """Get the positive time remaining until reset_at, or None"""
+        if reset_at is None:
             return None
 
-        reset_time = oldest_command.execution_time + timedelta(minutes=time_window)
-        time_until_reset = reset_time - timezone.now()
-
+        time_until_reset = reset_at - timezone.now()
         return time_until_reset if time_until_reset > timedelta(0) else None
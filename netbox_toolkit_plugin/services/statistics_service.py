@@ -0,0 +1,351 @@
+"""Service for command execution statistics backed by hourly rollups."""
+
+import hashlib
+from datetime import datetime, timedelta
+from datetime import timezone as dt_timezone
+from typing import Any
+
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, Max, Min, Q, QuerySet, Sum
+from django.db.models.functions import SHA256, Greatest, Least, TruncHour
+from django.utils import timezone
+
+from ..models import CommandLog, CommandLogErrorRollup, CommandLogRollup
+from ..utils.logging import get_toolkit_logger
+
+logger = get_toolkit_logger(__name__)
+
+
+class CommandStatisticsService:
+    """Maintain hourly rollups of CommandLog and read statistics from them.
+
+    Each log is added to its hour's rollup rows when it is written and
+    removed when it is deleted, so the dashboard reads a few rows per hour of
+    history instead of aggregating the whole log table. Deleting a log can't
+    shrink the duration minimum and maximum, and edits to existing logs are
+    not tracked; rebuild() recomputes hours from CommandLog to correct both.
+    """
+
+    def record(self, log: CommandLog) -> None:
+        """Add a newly written command log to the rollups."""
+        self._apply(log, 1)
+
+    def discard(self, log: CommandLog) -> None:
+        """Remove a deleted command log from the rollups."""
+        self._apply(log, -1)
+
+    def rebuild(
+        self,
+        start: datetime | None = None,
+        end: datetime | None = None,
+        batch_size: int = 1000,
+    ) -> int:
+        """
+        Recompute the rollups of a range of hours from CommandLog.
+
+        Args:
+            start: Rebuild from the hour containing this time (default: all history)
+            end: Rebuild up to the hour containing this time (default: now)
+            batch_size: Rows to insert per query
+
+        Returns:
+            Number of rollup rows written
+        """
+        logs = CommandLog.objects.all()
+        rollups = CommandLogRollup.objects.all()
+        error_rollups = CommandLogErrorRollup.objects.all()
+        if start is not None:
+            start = self._hour(start)
+            logs = logs.filter(execution_time__gte=start)
+            rollups = rollups.filter(hour__gte=start)
+            error_rollups = error_rollups.filter(hour__gte=start)
+        if end is not None:
+            end = self._hour(end) + timedelta(hours=1)
+            logs = logs.filter(execution_time__lt=end)
+            rollups = rollups.filter(hour__lt=end)
+            error_rollups = error_rollups.filter(hour__lt=end)
+
+        hour = TruncHour("execution_time", tzinfo=dt_timezone.utc)
+        totals = (
+            logs
+            .values("command_id", "device_id", "success", bucket=hour)
+            .annotate(
+                platform_id=Max("device__platform_id"),
+                count=Count("pk"),
+                duration_count=Count("execution_duration"),
+                duration_sum=Sum("execution_duration"),
+                duration_min=Min("execution_duration"),
+                duration_max=Max("execution_duration"),
+            )
+            .order_by()
+        )
+        errors = (
+            logs
+            .exclude(error_message="")
+            .values(bucket=hour, error_digest=SHA256("error_message"))
+            .annotate(message=Max("error_message"), count=Count("pk"))
+            .order_by()
+        )
+
+        with transaction.atomic():
+            rollups.delete()
+            error_rollups.delete()
+            written = self._bulk_create(
+                CommandLogRollup,
+                (
+                    CommandLogRollup(
+                        hour=row["bucket"],
+                        command_id=row["command_id"],
+                        device_id=row["device_id"],
+                        platform_id=row["platform_id"],
+                        success=row["success"],
+                        count=row["count"],
+                        duration_count=row["duration_count"],
+                        duration_sum=row["duration_sum"] or 0,
+                        duration_min=row["duration_min"],
+                        duration_max=row["duration_max"],
+                    )
+                    for row in totals.iterator(chunk_size=batch_size)
+                ),
+                batch_size,
+            )
+            written += self._bulk_create(
+                CommandLogErrorRollup,
+                (
+                    CommandLogErrorRollup(
+                        hour=row["bucket"],
+                        error_digest=row["error_digest"],
+                        error_message=row["message"],
+                        count=row["count"],
+                    )
+                    for row in errors.iterator(chunk_size=batch_size)
+                ),
+                batch_size,
+            )
+
+        logger.info("Rebuilt %s command log rollup rows", written)
+        return written
+
+    def get_statistics(self, queryset: QuerySet | None = None) -> dict[str, Any]:
+        """
+        Get the command execution statistics shown on the dashboard.
+
+        Args:
+            queryset: CommandLog queryset visible to the user. Rollups cover
+                every log, so a queryset narrowed by permission constraints is
+                aggregated directly instead.
+
+        Returns:
+            Dictionary with total_logs, success_rate, last_24h, top_commands
+            and common_errors
+        """
+        if queryset is not None and queryset.query.where:
+            return self._get_log_statistics(queryset)
+
+        totals = CommandLogRollup.objects.aggregate(
+            total=Sum("count"), successful=Sum("count", filter=Q(success=True))
+        )
+        total_logs = totals["total"] or 0
+        successful_logs = totals["successful"] or 0
+
+        # Whole hours come from the rollups, the partial oldest hour from the logs
+        cutoff = timezone.now() - timedelta(hours=24)
+        first_hour = self._hour(cutoff)
+        if first_hour < cutoff:
+            first_hour += timedelta(hours=1)
+        recent = CommandLogRollup.objects.filter(hour__gte=first_hour).aggregate(
+            total=Sum("count"), successful=Sum("count", filter=Q(success=True))
+        )
+        partial = CommandLog.objects.filter(
+            execution_time__gte=cutoff, execution_time__lt=first_hour
+        ).aggregate(total=Count("pk"), successful=Count("pk", filter=Q(success=True)))
+        recent_total = (recent["total"] or 0) + partial["total"]
+        recent_successful = (recent["successful"] or 0) + partial["successful"]
+
+        top_commands = (
+            CommandLogRollup.objects
+            .values("command__name")
+            .annotate(total=Sum("count"))
+            .order_by("-total")
+            .values_list("command__name", "total")[:10]
+        )
+        common_errors = (
+            CommandLogErrorRollup.objects
+            .values("error_digest")
+            .annotate(message=Max("error_message"), total=Sum("count"))
+            .order_by("-total")
+            .values_list("message", "total")[:10]
+        )
+
+        return self._format_statistics(
+            total_logs,
+            successful_logs,
+            recent_total,
+            recent_successful,
+            top_commands,
+            common_errors,
+        )
+
+    def _get_log_statistics(self, queryset: QuerySet) -> dict[str, Any]:
+        """Aggregate statistics straight from a CommandLog queryset."""
+        total_logs = queryset.count()
+        successful_logs = queryset.filter(success=True).count()
+
+        recent_logs = queryset.filter(
+            execution_time__gte=timezone.now() - timedelta(hours=24)
+        )
+        recent_total = recent_logs.count()
+        recent_successful = recent_logs.filter(success=True).count()
+
+        top_commands = (
+            queryset
+            .values("command__name")
+            .annotate(count=Count("command"))
+            .order_by("-count")
+            .values_list("command__name", "count")[:10]
+        )
+        common_errors = (
+            queryset
+            .filter(~Q(error_message=""), ~Q(error_message__isnull=True))
+            .values("error_message")
+            .annotate(count=Count("error_message"))
+            .order_by("-count")
+            .values_list("error_message", "count")[:10]
+        )
+
+        return self._format_statistics(
+            total_logs,
+            successful_logs,
+            recent_total,
+            recent_successful,
+            top_commands,
+            common_errors,
+        )
+
+    def _format_statistics(
+        self,
+        total_logs: int,
+        successful_logs: int,
+        recent_total: int,
+        recent_successful: int,
+        top_commands: QuerySet,
+        common_errors: QuerySet,
+    ) -> dict[str, Any]:
+        """Shape totals and (name, count) rows into the statistics dictionary."""
+        success_rate = (successful_logs / total_logs * 100) if total_logs > 0 else 0
+
+        return {
+            "total_logs": total_logs,
+            "success_rate": round(success_rate, 2),
+            "last_24h": {
+                "total": recent_total,
+                "successful": recent_successful,
+                "failed": recent_total - recent_successful,
+            },
+            "top_commands": [
+                {"command_name": name, "count": count} for name, count in top_commands
+            ],
+            "common_errors": [
+                {"error": message[:100], "count": count}
+                for message, count in common_errors
+            ],
+        }
+
+    def _apply(self, log: CommandLog, sign: int) -> None:
+        """Add (sign=1) or remove (sign=-1) a log's contribution to its hour."""
+        hour = self._hour(log.execution_time)
+        duration = log.execution_duration
+        has_duration = int(duration is not None)
+
+        try:
+            # A savepoint keeps a failed update from breaking the caller's
+            # transaction, which is usually the one writing the log
+            with transaction.atomic():
+                self._upsert(
+                    CommandLogRollup,
+                    {
+                        "hour": hour,
+                        "command_id": log.command_id,
+                        "device_id": log.device_id,
+                        "success": log.success,
+                    },
+                    sign,
+                    {
+                        "count": F("count") + sign,
+                        "duration_count": F("duration_count") + sign * has_duration,
+                        "duration_sum": F("duration_sum") + sign * (duration or 0),
+                        **(
+                            {
+                                "duration_min": Least("duration_min", duration),
+                                "duration_max": Greatest("duration_max", duration),
+                            }
+                            if sign > 0 and duration is not None
+                            else {}
+                        ),
+                    },
+                    {
+                        "platform_id": log.device.platform_id,
+                        "count": 1,
+                        "duration_count": has_duration,
+                        "duration_sum": duration or 0,
+                        "duration_min": duration,
+                        "duration_max": duration,
+                    },
+                )
+
+                if log.error_message:
+                    self._upsert(
+                        CommandLogErrorRollup,
+                        {
+                            "hour": hour,
+                            "error_digest": hashlib.sha256(
+                                log.error_message.encode()
+                            ).hexdigest(),
+                        },
+                        sign,
+                        {"count": F("count") + sign},
+                        {"error_message": log.error_message, "count": 1},
+                    )
+        except Exception as e:
+            logger.warning("Could not update command log rollups: %s", str(e))
+
+    def _upsert(
+        self,
+        model: type,
+        key: dict[str, Any],
+        sign: int,
+        increments: dict[str, Any],
+        initial: dict[str, Any],
+    ) -> None:
+        """Apply increments to a rollup row, creating it for a first addition."""
+        rows = model.objects.filter(**key)
+        if sign < 0:
+            rows.update(**increments)
+            rows.filter(count__lte=0).delete()
+            return
+
+        if rows.update(**increments):
+            return
+        try:
+            with transaction.atomic():
+                model.objects.create(**key, **initial)
+        except IntegrityError:
+            # Another worker created the row first
+            rows.update(**increments)
+
+    def _bulk_create(self, model: type, objects, batch_size: int) -> int:
+        written = 0
+        batch = []
+        for obj in objects:
+            batch.append(obj)
+            if len(batch) >= batch_size:
+                written += len(model.objects.bulk_create(batch))
+                batch = []
+        if batch:
+            written += len(model.objects.bulk_create(batch))
+        return written
+
+    def _hour(self, moment: datetime) -> datetime:
+        return moment.astimezone(dt_timezone.utc).replace(
+            minute=0, second=0, microsecond=0
+        )
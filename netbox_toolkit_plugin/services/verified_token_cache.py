@@ -0,0 +1,165 @@
+"""Short-lived cache of successfully verified credential tokens."""
+
+import threading
+import time
+from collections import OrderedDict
+
+from django.core.cache import cache
+
+from ..settings import ToolkitSettings
+from ..utils.logging import get_toolkit_logger
+
+logger = get_toolkit_logger(__name__)
+
+
+class VerifiedTokenCache:
+    """Remember which credential set a token was verified for.
+
+    Automation clients reuse the same token for many calls, and each
+    verification runs Argon2id. After one successful verification the token
+    fingerprint and user id map to the credential set id for ``ttl`` seconds.
+    Only the id is cached - never the token or decrypted credentials.
+
+    Entries are checked against a per-credential-set generation counter.
+    Bumping the counter (on save, token regeneration or delete) invalidates
+    every cached token for that set. Without ``use_django_cache`` the counters
+    are per process, so other workers keep their entries until ``ttl``
+    expires; callers must re-check the stored token fingerprint on a hit so a
+    regenerated token isn't accepted in the meantime. With
+    ``use_django_cache`` the entries and counters are shared by all workers,
+    so an invalidation in one process is seen by the others.
+    """
+
+    CACHE_PREFIX = "netbox_toolkit:verified_token"
+
+    def __init__(
+        self, ttl: int = 60, max_entries: int = 1024, use_django_cache: bool = False
+    ):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.use_django_cache = use_django_cache
+        # (fingerprint, user id) -> (credential set id, generation, expires at)
+        self._entries: OrderedDict[tuple[str, int], tuple[int, int, float]] = (
+            OrderedDict()
+        )
+        self._generations: dict[int, int] = {}
+        self._lock = threading.Lock()
+
+    def get(self, fingerprint: str, user_id: int) -> int | None:
+        """
+        Get the credential set a token was recently verified for.
+
+        Args:
+            fingerprint: Token fingerprint from fingerprint_token()
+            user_id: ID of the user presenting the token
+
+        Returns:
+            Credential set ID, or None if there is no valid entry
+        """
+        key = (fingerprint, user_id)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[2] <= time.monotonic():
+                del self._entries[key]
+                entry = None
+
+        if entry is None and self.use_django_cache:
+            shared_entry = cache.get(self._entry_key(fingerprint, user_id))
+            if shared_entry is not None:
+                entry = (*shared_entry, time.monotonic() + self.ttl)
+
+        if entry is None:
+            return None
+
+        credential_set_id, generation, _expires_at = entry
+        if generation != self._get_generation(credential_set_id):
+            self._discard(key)
+            return None
+
+        return credential_set_id
+
+    def set(self, fingerprint: str, user_id: int, credential_set_id: int) -> None:
+        """Remember that a token was verified for a credential set."""
+        generation = self._get_generation(credential_set_id)
+        key = (fingerprint, user_id)
+
+        with self._lock:
+            self._entries[key] = (
+                credential_set_id,
+                generation,
+                time.monotonic() + self.ttl,
+            )
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+        if self.use_django_cache:
+            cache.set(
+                self._entry_key(fingerprint, user_id),
+                (credential_set_id, generation),
+                self.ttl,
+            )
+
+    def invalidate_credential_set(self, credential_set_id: int) -> None:
+        """Invalidate every cached token for a credential set."""
+        logger.debug(
+            "Invalidating verified tokens for credential set %s", credential_set_id
+        )
+        with self._lock:
+            self._generations[credential_set_id] = (
+                self._generations.get(credential_set_id, 0) + 1
+            )
+
+        if self.use_django_cache:
+            generation_key = self._generation_key(credential_set_id)
+            try:
+                cache.incr(generation_key)
+            except ValueError:
+                # No counter yet - start one above any generation already cached
+                cache.set(generation_key, 1, None)
+
+    def clear(self) -> None:
+        """Forget every locally cached token."""
+        with self._lock:
+            self._entries.clear()
+
+    def _get_generation(self, credential_set_id: int) -> int:
+        if self.use_django_cache:
+            return cache.get(self._generation_key(credential_set_id), 0)
+        with self._lock:
+            return self._generations.get(credential_set_id, 0)
+
+    def _discard(self, key: tuple[str, int]) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+        if self.use_django_cache:
+            cache.delete(self._entry_key(*key))
+
+    def _entry_key(self, fingerprint: str, user_id: int) -> str:
+        return f"{self.CACHE_PREFIX}:{user_id}:{fingerprint}"
+
+    def _generation_key(self, credential_set_id: int) -> str:
+        return f"{self.CACHE_PREFIX}:generation:{credential_set_id}"
+
+
+_token_cache: VerifiedTokenCache | None = None
+_token_cache_lock = threading.Lock()
+
+
+def get_verified_token_cache() -> VerifiedTokenCache | None:
+    """Get the process-wide verified token cache, or None if it is disabled."""
+    global _token_cache
+
+    cache_config = ToolkitSettings.get_verified_token_cache_config()
+    if not cache_config.get("enabled", True):
+        return None
+
+    if _token_cache is None:
+        with _token_cache_lock:
+            if _token_cache is None:
+                _token_cache = VerifiedTokenCache(
+                    ttl=cache_config["ttl"],
+                    max_entries=cache_config["max_entries"],
+                    use_django_cache=cache_config["use_django_cache"],
+                )
+    return _token_cache
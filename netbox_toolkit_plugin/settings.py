@@ -53,6 +53,13 @@ class ToolkitSettings:
         "master_key_derivation": "argon2id",  # Use Argon2id instead of PBKDF2
     }
 
+    # Limits for concurrent Argon2 hashing, which allocates memory_cost per call
+    ARGON2_EXECUTOR_CONFIG = {
+        "memory_budget_mb": 256,  # Memory allowed for concurrent Argon2 operations
+        "max_queue": 32,  # Operations allowed to wait before new ones are rejected
+        "queue_timeout": 10,  # Seconds an operation may wait for a free slot
+    }
+
     # SSH transport options
     SSH_TRANSPORT_OPTIONS = {
         "disabled_algorithms": {
@@ -93,6 +100,96 @@ class ToolkitSettings:
         "backoff_multiplier": 1.5,  # Reduced from 2 to 1.5 for faster progression
     }
 
+    # Per-device timeouts derived from observed latencies
+    ADAPTIVE_TIMEOUT_CONFIG = {
+        "enabled": True,
+        "min_samples": 5,  # Samples needed before adaptive timeouts are used
+        "window": 50,  # Recent samples kept per metric for the p95
+        "ewma_alpha": 0.3,  # Weight of the newest sample in the moving average
+        "multiplier": 3.0,  # Headroom applied to the slower of p95 and average
+        "retry_growth": 1.5,  # Timeout growth per retry after banner/timeout errors
+        "min_socket": 5,
+        "max_socket": 60,
+        "min_transport": 5,
+        "max_transport": 60,
+        # Ops timeouts only grow past the platform's static timeout, since one
+        # device's op samples mix quick and slow commands
+        "min_ops": 10,
+        "max_ops": 300,
+    }
+
+    # Short-lived cache of verified credential tokens
+    VERIFIED_TOKEN_CACHE_CONFIG = {
+        "enabled": True,
+        "ttl": 60,  # Seconds a verified token is trusted without re-verifying
+        "max_entries": 1024,  # Tokens kept in memory per worker process
+        # Share entries and invalidations across workers; per process, other
+        # workers only drop an invalidated entry when its ttl expires
+        "use_django_cache": False,
+    }
+
+    # Persistent session pool configuration
+    CONNECTION_POOL_CONFIG = {
+        "enabled": True,
+        "max_size": 32,  # Maximum idle sessions kept open per worker process
+        "idle_timeout": 120,  # Seconds an idle session is kept before eviction
+    }
+
+    # Caching of the pre-connection reachability probe, per (host, port)
+    REACHABILITY_CACHE_CONFIG = {
+        "enabled": True,
+        "positive_ttl": 30,  # Seconds a successful probe is trusted
+        "negative_ttl": 10,  # Seconds an unreachable result is returned without probing
+        "trust_recent_sessions": True,  # Skip the probe after a successful SSH session
+        "session_ttl": 300,  # Seconds a successful session is trusted
+    }
+
+    # Caching of Netmiko auto-detected device types for unmapped platforms
+    DEVICE_TYPE_CACHE_CONFIG = {
+        "enabled": True,
+        "ttl": 604800,  # Seconds a detected device_type is kept (7 days)
+    }
+
+    # Per-process cache of resolved and compiled TextFSM templates
+    TEXTFSM_TEMPLATE_CACHE_CONFIG = {
+        "enabled": True,
+        "max_entries": 1024,  # (platform, command) lookups kept per worker process
+    }
+
+    # Structured output parsers, see the parsers package
+    PARSERS_CONFIG = {
+        "default_order": [
+            "textfsm"
+        ],  # Parsers tried for commands without their own order
+        "max_cached_templates": 256,  # Compiled TTP templates and Genie lookups per process
+    }
+
+    # Worker processes for parsing large outputs off the request thread
+    PARSE_EXECUTOR_CONFIG = {
+        "enabled": False,
+        "size_threshold": 1048576,  # Output characters at which parsing is moved off-thread
+        "max_workers": 2,  # Parse processes per worker process
+        "max_pending": 8,  # Parses queued or running before large outputs go unparsed
+        "timeout": 60,  # Seconds a single parse may run
+        # multiprocessing start method for the parse processes; "fork" from a
+        # multi-threaded web worker can deadlock a child on inherited locks
+        "start_method": "forkserver",
+    }
+
+    # Remember which connector library last worked for each device
+    CONNECTOR_AFFINITY_CONFIG = {
+        "enabled": True,
+        "ttl": 86400,  # Seconds a remembered connector is kept
+        "reprobe_interval": 3600,  # Seconds between retries of the primary connector
+    }
+
+    # Concurrency limits for the bulk execution API
+    BULK_EXECUTION_CONFIG = {
+        "max_workers": 8,  # Executions running at once across all devices
+        "per_device_concurrency": 1,  # Executions running at once per device
+        "async_max_concurrency": 100,  # Device sessions per event loop (async service)
+    }
+
     # Fast connection test timeouts (for initial Scrapli viability testing)
     FAST_TEST_TIMEOUTS = {
         "socket": 8,  # Reduced from 15s to 8s for faster detection
@@ -256,6 +353,115 @@ class ToolkitSettings:
         )
         return {**cls.NETMIKO_CONFIG, **user_config.get("netmiko", {})}
 
+    @classmethod
+    def get_adaptive_timeout_config(cls) -> dict[str, Any]:
+        """Get adaptive per-device timeout configuration."""
+        user_config = getattr(settings, "PLUGINS_CONFIG", {}).get(
+            "netbox_toolkit_plugin", {}
+        )
+        return {
+            **cls.ADAPTIVE_TIMEOUT_CONFIG,
+            **user_config.get("adaptive_timeouts", {}),
+        }
+
+    @classmethod
+    def get_verified_token_cache_config(cls) -> dict[str, Any]:
+        """Get verified credential token cache configuration."""
+        user_config = getattr(settings, "PLUGINS_CONFIG", {}).get(
+            "netbox_toolkit_plugin", {}
+        )
+        return {
+            **cls.VERIFIED_TOKEN_CACHE_CONFIG,
+            **user_config.get("verified_token_cache", {}),
+        }
+
+    @classmethod
+    def get_connection_pool_config(cls) -> dict[str, Any]:
+        """Get session pool configuration for persistent device connections."""
+        user_config = getattr(settings, "PLUGINS_CONFIG", {}).get(
+            "netbox_toolkit_plugin", {}
+        )
+        return {**cls.CONNECTION_POOL_CONFIG, **user_config.get("connection_pool", {})}
+
+    @classmethod
+    def get_reachability_cache_config(cls) -> dict[str, Any]:
+        """Get reachability probe cache configuration."""
+        user_config = getattr(settings, "PLUGINS_CONFIG", {}).get(
+            "netbox_toolkit_plugin", {}
+        )
+        return {
+            **cls.REACHABILITY_CACHE_CONFIG,
+            **user_config.get("reachability_cache", {}),
+        }
+
+    @classmethod
+    def get_device_type_cache_config(cls) -> dict[str, Any]:
+        """Get Netmiko auto-detected device type cache configuration."""
+        user_config = getattr(settings, "PLUGINS_CONFIG", {}).get(
+            "netbox_toolkit_plugin", {}
+        )
+        return {
+            **cls.DEVICE_TYPE_CACHE_CONFIG,
+            **user_config.get("device_type_cache", {}),
+        }
+
+    @classmethod
+    def get_textfsm_template_cache_config(cls) -> dict[str, Any]:
+        """Get TextFSM template cache configuration."""
+        user_config = getattr(settings, "PLUGINS_CONFIG", {}).get(
+            "netbox_toolkit_plugin", {}
+        )
+        return {
+            **cls.TEXTFSM_TEMPLATE_CACHE_CONFIG,
+            **user_config.get("textfsm_template_cache", {}),
+        }
+
+    @classmethod
+    def get_parsers_config(cls) -> dict[str, Any]:
+        """Get structured output parser configuration."""
+        user_config = getattr(settings, "PLUGINS_CONFIG", {}).get(
+            "netbox_toolkit_plugin", {}
+        )
+        return {**cls.PARSERS_CONFIG, **user_config.get("parsers", {})}
+
+    @classmethod
+    def get_parse_executor_config(cls) -> dict[str, Any]:
+        """Get off-thread parse executor configuration."""
+        user_config = getattr(settings, "PLUGINS_CONFIG", {}).get(
+            "netbox_toolkit_plugin", {}
+        )
+        return {**cls.PARSE_EXECUTOR_CONFIG, **user_config.get("parse_executor", {})}
+
+    @classmethod
+    def get_connector_affinity_config(cls) -> dict[str, Any]:
+        """Get per-device connector affinity configuration."""
+        user_config = getattr(settings, "PLUGINS_CONFIG", {}).get(
+            "netbox_toolkit_plugin", {}
+        )
+        return {
+            **cls.CONNECTOR_AFFINITY_CONFIG,
+            **user_config.get("connector_affinity", {}),
+        }
+
+    @classmethod
+    def get_bulk_execution_config(cls) -> dict[str, Any]:
+        """Get concurrency limits for bulk command execution."""
+        user_config = getattr(settings, "PLUGINS_CONFIG", {}).get(
+            "netbox_toolkit_plugin", {}
+        )
+        return {**cls.BULK_EXECUTION_CONFIG, **user_config.get("bulk_execution", {})}
+
+    @classmethod
+    def get_argon2_executor_config(cls) -> dict[str, Any]:
+        """Get concurrency limits for Argon2 hashing and verification."""
+        user_config = getattr(settings, "PLUGINS_CONFIG", {}).get(
+            "netbox_toolkit_plugin", {}
+        )
+        return {
+            **cls.ARGON2_EXECUTOR_CONFIG,
+            **user_config.get("argon2_executor", {}),
+        }
+
     @classmethod
     def get_security_config(cls) -> dict[str, Any]:
         """Get security configuration for credential encryption."""
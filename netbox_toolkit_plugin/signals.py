@@ -0,0 +1,43 @@
+"""Signal handlers for the Toolkit plugin."""
+
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import CommandLog, DeviceCredentialSet
+from .services.statistics_service import CommandStatisticsService
+from .services.verified_token_cache import get_verified_token_cache
+
+# Saves that only touch these fields don't affect which tokens are valid
+TOKEN_NEUTRAL_FIELDS = frozenset({"last_used", "access_token_fingerprint"})
+
+
+@receiver(post_save, sender=DeviceCredentialSet)
+def invalidate_verified_tokens_on_save(sender, instance, update_fields=None, **kwargs):
+    """Drop cached token verifications when a credential set changes."""
+    if update_fields and set(update_fields) <= TOKEN_NEUTRAL_FIELDS:
+        return
+
+    token_cache = get_verified_token_cache()
+    if token_cache is not None:
+        token_cache.invalidate_credential_set(instance.pk)
+
+
+@receiver(post_delete, sender=DeviceCredentialSet)
+def invalidate_verified_tokens_on_delete(sender, instance, **kwargs):
+    """Drop cached token verifications when a credential set is deleted."""
+    token_cache = get_verified_token_cache()
+    if token_cache is not None:
+        token_cache.invalidate_credential_set(instance.pk)
+
+
+@receiver(post_save, sender=CommandLog)
+def add_command_log_to_rollups(sender, instance, created, raw=False, **kwargs):
+    """Count a new command log in the statistics rollups."""
+    if created and not raw:
+        CommandStatisticsService().record(instance)
+
+
+@receiver(post_delete, sender=CommandLog)
+def remove_command_log_from_rollups(sender, instance, **kwargs):
+    """Remove a deleted command log from the statistics rollups."""
+    CommandStatisticsService().discard(instance)
@@ -98,13 +98,11 @@ class DeviceCredentialSetTable(NetBoxTable):
     )
     platforms = tables.TemplateColumn(
         template_code="""
-        {% if record.platforms.exists %}
-            {% for platform in record.platforms.all %}
-                <a href="{{ platform.get_absolute_url }}">{{ platform }}</a>{% if not forloop.last %}, {% endif %}
-            {% endfor %}
-        {% else %}
+        {% for platform in record.platforms.all %}
+            <a href="{{ platform.get_absolute_url }}">{{ platform }}</a>{% if not forloop.last %}, {% endif %}
+        {% empty %}
             <em>All platforms</em>
-        {% endif %}
+        {% endfor %}
         """,
         verbose_name="Platforms",
         orderable=False,
@@ -162,3 +160,10 @@ class DeviceCredentialSetTable(NetBoxTable):
         logger.debug(
             f"DeviceCredentialSetTable Meta default_columns: {self.Meta.default_columns}"
         )
+
+    def paginate(self, *args, **kwargs):
+        super().paginate(*args, **kwargs)
+        # Decrypt the tokens shown on this page in one batch rather than per row
+        DeviceCredentialSet.load_decrypted_fields(
+            row.record for row in self.page.object_list
+        )
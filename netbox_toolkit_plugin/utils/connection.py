@@ -120,6 +120,93 @@ def validate_connection_health(connection: Any) -> bool:
         return False
 
 
-def wait_for_socket_cleanup(timeout: float = 2.0) -> None:
-    """Wait for socket cleanup to complete."""
-    time.sleep(min(timeout, 2.0))
+def get_connection_handles(connection: Any) -> list[Any]:
+    """Collect the sockets and transport sessions holding resources for a connection.
+
+    Call this before cleaning up a connection, so the handles can still be
+    reached and then passed to wait_for_socket_cleanup().
+    """
+    if not connection:
+        return []
+
+    candidates = []
+    for owner_name, attr_names in (
+        ("channel", ("socket", "_socket")),
+        ("transport", ("sock", "_socket", "socket", "session")),
+    ):
+        owner = getattr(connection, owner_name, None)
+        if not owner:
+            continue
+        for attr_name in attr_names:
+            with contextlib.suppress(Exception):
+                candidate = getattr(owner, attr_name, None)
+                if candidate is not None:
+                    candidates.append(candidate)
+
+    handles = []
+    for candidate in candidates:
+        if isinstance(candidate, socket.socket):
+            handles.append(candidate)
+        elif isinstance(getattr(candidate, "sock", None), socket.socket):
+            # Wrapper objects (e.g. Scrapli's Socket) hold the real socket in .sock
+            handles.append(candidate.sock)
+        elif hasattr(candidate, "isalive") and hasattr(candidate, "pid"):
+            # Child process sessions (e.g. the system SSH transport's pty process)
+            handles.append(candidate)
+
+    # Deduplicate while preserving order
+    unique_handles = []
+    for handle in handles:
+        if not any(handle is seen for seen in unique_handles):
+            unique_handles.append(handle)
+    return unique_handles
+
+
+def _is_handle_open(handle: Any) -> bool:
+    """Check if a socket or session handle still holds its resources."""
+    if isinstance(handle, socket.socket):
+        return handle.fileno() != -1
+
+    try:
+        return bool(handle.isalive())
+    except Exception:
+        return False
+
+
+def wait_for_socket_cleanup(
+    handles: list[Any] | None = None,
+    timeout: float = 2.0,
+    poll_interval: float = 0.005,
+) -> bool:
+    """Wait until connection handles have actually released their resources.
+
+    Returns as soon as every handle is closed, rather than sleeping for a fixed
+    time. Sockets still open when the timeout expires are closed forcibly.
+
+    Args:
+        handles: Handles from get_connection_handles(), collected before cleanup
+        timeout: Maximum time to wait in seconds
+        poll_interval: Initial delay between checks in seconds (doubles up to 50ms)
+
+    Returns:
+        True if every handle was released within the timeout
+    """
+    if not handles:
+        return True
+
+    deadline = time.monotonic() + timeout
+    pending = [handle for handle in handles if _is_handle_open(handle)]
+
+    while pending:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            for handle in pending:
+                if isinstance(handle, socket.socket):
+                    safe_socket_close(handle)
+            return False
+
+        time.sleep(min(poll_interval, remaining))
+        poll_interval = min(poll_interval * 2, 0.05)
+        pending = [handle for handle in pending if _is_handle_open(handle)]
+
+    return True
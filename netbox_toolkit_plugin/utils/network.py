@@ -2,15 +2,135 @@
 
 import builtins
 import contextlib
+import selectors
 import socket
+import threading
 import time
+from dataclasses import dataclass
 
 from ..exceptions import DeviceReachabilityError, SSHBannerError
+from ..settings import ToolkitSettings
 from .logging import get_toolkit_logger
 
 logger = get_toolkit_logger(__name__)
 
 
+# Largest amount of pre-banner data read while waiting for the SSH identification
+MAX_BANNER_BYTES = 8192
+
+
+@dataclass
+class ProbeResult:
+    """Outcome and measured latencies of a reachability probe."""
+
+    is_reachable: bool
+    is_ssh_server: bool
+    ssh_banner: bytes | None = None
+    connect_time: float | None = None  # Seconds to establish the TCP connection
+    banner_time: float | None = None  # Seconds from connect until the SSH banner
+
+
+@dataclass
+class ReachabilityEntry:
+    """Cached outcome of a reachability check for one host and port."""
+
+    reachable: bool
+    expires_at: float
+    error_message: str | None = None
+    source: str = "probe"  # "probe" or "session"
+    probe: ProbeResult | None = None
+
+
+class ReachabilityCache:
+    """Short-lived, process-local cache of reachability results per (host, port).
+
+    Positive probe results skip the next probe for a short time. Negative results
+    are cached briefly too, so repeated attempts against an unreachable device
+    fail immediately. A successful SSH session marks the host reachable for
+    longer, since it proves more than the probe does.
+    """
+
+    def __init__(self):
+        self._entries: dict[tuple[str, int], ReachabilityEntry] = {}
+        self._lock = threading.Lock()
+
+    def get(self, hostname: str, port: int) -> ReachabilityEntry | None:
+        """Get the live entry for a host, dropping it if it has expired."""
+        key = (hostname, port)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry.expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+            return entry
+
+    def set(
+        self,
+        hostname: str,
+        port: int,
+        reachable: bool,
+        ttl: float,
+        error_message: str | None = None,
+        source: str = "probe",
+        probe: ProbeResult | None = None,
+    ) -> None:
+        """Store a result for a host, replacing any existing entry."""
+        if ttl <= 0:
+            self.invalidate(hostname, port)
+            return
+
+        entry = ReachabilityEntry(
+            reachable=reachable,
+            expires_at=time.monotonic() + ttl,
+            error_message=error_message,
+            source=source,
+            probe=probe,
+        )
+        with self._lock:
+            self._entries[(hostname, port)] = entry
+
+    def invalidate(self, hostname: str, port: int) -> None:
+        """Forget the cached result for a host."""
+        with self._lock:
+            self._entries.pop((hostname, port), None)
+
+    def clear(self) -> None:
+        """Forget every cached result."""
+        with self._lock:
+            self._entries.clear()
+
+
+_reachability_cache = ReachabilityCache()
+
+
+def get_reachability_cache() -> ReachabilityCache:
+    """Get the process-wide reachability cache."""
+    return _reachability_cache
+
+
+def record_connection_success(hostname: str, port: int = 22) -> None:
+    """Mark a host reachable after an SSH session to it succeeded.
+
+    While the entry is live, validate_device_connectivity() skips the probe.
+    """
+    cache_config = ToolkitSettings.get_reachability_cache_config()
+    if not cache_config.get("enabled", True) or not cache_config.get(
+        "trust_recent_sessions", True
+    ):
+        return
+
+    _reachability_cache.set(
+        hostname, port, True, cache_config["session_ttl"], source="session"
+    )
+
+
+def invalidate_reachability(hostname: str, port: int = 22) -> None:
+    """Forget the cached reachability of a host after a connection failure."""
+    _reachability_cache.invalidate(hostname, port)
+
+
 def check_device_reachability(
     hostname: str, port: int = 22, timeout: int = 3
 ) -> tuple[bool, bool, bytes | None]:
@@ -29,14 +149,32 @@ def check_device_reachability(
         DeviceReachabilityError: If device is not reachable
         SSHBannerError: If SSH banner cannot be read
     """
+    result = probe_device(hostname, port, timeout)
+    return result.is_reachable, result.is_ssh_server, result.ssh_banner
+
+
+def probe_device(
+    hostname: str, port: int = 22, timeout: float = 3, banner_timeout: float = 3
+) -> ProbeResult:
+    """
+    Probe a device over TCP, read its SSH banner and measure both latencies.
+
+    Args:
+        hostname: The hostname or IP address to check
+        port: The port to check (default: 22 for SSH)
+        timeout: Connection timeout in seconds
+        banner_timeout: Overall deadline in seconds for the SSH banner to arrive
+
+    Returns:
+        ProbeResult with reachability, banner and measured latencies
+
+    Raises:
+        DeviceReachabilityError: If device is not reachable
+    """
     logger.debug(
         f"Checking device reachability for {hostname}:{port} with timeout {timeout}s"
     )
 
-    is_reachable = False
-    is_ssh_server = False
-    ssh_banner = None
-
     sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
 
     try:
@@ -44,12 +182,17 @@ def check_device_reachability(
 
         # Attempt connection
         logger.debug(f"Attempting TCP connection to {hostname}:{port}")
+        connect_start = time.perf_counter()
         sock.connect((hostname, port))
-        is_reachable = True
-        logger.debug(f"TCP connection successful to {hostname}:{port}")
+        connect_time = time.perf_counter() - connect_start
+        logger.debug(
+            f"TCP connection successful to {hostname}:{port} in {connect_time:.3f}s"
+        )
 
         # Try to read SSH banner
-        ssh_banner, is_ssh_server = _read_ssh_banner(sock, hostname)
+        ssh_banner, is_ssh_server, banner_time = _read_ssh_banner(
+            sock, hostname, banner_timeout
+        )
         logger.debug(
             f"SSH banner check: is_ssh_server={is_ssh_server}, banner_length={len(ssh_banner) if ssh_banner else 0}"
         )
@@ -74,105 +217,162 @@ def check_device_reachability(
         with contextlib.suppress(builtins.BaseException):
             sock.close()
 
-    return is_reachable, is_ssh_server, ssh_banner
+    return ProbeResult(
+        is_reachable=True,
+        is_ssh_server=is_ssh_server,
+        ssh_banner=ssh_banner,
+        connect_time=connect_time,
+        banner_time=banner_time,
+    )
 
 
 def _read_ssh_banner(
-    sock: socket.socket, hostname: str, attempts: int = 3
-) -> tuple[bytes | None, bool]:
+    sock: socket.socket, hostname: str, timeout: float = 3
+) -> tuple[bytes | None, bool, float | None]:
     """
-    Try to read SSH banner from socket.
+    Read the SSH banner from a connected socket.
+
+    Waits on the socket with a selector until data arrives, and returns as soon
+    as the SSH identification line starts. Servers may send other lines before
+    it, so reading continues until the overall deadline.
 
     Args:
         sock: Connected socket
         hostname: Hostname for logging
-        attempts: Number of attempts to read banner
+        timeout: Overall deadline in seconds for the banner to arrive
 
     Returns:
-        Tuple of (banner, is_ssh_server)
+        Tuple of (banner, is_ssh_server, banner_time). banner_time is the time
+        until the SSH identification arrived, or None if it never did
     """
-    logger.debug(
-        f"Attempting to read SSH banner from {hostname} with {attempts} attempts"
-    )
+    logger.debug(f"Waiting up to {timeout}s for SSH banner from {hostname}")
+
+    start = time.perf_counter()
+    deadline = start + timeout
+    buffer = b""
 
-    ssh_banner = None
-    is_ssh_server = False
+    sock.setblocking(False)
+    with selectors.DefaultSelector() as selector:
+        selector.register(sock, selectors.EVENT_READ)
+
+        while len(buffer) < MAX_BANNER_BYTES:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                logger.debug("SSH banner read timed out")
+                break
+
+            if not selector.select(remaining):
+                continue
+
+            try:
+                chunk = sock.recv(1024)
+            except (BlockingIOError, InterruptedError):
+                continue
+            except Exception as e:
+                logger.warning(f"Error reading SSH banner: {str(e)}")
+                break
 
-    for i in range(attempts):
-        try:
-            logger.debug(f"SSH banner read attempt {i + 1}/{attempts}")
-            sock.settimeout(1)
-            banner = sock.recv(1024)
-            if banner:
-                ssh_banner = banner
+            if not chunk:
+                logger.debug("Connection closed before SSH banner was received")
+                break
+
+            buffer += chunk
+            if buffer.startswith(b"SSH-") or b"\nSSH-" in buffer:
+                banner_time = time.perf_counter() - start
                 logger.debug(
-                    f"Received banner: {banner[:50]}..."
-                    if len(banner) > 50
-                    else f"Received banner: {banner}"
+                    f"Received SSH banner in {banner_time:.3f}s: {buffer[:50]!r}"
                 )
-                if banner.startswith(b"SSH-"):
-                    is_ssh_server = True
-                    logger.debug("Banner indicates SSH server")
-                    break
-                else:
-                    logger.debug("Banner received but not SSH protocol")
-                    # Non-SSH banner received
-            else:
-                logger.debug("No banner data received")
-
-            # If no banner received but still connected, pause briefly and try again
-            if i < attempts - 1:
-                logger.debug("Waiting 0.5s before next banner read attempt")
-                time.sleep(0.5)
-        except TimeoutError:
-            logger.debug(f"Banner read attempt {i + 1} timed out")
-            if i < attempts - 1:
-                continue
-        except Exception as e:
-            logger.warning(f"Error reading SSH banner: {str(e)}")
-            break
+                return buffer, True, banner_time
 
-    logger.debug(f"SSH banner read completed: is_ssh_server={is_ssh_server}")
-    return ssh_banner, is_ssh_server
+    if buffer:
+        logger.debug(f"Banner received but not SSH protocol: {buffer[:50]!r}")
+    else:
+        logger.debug("No banner data received")
+    return buffer or None, False, None
 
 
-def validate_device_connectivity(hostname: str, port: int = 22) -> None:
+def validate_device_connectivity(
+    hostname: str, port: int = 22, use_cache: bool = True
+) -> ProbeResult | None:
     """
     Validate that a device is reachable and has SSH available.
 
+    Results are cached per (hostname, port) for a short time, see
+    ToolkitSettings.REACHABILITY_CACHE_CONFIG.
+
     Args:
         hostname: The hostname or IP address to validate
         port: The port to check (default: 22)
+        use_cache: Whether to use and update the reachability cache
+
+    Returns:
+        ProbeResult of the latest probe, or None if the probe was skipped
+        because of a recent successful session
 
     Raises:
         DeviceReachabilityError: If device is not reachable
         SSHBannerError: If SSH service issues are detected
     """
-    logger.debug(f"Validating device connectivity for {hostname}:{port}")
+    cache_config = ToolkitSettings.get_reachability_cache_config()
+    use_cache = use_cache and cache_config.get("enabled", True)
+
+    if use_cache:
+        entry = _reachability_cache.get(hostname, port)
+        if entry is not None:
+            if entry.reachable:
+                logger.debug(
+                    f"Skipping connectivity probe for {hostname}:{port} "
+                    f"(cached {entry.source} result)"
+                )
+                return entry.probe
+            logger.debug(f"Using cached unreachable result for {hostname}:{port}")
+            raise DeviceReachabilityError(entry.error_message)
 
     try:
-        is_reachable, is_ssh_server, ssh_banner = check_device_reachability(
-            hostname, port
+        probe = _probe_device_connectivity(hostname, port)
+    except DeviceReachabilityError as e:
+        if use_cache:
+            _reachability_cache.set(
+                hostname, port, False, cache_config["negative_ttl"], str(e)
+            )
+        raise
+
+    if use_cache:
+        _reachability_cache.set(
+            hostname, port, True, cache_config["positive_ttl"], probe=probe
         )
+    return probe
+
+
+def _probe_device_connectivity(hostname: str, port: int) -> ProbeResult:
+    """Probe a device over TCP and check for an SSH banner."""
+    logger.debug(f"Validating device connectivity for {hostname}:{port}")
 
-        if not is_reachable:
+    try:
+        probe = probe_device(hostname, port)
+
+        if not probe.is_reachable:
             logger.error(f"Device {hostname}:{port} is not reachable")
             raise DeviceReachabilityError(
                 f"Cannot connect to {hostname} on port {port}. "
                 f"Please verify the device is reachable and SSH is enabled."
             )
 
-        if is_reachable and not is_ssh_server:
-            banner_msg = f" (received banner: {ssh_banner})" if ssh_banner else ""
+        if not probe.is_ssh_server:
+            banner_msg = (
+                f" (received banner: {probe.ssh_banner})" if probe.ssh_banner else ""
+            )
             logger.warning(
                 f"Device {hostname}:{port} is reachable but SSH banner not detected{banner_msg}"
             )
             # Device is reachable but didn't provide SSH banner - connection might fail
-        elif is_ssh_server:
+        else:
             logger.debug(
                 f"Device {hostname}:{port} is reachable and SSH server detected"
             )
 
+        return probe
+
     except (DeviceReachabilityError, SSHBannerError):
         raise
     except Exception as e:
@@ -0,0 +1,171 @@
+"""Process pool for parsing large command outputs off the request thread."""
+
+import multiprocessing
+import signal
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any
+
+from ..settings import ToolkitSettings
+from .logging import get_toolkit_logger
+from .textfsm_cache import parse_textfsm_output
+
+logger = get_toolkit_logger(__name__)
+
+
+class ParseTimeoutError(Exception):
+    """A parse ran longer than the executor's timeout."""
+
+
+def _raise_parse_timeout(signum, frame):
+    raise ParseTimeoutError("Parsing timed out")
+
+
+def _parse_in_worker(
+    platform: str, command: str, data: str, timeout: float
+) -> list[dict[str, Any]] | None:
+    """Parse in a pool process, interrupting the parse after ``timeout`` seconds."""
+    # Pool tasks run on the worker process's main thread, where alarms work
+    signal.signal(signal.SIGALRM, _raise_parse_timeout)
+    signal.setitimer(signal.ITIMER_REAL, timeout)
+    try:
+        return parse_textfsm_output(platform=platform, command=command, data=data)
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+
+
+class ParseExecutor:
+    """Run CPU-bound TextFSM parses of large outputs in worker processes.
+
+    A parse of a very large output can hold the GIL for seconds. Handing it
+    to a process pool lets the request return the raw output straight away
+    while the parsed data is stored on the command log once ready. At most
+    ``max_pending`` parses are queued or running; further outputs are left
+    unparsed rather than queued behind them. Each parse is interrupted after
+    ``timeout`` seconds so a pathological template can't occupy a worker.
+
+    The pool is started lazily from a web worker that already runs request
+    and bulk execution threads, so processes come from a fork server by
+    default. Forking such a process directly can leave a child holding a
+    lock, such as a logging handler's, that no thread will ever release.
+    """
+
+    def __init__(
+        self,
+        max_workers: int = 2,
+        max_pending: int = 8,
+        timeout: float = 60,
+        start_method: str = "forkserver",
+    ):
+        self.max_workers = max(1, max_workers)
+        self.timeout = timeout
+        self.start_method = start_method
+        self._slots = threading.BoundedSemaphore(max(1, max_pending))
+        self._pool: ProcessPoolExecutor | None = None
+        self._lock = threading.Lock()
+
+    def submit(self, platform: str, command: str, data: str) -> Future | None:
+        """
+        Queue an output for parsing.
+
+        Returns:
+            Future resolving to the parsed records (None if no template
+            matches), or None if too many parses are already pending
+        """
+        if not self._slots.acquire(blocking=False):
+            logger.warning(
+                "Parse queue full, leaving %d character output of '%s' unparsed",
+                len(data),
+                command,
+            )
+            return None
+
+        try:
+            future = self._get_pool().submit(
+                _parse_in_worker, platform, command, data, self.timeout
+            )
+        except BrokenProcessPool:
+            # A worker died (e.g. out of memory); start a fresh pool next time
+            logger.warning("Parse worker pool broke, restarting it")
+            self._reset_pool()
+            self._slots.release()
+            return None
+        except Exception:
+            self._slots.release()
+            raise
+
+        future.add_done_callback(lambda _future: self._slots.release())
+        return future
+
+    def shutdown(self) -> None:
+        """Stop the worker processes, abandoning queued parses."""
+        self._reset_pool()
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._pool is None:
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    mp_context=multiprocessing.get_context(self.start_method),
+                )
+            return self._pool
+
+    def _reset_pool(self) -> None:
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+
+_parse_executor: ParseExecutor | None = None
+_parse_executor_lock = threading.Lock()
+
+
+def get_parse_executor() -> ParseExecutor | None:
+    """Get the process-wide parse executor, or None if it is disabled."""
+    global _parse_executor
+
+    executor_config = ToolkitSettings.get_parse_executor_config()
+    if not executor_config.get("enabled", False):
+        return None
+
+    if _parse_executor is None:
+        with _parse_executor_lock:
+            if _parse_executor is None:
+                _parse_executor = ParseExecutor(
+                    max_workers=executor_config["max_workers"],
+                    max_pending=executor_config["max_pending"],
+                    timeout=executor_config["timeout"],
+                    start_method=executor_config["start_method"],
+                )
+    return _parse_executor
+
+
+def parse_or_defer(
+    platform: str, command: str, data: str
+) -> tuple[list[dict[str, Any]] | None, Future | None]:
+    """
+    Parse command output inline, or in the parse executor if it is large.
+
+    Args:
+        platform: Netmiko style platform, e.g. cisco_ios
+        command: Command that produced the output
+        data: Raw command output
+
+    Returns:
+        Tuple of (parsed records, future). Small outputs are parsed inline and
+        the future is None. Outputs over the size threshold are handed to the
+        executor: the records are None and the future resolves to them, or
+        both are None if the executor is saturated.
+
+    Raises:
+        ImportError: TextFSM or ntc-templates is not installed
+    """
+    executor = get_parse_executor()
+    if executor is not None:
+        size_threshold = ToolkitSettings.get_parse_executor_config()["size_threshold"]
+        if len(data) >= size_threshold:
+            return None, executor.submit(platform, command, data)
+
+    return parse_textfsm_output(platform=platform, command=command, data=data), None
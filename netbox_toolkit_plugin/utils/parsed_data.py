@@ -0,0 +1,91 @@
+"""Compact storage format for parsed command output."""
+
+import json
+import zlib
+from typing import Any
+
+# Bumped if the stored layout ever changes
+FORMAT_VERSION = 1
+
+
+def encode_parsed_data(data: Any) -> bytes | None:
+    """
+    Encode parsed command output for storage.
+
+    Lists of records that share the same keys - what TextFSM returns - are
+    stored column-oriented, as one header list and a list of row values, so
+    keys aren't repeated per row. Anything else is stored as is. The JSON is
+    then zlib-compressed.
+
+    Args:
+        data: Parsed output, usually a list of dictionaries
+
+    Returns:
+        Compressed bytes, or None if there is nothing to store
+    """
+    if not data:
+        return None
+
+    columns = _get_columns(data)
+    if columns is not None:
+        payload = {
+            "v": FORMAT_VERSION,
+            "columns": columns,
+            "rows": [[record[column] for column in columns] for record in data],
+        }
+    else:
+        payload = {"v": FORMAT_VERSION, "data": data}
+
+    encoded = json.dumps(payload, separators=(",", ":"), default=str)
+    return zlib.compress(encoded.encode("utf-8"))
+
+
+def decode_parsed_data(blob: bytes | memoryview | None) -> Any:
+    """
+    Decode parsed command output stored by encode_parsed_data.
+
+    Args:
+        blob: Stored bytes (database drivers may return a memoryview)
+
+    Returns:
+        The parsed output as originally given, or None if nothing is stored
+    """
+    table = decode_parsed_table(blob)
+    if table is None:
+        return None
+    if isinstance(table, tuple):
+        columns, rows = table
+        return [dict(zip(columns, row, strict=True)) for row in rows]
+    return table
+
+
+def decode_parsed_table(blob: bytes | memoryview | None) -> Any:
+    """
+    Decode stored parsed output without rebuilding records.
+
+    Returns:
+        (columns, rows) for column-oriented data, the stored value for
+        anything else, or None if nothing is stored
+    """
+    if not blob:
+        return None
+
+    payload = json.loads(zlib.decompress(bytes(blob)).decode("utf-8"))
+    if payload.get("v") != FORMAT_VERSION:
+        raise ValueError(f"Unsupported parsed data format: {payload.get('v')}")
+    if "columns" in payload:
+        return payload["columns"], payload["rows"]
+    return payload["data"]
+
+
+def _get_columns(data: Any) -> list[str] | None:
+    """Get the shared keys of a list of records, or None if it isn't one."""
+    if not isinstance(data, list) or not isinstance(data[0], dict):
+        return None
+
+    columns = list(data[0].keys())
+    column_set = set(columns)
+    for record in data:
+        if not isinstance(record, dict) or record.keys() != column_set:
+            return None
+    return columns
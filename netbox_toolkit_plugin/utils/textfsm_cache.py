@@ -0,0 +1,189 @@
+"""Process-wide cache of resolved and compiled ntc-templates TextFSM templates."""
+
+import copy
+import os
+import threading
+from collections import OrderedDict
+from typing import Any
+
+from ..settings import ToolkitSettings
+from .logging import get_toolkit_logger
+
+try:
+    import textfsm
+    from ntc_templates.parse import ParsingException, _get_template_dir, parse_output
+    from textfsm import clitable
+
+    HAS_TEXTFSM = True
+except ImportError:
+    HAS_TEXTFSM = False
+
+logger = get_toolkit_logger(__name__)
+
+
+class TextFSMTemplateCache:
+    """Resolve and compile TextFSM templates once per worker process.
+
+    ``ntc_templates.parse.parse_output`` matches the command against every
+    row of the template index and compiles the template from disk on each
+    call. This cache remembers which templates a (platform, command) pair
+    resolves to - including that it resolves to none, the usual case for
+    commands without a template - and keeps each template compiled. Every
+    parse works on a copy of the compiled template, so concurrent parses
+    never share state.
+
+    Templates changed on disk are picked up after clear() or a restart.
+    """
+
+    def __init__(self, max_entries: int = 1024):
+        self.max_entries = max_entries
+        # (template dir, platform, command) -> template file names, or None
+        self._resolved: OrderedDict[tuple[str, str, str], tuple[str, ...] | None] = (
+            OrderedDict()
+        )
+        # Template file path -> compiled template
+        self._compiled: dict[str, Any] = {}
+        self._lock = threading.Lock()
+
+    def parse(
+        self, platform: str, command: str, data: str, template_dir: str | None = None
+    ) -> list[dict[str, Any]] | None:
+        """
+        Parse command output with the template ntc-templates would choose.
+
+        Args:
+            platform: Netmiko style platform, e.g. cisco_ios
+            command: Command that produced the output
+            data: Raw command output
+            template_dir: Template directory with an index file (default:
+                the ntc-templates directory)
+
+        Returns:
+            Records with lower-case keys like parse_output returns, or None
+            if no template matches the command
+
+        Raises:
+            ImportError: TextFSM or ntc-templates is not installed
+        """
+        if not HAS_TEXTFSM:
+            raise ImportError("TextFSM parsing requires textfsm and ntc-templates")
+
+        template_dir = template_dir or _get_template_dir()
+        command = " ".join(command.split())
+        templates = self.resolve(platform, command, template_dir)
+        if templates is None:
+            return None
+
+        if len(templates) > 1:
+            # Multi-template rows merge tables by key; leave that to CliTable
+            cli_table = clitable.CliTable("index", template_dir)
+            cli_table.ParseCmd(data, templates=":".join(templates))
+            header = [column.lower() for column in cli_table.header]
+            return [dict(zip(header, row, strict=True)) for row in cli_table]
+
+        fsm = copy.deepcopy(
+            self._get_compiled(os.path.join(template_dir, templates[0]))
+        )
+        header = [column.lower() for column in fsm.header]
+        return [dict(zip(header, row, strict=True)) for row in fsm.ParseText(data)]
+
+    def has_template(
+        self, platform: str, command: str, template_dir: str | None = None
+    ) -> bool:
+        """Whether ntc-templates has a template for a command."""
+        if not HAS_TEXTFSM:
+            return False
+        template_dir = template_dir or _get_template_dir()
+        return (
+            self.resolve(platform, " ".join(command.split()), template_dir) is not None
+        )
+
+    def resolve(
+        self, platform: str, command: str, template_dir: str
+    ) -> tuple[str, ...] | None:
+        """Get the template file names for a command, or None if there are none."""
+        key = (template_dir, platform, command)
+        with self._lock:
+            if key in self._resolved:
+                self._resolved.move_to_end(key)
+                return self._resolved[key]
+
+        # The index file itself is read once per process by CliTable
+        cli_table = clitable.CliTable("index", template_dir)
+        row = cli_table.index.GetRowMatch({"Command": command, "Platform": platform})
+        templates = (
+            tuple(cli_table.index.index[row]["Template"].split(":")) if row else None
+        )
+        logger.debug(
+            "Resolved TextFSM templates for %s '%s': %s", platform, command, templates
+        )
+
+        with self._lock:
+            self._resolved[key] = templates
+            self._resolved.move_to_end(key)
+            while len(self._resolved) > self.max_entries:
+                self._resolved.popitem(last=False)
+        return templates
+
+    def clear(self) -> None:
+        """Forget every resolved and compiled template."""
+        with self._lock:
+            self._resolved.clear()
+            self._compiled.clear()
+
+    def _get_compiled(self, path: str) -> Any:
+        with self._lock:
+            fsm = self._compiled.get(path)
+        if fsm is not None:
+            return fsm
+
+        with open(path) as template_file:
+            fsm = textfsm.TextFSM(template_file)
+        with self._lock:
+            return self._compiled.setdefault(path, fsm)
+
+
+_template_cache: TextFSMTemplateCache | None = None
+_template_cache_lock = threading.Lock()
+
+
+def get_textfsm_template_cache() -> TextFSMTemplateCache | None:
+    """Get the process-wide TextFSM template cache, or None if it is disabled."""
+    global _template_cache
+
+    cache_config = ToolkitSettings.get_textfsm_template_cache_config()
+    if not cache_config.get("enabled", True):
+        return None
+
+    if _template_cache is None:
+        with _template_cache_lock:
+            if _template_cache is None:
+                _template_cache = TextFSMTemplateCache(
+                    max_entries=cache_config["max_entries"]
+                )
+    return _template_cache
+
+
+def parse_textfsm_output(
+    platform: str, command: str, data: str
+) -> list[dict[str, Any]] | None:
+    """
+    Parse command output with ntc-templates, using the template cache if enabled.
+
+    Returns:
+        Parsed records, or None if no template matches the command
+
+    Raises:
+        ImportError: TextFSM or ntc-templates is not installed
+    """
+    if not HAS_TEXTFSM:
+        raise ImportError("TextFSM parsing requires textfsm and ntc-templates")
+
+    template_cache = get_textfsm_template_cache()
+    if template_cache is not None:
+        return template_cache.parse(platform, command, data)
+
+    try:
+        return parse_output(platform=platform, command=command, data=data)
+    except ParsingException:
+        return None
@@ -1,12 +1,9 @@
 """Command log related views for the NetBox Toolkit Plugin."""
 
 import csv
-from datetime import timedelta
 
-from django.db.models import Count, Q
 from django.http import HttpResponse
 from django.shortcuts import get_object_or_404, redirect
-from django.utils import timezone
 from django.views import View
 from django.views.generic import TemplateView
 
@@ -18,6 +15,9 @@ from netbox.views.generic import (
 )
 
 from ..models import CommandLog
+from ..parsers import parse_command_output
+from ..services.statistics_service import CommandStatisticsService
+from ..utils.parsed_data import decode_parsed_table
 
 
 class CommandLogListView(ObjectListView):
@@ -71,39 +71,20 @@ class CommandLogExportCSVView(View):
         """Export parsed command log data as CSV file"""
         command_log = get_object_or_404(CommandLog, pk=pk)
 
-        # Parse the command output on-demand using the same logic as the API
         try:
-            # Import textfsm parser
-            from ntc_templates.parse import parse_output
-
-            # Get the device platform for parsing and use centralized normalization
-            platform_slug = (
-                command_log.device.platform.slug
-                if command_log.device.platform
-                else "generic"
-            )
-
-            # Use centralized platform normalization (single source of truth)
-            from ..settings import ToolkitSettings
-
-            device_platform = ToolkitSettings.normalize_platform(platform_slug)
-
-            # Try to parse the stored output using ntc-templates
-            parsed_result = parse_output(
-                platform=device_platform,
-                command=command_log.command.command,
-                data=command_log.output,
-            )
+            # Use the output parsed when the command ran; logs written before
+            # parsed output was stored are parsed again from the raw text
+            parsed_data = decode_parsed_table(command_log.parsed_data_compressed)
+            if parsed_data is None:
+                parsed_data = self._parse_output(command_log)
 
-            if not parsed_result or not isinstance(parsed_result, list):
+            if not parsed_data:
                 return HttpResponse(
                     "No parsed data available for this command log. The output could not be parsed into structured data.",
                     status=404,
                 )
 
-            parsed_data = parsed_result
-
-            if not isinstance(parsed_data, list) or len(parsed_data) == 0:
+            if not isinstance(parsed_data, (list, tuple)):
                 return HttpResponse(
                     "Parsed data is not in a valid CSV format (must be a non-empty list).",
                     status=400,
@@ -118,8 +99,13 @@ class CommandLogExportCSVView(View):
 
             writer = csv.writer(response)
 
+            # Column-oriented data as stored at execution time
+            if isinstance(parsed_data, tuple):
+                headers, rows = parsed_data
+                writer.writerow(headers)
+                writer.writerows(rows)
             # Handle list of objects (most common case)
-            if isinstance(parsed_data[0], dict):
+            elif isinstance(parsed_data[0], dict):
                 # Write headers
                 headers = list(parsed_data[0].keys())
                 writer.writerow(headers)
@@ -139,6 +125,24 @@ class CommandLogExportCSVView(View):
                 f"Failed to parse command output or generate CSV: {str(e)}", status=400
             )
 
+    def _parse_output(self, command_log):
+        """Parse a log's raw output with its command's parsers"""
+        # Get the device platform for parsing and use centralized normalization
+        platform_slug = (
+            command_log.device.platform.slug
+            if command_log.device.platform
+            else "generic"
+        )
+
+        # Use centralized platform normalization (single source of truth)
+        from ..settings import ToolkitSettings
+
+        device_platform = ToolkitSettings.normalize_platform(platform_slug)
+
+        return parse_command_output(
+            command_log.command, device_platform, command_log.output, defer=False
+        ).data
+
 
 class ToolkitStatisticsView(TemplateView):
     """View for displaying command execution statistics dashboard"""
@@ -149,53 +153,7 @@ class ToolkitStatisticsView(TemplateView):
         """Get statistics data for the template"""
         context = super().get_context_data(**kwargs)
 
-        # Get all command logs
-        queryset = CommandLog.objects.all()
-
-        # Basic stats
-        total_logs = queryset.count()
-        successful_logs = queryset.filter(success=True).count()
-        success_rate = (successful_logs / total_logs * 100) if total_logs > 0 else 0
-
-        # Last 24 hours stats
-        last_24h = timezone.now() - timedelta(hours=24)
-        recent_logs = queryset.filter(execution_time__gte=last_24h)
-        recent_total = recent_logs.count()
-        recent_successful = recent_logs.filter(success=True).count()
-        recent_failed = recent_total - recent_successful
-
-        # Top commands
-        top_commands = (
-            queryset.values("command__name")
-            .annotate(count=Count("command"))
-            .order_by("-count")[:10]
-        )
-
-        # Common errors (non-empty error messages)
-        common_errors = (
-            queryset.filter(~Q(error_message=""), ~Q(error_message__isnull=True))
-            .values("error_message")
-            .annotate(count=Count("error_message"))
-            .order_by("-count")[:10]
-        )
-
-        # Add data to context
-        context.update({
-            "total_logs": total_logs,
-            "success_rate": round(success_rate, 2),
-            "last_24h": {
-                "total": recent_total,
-                "successful": recent_successful,
-                "failed": recent_failed,
-            },
-            "top_commands": [
-                {"command_name": item["command__name"], "count": item["count"]}
-                for item in top_commands
-            ],
-            "common_errors": [
-                {"error": item["error_message"][:100], "count": item["count"]}
-                for item in common_errors
-            ],
-        })
+        # Read from the hourly rollups rather than aggregating every log
+        context.update(CommandStatisticsService().get_statistics())
 
         return context
@@ -1,5 +1,6 @@
 from django.contrib import messages
 from django.contrib.auth.mixins import LoginRequiredMixin
+from django.db.models import Count
 from django.shortcuts import redirect
 from django.views.generic import DetailView
 
@@ -23,7 +24,9 @@ from ..tables import DeviceCredentialSetTable
 class DeviceCredentialSetListView(ObjectListView):
     """List view for device credential sets - users see only their own."""
 
-    queryset = DeviceCredentialSet.objects.all()
+    queryset = DeviceCredentialSet.objects.annotate(
+        platform_count=Count("platforms", distinct=True)
+    ).prefetch_related("platforms")
     filterset = None  # Will update this after import
     table = None  # Will update this after import
 
@@ -3,12 +3,14 @@
 from django.contrib import messages
 from django.http import HttpResponse
 from django.shortcuts import get_object_or_404, render
+from django.utils.html import escape
 from django.views import View
 
 from dcim.models import Device
 from netbox.views.generic import ObjectView
 from utilities.views import ViewTab, register_model_view
 
+from ..exceptions import CredentialVerificationBusyError
 from ..forms import VARIABLE_FIELD_PREFIX, CommandExecutionForm
 from ..models import Command, DeviceCredentialSet
 from ..services.command_service import CommandExecutionService
@@ -381,28 +383,47 @@ class DeviceCommandOutputView(View):
                 command=processed_command_text,  # The actual command with variables substituted
                 command_type=command.command_type,  # For connector selection
                 description=command.description,  # For context
+                parsers=command.parsers,  # For parsing the output
+                ttp_template=command.ttp_template,
             )
 
-            # Execute the command based on authentication method
-            if auth_method == "stored":
-                # Use existing credential set method
-                result = self.command_service.execute_command_with_credential_set(
-                    command=temp_command,
-                    device=device,
-                    credential_set_id=int(credential_set_id),
-                    user=request.user,
-                    max_retries=1,
-                )
-            elif auth_method == "onthefly":
-                # Use direct username/password method
-                result = self.command_service.execute_command_with_retry(
-                    command=temp_command,
-                    device=device,
-                    username=username,
-                    password=password,
-                    max_retries=1,
+            # Reserve rate limit capacity before connecting to the device
+            rate_limit_check = self.rate_limiting_service.reserve(device, request.user)
+            if not rate_limit_check["allowed"]:
+                return HttpResponse(
+                    f'<div class="alert alert-warning">{escape(rate_limit_check["reason"])}</div>',
+                    status=429,
                 )
 
+            # Execute the command based on authentication method
+            execution_success = False
+            try:
+                if auth_method == "stored":
+                    # Use existing credential set method
+                    result = self.command_service.execute_command_with_credential_set(
+                        command=temp_command,
+                        device=device,
+                        credential_set_id=int(credential_set_id),
+                        user=request.user,
+                        max_retries=1,
+                    )
+                elif auth_method == "onthefly":
+                    # Use direct username/password method
+                    result = self.command_service.execute_command_with_retry(
+                        command=temp_command,
+                        device=device,
+                        username=username,
+                        password=password,
+                        max_retries=1,
+                    )
+                execution_success = result.success and not result.has_syntax_error
+            finally:
+                # Refund the reservation unless the command counts as executed
+                if rate_limit_check["reservation"] is not None:
+                    rate_limit_check["reservation"].release(
+                        successful=int(execution_success)
+                    )
+
             # Render just the command output section
             return render(
                 request,
@@ -414,6 +435,7 @@ class DeviceCommandOutputView(View):
                     "executed_command": command,
                     "parsed_data": getattr(result, "parsed_output", None),
                     "parsing_method": getattr(result, "parsing_method", None),
+                    "parsing_pending": getattr(result, "parsing_pending", False),
                     "has_syntax_error": getattr(result, "has_syntax_error", False),
                     "syntax_error_type": getattr(result, "syntax_error_type", None),
                     "syntax_error_vendor": getattr(result, "syntax_error_vendor", None),
@@ -425,6 +447,12 @@ class DeviceCommandOutputView(View):
             return HttpResponse(
                 '<div class="alert alert-danger">Command not found</div>', status=404
             )
+        except CredentialVerificationBusyError as e:
+            response = HttpResponse(
+                f'<div class="alert alert-warning">{escape(str(e))}</div>', status=503
+            )
+            response["Retry-After"] = str(e.retry_after)
+            return response
         except Exception as e:
             return HttpResponse(
                 f'<div class="alert alert-danger">Command execution failed: {str(e)}</div>',